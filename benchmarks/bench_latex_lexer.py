@@ -0,0 +1,167 @@
+"""Compare the lexer-based placeholder extraction with the old regex loops.
+
+The old loops (kept below as ``legacy_*``) searched the document from the
+start for every match and copied it on each replacement. Both versions run
+on the bundled ``tex source`` projects and on synthetic documents of
+growing size. The last column counts extracted records that differ: the old
+patterns counted escaped ``\\{`` as group braces and so skipped definitions
+such as ``\\newcommand{\\func}{\\left\\{ ...}``, which the lexer extracts,
+and paired a nested ``itemize`` with the inner ``\\end{itemize}``, which the
+lexer's environment stack pairs with the outer one. The "unclosed" rows
+are adversarial input where the old environment regex backtracks.
+
+Usage: python benchmarks/bench_latex_lexer.py [sizes ...]
+"""
+
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.formats.latex.parser import LatexParser  # noqa: E402
+from src.formats.latex.utils import (  # noqa: E402
+    find_main_tex_file,
+    get_command_pattern,
+    get_env_pattern,
+    get_newcommand_pattern,
+    read_tex_file,
+    remove_comments,
+)
+
+CAPTION_COMMANDS = r"caption|caption\*|subcaption|subcaption\*|title|keywords|abstract|icmltitle|icmltitlerunning"
+
+
+def legacy_newcommands(tex):
+    tex = remove_comments(tex)
+    pattern = get_newcommand_pattern()
+    records = []
+    while True:
+        match = pattern.search(tex)
+        if match is None:
+            return tex, records
+        placeholder = f"<PLACEHOLDER_NEWCOMMAND_{len(records)}>"
+        tex = tex.replace(match.group(0), placeholder, 1)
+        records.append((placeholder, match.group(1) or match.group(2), match.group(0)))
+
+
+def legacy_captions(tex):
+    tex = remove_comments(tex)
+    pattern = get_command_pattern(CAPTION_COMMANDS)
+    records = []
+    while True:
+        match = pattern.search(tex)
+        if match is None:
+            return tex, records
+        placeholder = f"<PLACEHOLDER_CAP_{len(records) + 1}>"
+        tex = tex.replace(match.group(0), placeholder, 1)
+        records.append((placeholder, match.group(1), match.group(0)))
+
+
+def legacy_envs(tex):
+    tex = remove_comments(tex)
+    pattern = get_env_pattern(r".*?")
+    records = []
+    while True:
+        match = pattern.search(tex)
+        if match is None:
+            return tex, records
+        placeholder = f"<PLACEHOLDER_ENV_{len(records) + 1}>"
+        tex = tex.replace(match.group(0), placeholder, 1)
+        records.append((placeholder, match.group(1), match.group(0)))
+
+
+def lexer_extract(tex):
+    parser = LatexParser(".", ".")
+    tex = parser._extract_newcommands(tex)
+    tex = parser._extract_captions(tex)
+    tex = parser._extract_envs(tex)
+    records = (
+        [(c["placeholder"], c["name"], c["content"]) for c in parser.newcommands_json],
+        [(c["placeholder"], c["cap_type"], c["content"]) for c in parser.captions_json],
+        [(e["placeholder"], e["env_name"], e["content"]) for e in parser.envs_json],
+    )
+    return tex, records
+
+
+def legacy_extract(tex):
+    tex, newcommands = legacy_newcommands(tex)
+    tex, captions = legacy_captions(tex)
+    tex, envs = legacy_envs(tex)
+    return tex, (newcommands, captions, envs)
+
+
+def bundled_documents():
+    sources = Path(PROJECT_ROOT, "tex source")
+    for project in sorted(sources.iterdir()) if sources.is_dir() else []:
+        main_tex_file = find_main_tex_file(str(project))
+        if main_tex_file:
+            parser = LatexParser(str(project), ".")
+            merged = parser._merge_inputs(read_tex_file(main_tex_file))
+            yield project.name, remove_comments(merged)
+
+
+SECTION = r"""\section{Part %(i)d}
+\newcommand{\macro%(i)d}[1]{\textbf{#1}}
+Some text with \emph{emphasis} and math $x_%(i)d^2$ and \cite{ref%(i)d}.
+\begin{figure}[t]
+  \centering
+  \includegraphics{fig%(i)d.pdf}
+  \caption{Figure number %(i)d with \{braces\}.}
+\end{figure}
+\begin{itemize}
+  \item First \textit{item} %(i)d
+  \begin{itemize}\item nested\end{itemize}
+\end{itemize}
+\begin{equation}
+  E_{%(i)d} = m c^2
+\end{equation}
+"""
+
+
+def synthetic_document(n_sections):
+    body = "".join(SECTION % {"i": i} for i in range(n_sections))
+    return "\\documentclass{article}\n\\begin{document}\n" + body + "\\end{document}\n"
+
+
+def unclosed_document(n_environments):
+    body = "".join(f"\\begin{{env{i}}} text " for i in range(n_environments))
+    return "\\begin{document}\n" + body + "\\begin{quote}q\\end{quote}\n\\end{document}\n"
+
+
+def timed(extract, tex):
+    start = time.perf_counter()
+    result = extract(tex)
+    return time.perf_counter() - start, result
+
+
+def compare(label, tex):
+    legacy_s, legacy = timed(legacy_extract, tex)
+    lexer_s, new = timed(lexer_extract, tex)
+    differing = sum(
+        len({r[1:] for r in old} ^ {r[1:] for r in current})
+        for old, current in zip(legacy[1], new[1])
+    )
+    print(
+        f"{label:>24} {len(tex) / 1024:>9.0f} {legacy_s * 1e3:>11.1f}"
+        f" {lexer_s * 1e3:>10.1f} {legacy_s / lexer_s:>8.1f}x {differing:>10}"
+    )
+
+
+def main(sizes):
+    print(f"{'document':>24} {'KiB':>9} {'legacy ms':>11} {'lexer ms':>10} {'speedup':>9} {'differing':>10}")
+    for name, tex in bundled_documents():
+        compare(name, tex)
+    for n in sizes:
+        compare(f"synthetic x{n}", synthetic_document(n))
+    # The old regex is quadratic here and already takes minutes at x2000
+    for n in sizes:
+        compare(f"unclosed x{n // 4}", unclosed_document(n // 4))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 500, 2000])
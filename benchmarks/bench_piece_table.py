@@ -0,0 +1,116 @@
+"""Compare piece-table reconstruction with the old string rebuilding.
+
+The old ``LatexConstructor`` (kept below as ``legacy_*``) called
+``str.replace`` once per env, caption and newcommand placeholder and
+rebuilt the whole document for every ``\\input`` it reverted. Both versions
+write a synthetic project with growing numbers of sections, each with an
+environment, a caption and its own input file; the outputs must match.
+
+Usage: python benchmarks/bench_piece_table.py [sizes ...]
+"""
+
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.formats.latex.reconstruct import LatexConstructor  # noqa: E402
+
+
+def legacy_construct(sections, captions, envs, inputs, newcommands, output_dir):
+    tex = ""
+    for section in sections:
+        tex += section["trans_content"] + "\n"
+    for part in envs + captions:
+        tex = tex.replace(part["placeholder"], part["trans_content"])
+    for newcommand in newcommands:
+        tex = tex.replace(newcommand["placeholder"], newcommand["content"])
+
+    begin_map = {i["begin"]: i for i in inputs}
+    end_map = {i["end"]: i for i in inputs}
+    pattern = re.compile(r"<PLACEHOLDER_[^>]+?_begin>|<PLACEHOLDER_[^>]+?_end>")
+    stack = []
+    pos = 0
+    while True:
+        match = pattern.search(tex, pos)
+        if not match:
+            break
+        tag = match.group()
+        if tag in begin_map:
+            stack.append((tag, match.start()))
+            pos = match.end()
+        elif tag in end_map:
+            begin_tag, begin_pos = stack.pop()
+            info = begin_map[begin_tag]
+            inner = tex[begin_pos + len(begin_tag) : match.start()].strip()
+            with open(os.path.join(output_dir, info["path"] + ".tex"), "w", encoding="utf-8") as f:
+                f.write(inner + "\n")
+            tex = tex[:begin_pos] + info["command"] + tex[match.end() :]
+            pos = begin_pos + len(info["command"])
+        else:
+            pos = match.end()
+    tex = re.sub(r"<PLACEHOLDER_[^>]*>", "", tex)
+    with open(os.path.join(output_dir, "main.tex"), "w", encoding="utf-8") as f:
+        f.write(tex)
+
+
+def synthetic_maps(n_sections):
+    sections = [{"trans_content": "\\documentclass{article}\n\\usepackage[UTF8]{ctex}\n<PLACEHOLDER_NEWCOMMAND_0>"}]
+    captions, envs, inputs = [], [], []
+    for i in range(1, n_sections + 1):
+        sections.append(
+            {
+                "trans_content": f"<PLACEHOLDER_part{i}_begin>\\section{{Teil {i}}}\n"
+                + "Übersetzter Text mit \\emph{Betonung}. " * 40
+                + f"\n<PLACEHOLDER_ENV_{i}>\n<PLACEHOLDER_part{i}_end>"
+            }
+        )
+        envs.append(
+            {
+                "placeholder": f"<PLACEHOLDER_ENV_{i}>",
+                "trans_content": f"\\begin{{figure}}<PLACEHOLDER_CAP_{i}>\\end{{figure}}",
+            }
+        )
+        captions.append({"placeholder": f"<PLACEHOLDER_CAP_{i}>", "trans_content": f"\\caption{{Bild {i}}}"})
+        inputs.append(
+            {
+                "command": f"\\input{{part{i}}}",
+                "begin": f"<PLACEHOLDER_part{i}_begin>",
+                "end": f"<PLACEHOLDER_part{i}_end>",
+                "path": f"part{i}",
+            }
+        )
+    newcommands = [{"placeholder": "<PLACEHOLDER_NEWCOMMAND_0>", "content": "\\def\\x{y}"}]
+    return sections, captions, envs, inputs, newcommands
+
+
+def timed(construct, maps):
+    output_dir = tempfile.mkdtemp()
+    start = time.perf_counter()
+    construct(*maps, output_dir)
+    elapsed = time.perf_counter() - start
+    files = {name: Path(output_dir, name).read_text(encoding="utf-8") for name in os.listdir(output_dir)}
+    return elapsed, files
+
+
+def main(sizes):
+    print(f"{'sections':>9} {'KiB':>9} {'legacy ms':>11} {'pieces ms':>10} {'speedup':>9} {'same':>6}")
+    for n in sizes:
+        maps = synthetic_maps(n)
+        legacy_s, legacy = timed(legacy_construct, maps)
+        new_s, new = timed(lambda *args: LatexConstructor(*args).construct(), maps)
+        kib = sum(len(text) for text in new.values()) / 1024
+        print(
+            f"{n:>9} {kib:>9.0f} {legacy_s * 1e3:>11.1f} {new_s * 1e3:>10.1f}"
+            f" {legacy_s / new_s:>8.1f}x {str(legacy == new):>6}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000, 2500])
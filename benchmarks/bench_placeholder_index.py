@@ -0,0 +1,97 @@
+"""Time placeholder resolution in TranslatorAgent on synthetic papers.
+
+LLM calls are replaced by coroutines that return immediately, so the numbers
+measure only how sections, environments and captions are looked up. With the
+key -> position index the time per section should stay flat as papers grow.
+
+Usage: python benchmarks/bench_placeholder_index.py [sizes ...]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import src.agents.tool_agents.translator_agent as translator_module  # noqa: E402
+from src.agents.tool_agents.translator_agent import TranslatorAgent  # noqa: E402
+
+
+def make_paper(n_sections):
+    """Each section references two environments and one caption."""
+
+    sections, envs, captions = [], [], []
+    for s in range(1, n_sections + 1):
+        env_a, env_b, cap = 2 * s - 1, 2 * s, s
+        sections.append(
+            {
+                "section": str(s),
+                "content": f"Text <PLACEHOLDER_ENV_{env_a}> and <PLACEHOLDER_ENV_{env_b}>.",
+            }
+        )
+        envs.append({"placeholder": f"<PLACEHOLDER_ENV_{env_a}>", "content": "x"})
+        envs.append(
+            {
+                "placeholder": f"<PLACEHOLDER_ENV_{env_b}>",
+                "content": f"fig <PLACEHOLDER_CAP_{cap}>",
+            }
+        )
+        captions.append({"placeholder": f"<PLACEHOLDER_CAP_{cap}>", "content": "c"})
+    return sections, envs, captions
+
+
+def make_agent(output_dir):
+    config = {
+        "llm_config": {"model": "bench", "base_url": "http://example.invalid/v1"},
+        "cache": {"enabled": False},
+    }
+    agent = TranslatorAgent(config, project_dir=".", output_dir=str(output_dir))
+
+    async def done(record, *args, **kwargs):
+        return dict(record, trans_content="t")
+
+    agent._translate_section = lambda section, *a, **kw: done(section)
+    agent._translate_env = lambda env, *a, **kw: done(env)
+    agent._translate_caption = lambda caption, *a, **kw: done(caption)
+    return agent
+
+
+async def run_translate(agent, sections, envs, captions):
+    await asyncio.gather(*(agent.translate(sec, envs, captions, None) for sec in sections))
+
+
+async def run_error_parts(agent, sections, envs, captions):
+    agent.errors_report = [
+        {"part": "sec", "num_or_ph": s["section"]} for s in sections[::10]
+    ] + [{"part": "env", "num_or_ph": e["placeholder"]} for e in envs[::10]]
+    await agent._retranslate_error_parts(sections, captions, envs, None)
+    return len(agent.errors_report)
+
+
+def main(sizes):
+    # The progress pause at the end of an error pass is not part of the lookup
+    translator_module.time.sleep = lambda seconds: None
+    print(f"{'sections':>9} {'translate ms':>13} {'us/section':>11} {'errors':>7} {'error pass ms':>14}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for n in sizes:
+            agent = make_agent(output_dir)
+            paper = make_paper(n)
+            start = time.perf_counter()
+            asyncio.run(run_translate(agent, *paper))
+            translate_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            errors = asyncio.run(run_error_parts(agent, *paper))
+            errors_s = time.perf_counter() - start
+            print(
+                f"{n:>9} {translate_s * 1e3:>13.1f} {translate_s / n * 1e6:>11.1f}"
+                f" {errors:>7} {errors_s * 1e3:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000])
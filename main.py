@@ -2,10 +2,9 @@ import toml
 import argparse
 import os
 import sys
-from src.agents.coordinator_agent import CoordinatorAgent
+from src.agents.batch_executor import BatchExecutor
 from src.formats.latex.utils import (
     get_profect_dirs,
-    batch_download_arxiv_tex,
     extract_compressed_files,
     get_arxiv_category,
     extract_arxiv_ids,
@@ -39,6 +38,17 @@ def main():
     parser.add_argument("--arxiv", type=str, default="", help="arxiv paper ID.")
     parser.add_argument("--output", type=str, default="", help="output directory.")
     parser.add_argument("--source", type=str, default="", help="tex source directory.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Keep translations from an interrupted run of the same sources.",
+    )
+    parser.add_argument(
+        "--previous",
+        type=str,
+        default="",
+        help="Output directory of an earlier paper version to reuse translations from.",
+    )
     # parser.add_argument("--GUI", "-g", action="store_true", help="Interact with GUI.")
     # parser.add_argument("--mode", type=int, default=2, help="Translate mode.")
     # parser.add_argument("--update_term", type=str, default="False", help="Update term or not.")
@@ -80,6 +90,10 @@ def main():
         config["tex_sources_dir"] = args.source
     if args.output:
         config["output_dir"] = args.output
+    if args.resume:
+        config["resume"] = True
+    if args.previous:
+        config["previous_output_dir"] = os.path.abspath(args.previous)
     # if args.ut:
     #     config["user_term"] = args.ut
 
@@ -97,12 +111,11 @@ def main():
     os.makedirs(projects_dir, exist_ok=True)
     os.makedirs(output_dir, exist_ok=True)
 
+    projects = []
     if paper_list:
-        projects = batch_download_arxiv_tex(paper_list, projects_dir)
-        if not config["user_term"] or args.mode == "0":
+        if not config["user_term"] or config.get("mode") == 0:
             config["category"] = get_arxiv_category(paper_list)
             # print(config["category"])
-        extract_compressed_files(projects_dir)
     else:
         print(
             "⚠️ No paper list provided. Using existing projects in the specified directory."
@@ -114,15 +127,20 @@ def main():
                 "❌ No projects found. Check 'tex_sources_dir' and 'paper_list' in config."
             )
 
-    for project_dir in tqdm(projects, desc="Processing projects", unit="project"):
-        try:
-            LaTexTrans = CoordinatorAgent(
-                config=config, project_dir=project_dir, output_dir=output_dir
-            )
-            LaTexTrans.workflow_latextrans()
-        except Exception as e:
-            print(f"❌ Error processing project {os.path.basename(project_dir)}: {e}")
-            continue
+    previous = config.get("previous_output_dir")
+    if (
+        previous
+        and len(paper_list) + len(projects) > 1
+        and os.path.exists(os.path.join(previous, "sections_map.json"))
+    ):
+        raise ValueError(
+            "❌ --previous points at the output of a single paper; with several projects, "
+            "pass the output directory that holds one translated project per paper."
+        )
+
+    # Papers are downloaded, translated and compiled in overlapping stages
+    executor = BatchExecutor(config, projects_dir=projects_dir, output_dir=output_dir)
+    executor.run(arxiv_ids=paper_list, project_dirs=projects)
 
     # config["paper_list"] = []
     # config["category"] = {}
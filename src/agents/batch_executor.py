@@ -0,0 +1,204 @@
+"""Stage-pipelined execution of a batch of papers.
+
+Each paper goes through download, parse, translate, validate and compile.
+Every stage has its own bounded pool of workers connected by queues, so one
+paper can translate while another compiles with latexmk. All papers share a
+single LLM concurrency limiter, which keeps the backend at the configured
+``[concurrency]`` budget no matter how many papers are in flight.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.agents.coordinator_agent import CoordinatorAgent
+from src.formats.latex.utils import batch_download_arxiv_tex, extract_compressed_file
+from src.llm.client import close_async_clients
+from src.llm.concurrency import AdaptiveConcurrencyLimiter
+
+STAGES = ("download", "parse", "translate", "validate", "compile")
+DEFAULT_WORKERS = {
+    "download": 2,
+    "parse": 2,
+    "translate": 2,
+    "validate": 2,
+    "compile": 1,
+}
+
+
+class BatchJob:
+    """One paper moving through the stages."""
+
+    def __init__(
+        self,
+        name: str,
+        arxiv_id: Optional[str] = None,
+        project_dir: Optional[str] = None,
+    ):
+        self.name = name
+        self.arxiv_id = arxiv_id
+        self.project_dir = project_dir
+        self.coordinator: Optional[CoordinatorAgent] = None
+        self.succeeded = False
+
+
+class BatchReport:
+    """Outcome and throughput of a batch run."""
+
+    def __init__(self) -> None:
+        self.papers = 0
+        self.succeeded: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.elapsed = 0.0
+        # Seconds spent inside each stage, summed over papers
+        self.stage_time: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+
+    @property
+    def papers_per_hour(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return len(self.succeeded) * 3600.0 / self.elapsed
+
+    def summary(self) -> str:
+        busy = ", ".join(
+            f"{stage} {seconds:.0f}s"
+            for stage, seconds in self.stage_time.items()
+            if seconds
+        )
+        return (
+            f"{len(self.succeeded)}/{self.papers} papers in {self.elapsed / 60:.1f} min "
+            f"({self.papers_per_hour:.1f} papers/hour; stage time: {busy or 'none'})"
+        )
+
+
+class BatchExecutor:
+    """Run the LaTeXTrans workflow for many papers with pipelined stages."""
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        projects_dir: str,
+        output_dir: str,
+        log: Callable[[str], Any] = print,
+    ):
+        self.config = config
+        self.projects_dir = projects_dir
+        self.output_dir = output_dir
+        self._log = log
+        options = config.get("batch", {})
+        self.workers = {
+            stage: max(1, int(options.get(f"{stage}_workers", default)))
+            for stage, default in DEFAULT_WORKERS.items()
+        }
+        # One AIMD limiter for every paper of the batch
+        self.limiter = AdaptiveConcurrencyLimiter.from_config(
+            config.get("concurrency"), log=log
+        )
+
+    def run(
+        self,
+        arxiv_ids: Sequence[str] = (),
+        project_dirs: Sequence[str] = (),
+    ) -> BatchReport:
+        """Process *arxiv_ids* (downloaded first) and local *project_dirs*."""
+
+        jobs = [BatchJob(arxiv_id, arxiv_id=arxiv_id) for arxiv_id in arxiv_ids]
+        jobs += [
+            BatchJob(os.path.basename(project_dir), project_dir=project_dir)
+            for project_dir in project_dirs
+        ]
+        return asyncio.run(self.run_async(jobs))
+
+    async def run_async(self, jobs: List[BatchJob]) -> BatchReport:
+        report = BatchReport()
+        report.papers = len(jobs)
+        started = time.monotonic()
+        # Bounded queues hold back papers when a later stage falls behind
+        queues = {
+            stage: asyncio.Queue(maxsize=self.workers[stage]) for stage in STAGES
+        }
+        workers = [
+            asyncio.create_task(self._worker(stage, queues, report))
+            for stage in STAGES
+            for _ in range(self.workers[stage])
+        ]
+        try:
+            for job in jobs:
+                first = "download" if job.project_dir is None else "parse"
+                await queues[first].put(job)
+            # A job is queued for its next stage before task_done on the last
+            for stage in STAGES:
+                await queues[stage].join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await close_async_clients()
+
+        report.elapsed = time.monotonic() - started
+        self._log(f"📊 Batch finished: {report.summary()}.")
+        for name, error in report.failed.items():
+            self._log(f"❌ Error processing project {name}: {error}")
+        return report
+
+    async def _worker(
+        self,
+        stage: str,
+        queues: Dict[str, "asyncio.Queue[BatchJob]"],
+        report: BatchReport,
+    ) -> None:
+        next_stage = STAGES[STAGES.index(stage) + 1] if stage != STAGES[-1] else None
+        while True:
+            job = await queues[stage].get()
+            started = time.monotonic()
+            error: Optional[str] = None
+            try:
+                await getattr(self, f"_{stage}")(job)
+            except Exception as e:
+                error = f"{stage} failed: {e}"
+            report.stage_time[stage] += time.monotonic() - started
+
+            try:
+                if error is None and next_stage is not None:
+                    await queues[next_stage].put(job)
+                    continue
+                if error is None and not job.succeeded:
+                    error = "compile failed"
+                if error is None:
+                    report.succeeded.append(job.name)
+                else:
+                    report.failed[job.name] = error
+            finally:
+                queues[stage].task_done()
+
+    async def _download(self, job: BatchJob) -> None:
+        def download() -> str:
+            source_dirs = batch_download_arxiv_tex([job.arxiv_id], self.projects_dir)
+            if not source_dirs or source_dirs[0] is None:
+                raise ValueError(f"no TeX source found for {job.arxiv_id}")
+            # Only this paper's archive: another one may still be downloading
+            archive = os.path.join(self.projects_dir, f"{job.arxiv_id}.tar.gz")
+            if os.path.exists(archive):
+                extract_compressed_file(archive)
+            return source_dirs[0]
+
+        job.project_dir = await asyncio.to_thread(download)
+
+    async def _parse(self, job: BatchJob) -> None:
+        job.coordinator = CoordinatorAgent(
+            config=self.config,
+            project_dir=job.project_dir,
+            output_dir=self.output_dir,
+            limiter=self.limiter,
+        )
+        await job.coordinator.parse()
+
+    async def _translate(self, job: BatchJob) -> None:
+        await job.coordinator.translate()
+
+    async def _validate(self, job: BatchJob) -> None:
+        await job.coordinator.validate()
+
+    async def _compile(self, job: BatchJob) -> None:
+        job.succeeded = await asyncio.to_thread(job.coordinator.generate)
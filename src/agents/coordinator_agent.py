@@ -2,18 +2,33 @@
 
 import os
 import shutil
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 import sys
 import asyncio
 from .tool_agents.parser_agent import ParserAgent
 from .tool_agents.translator_agent import TranslatorAgent
 from .tool_agents.generator_agent import GeneratorAgent
 from .tool_agents.validator_agent import ValidatorAgent
+from src.llm.client import close_async_clients, configure_http_pool
+from src.llm.concurrency import AdaptiveConcurrencyLimiter
 
 base_dir = os.getcwd()
 sys.path.append(base_dir)
 
 
+def previous_output_for(previous_dir: Optional[str], name: str) -> Optional[str]:
+    """Return the earlier output of the paper whose output directory is *name*.
+
+    *previous_dir* is either an output directory holding one translated
+    project per paper, like ``output_dir``, or the output of a single paper.
+    The project named *name* inside it is used when it exists.
+    """
+    if not previous_dir:
+        return None
+    per_project = os.path.join(previous_dir, name)
+    return per_project if os.path.isdir(per_project) else previous_dir
+
+
 class CoordinatorAgent:
     """
     The main orchestrator agent for the translation system.
@@ -26,77 +41,179 @@ class CoordinatorAgent:
         config: Dict[str, Any],
         project_dir: str,
         output_dir: str,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
     ):
-        """Persist configuration and derived state required for coordination."""
+        """Persist configuration and derived state required for coordination.
+
+        *limiter*, when given, replaces the per-agent LLM concurrency limiters
+        so that several papers processed together share one budget.
+        """
         self.config = config
         self.name = config.get("sys_name", "LaTeXTrans")
         self.target_language = config.get("target_language", "ch")
         self.source_language = config.get("source_language", "en")
         self.project_dir = project_dir  # Project path for parsing
         self.output_dir = output_dir  # Output directory for parsed files
-        self.loop = asyncio.new_event_loop()
+        # Created by workflow_latextrans; the batch executor brings its own loop
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
         self.mode = config.get("mode", 0)
+        # Reuse translations of an interrupted run over the same sources
+        self.resume = bool(config.get("resume", False))
+        self.enable_validator = bool(config.get("enable_validator", True))
+        # Validate each segment as it is translated; the whole-map pass then only
+        # retranslates records that were not checked that way
+        self.streaming_validation = self.enable_validator and bool(
+            config.get("streaming_validation", True)
+        )
+        self.limiter = limiter
+        configure_http_pool(config.get("http_pool"))
+
+        base_name = os.path.basename(project_dir)
+        self.transed_project_dir = os.path.join(
+            output_dir, f"{self.target_language}_{base_name}"
+        )
+        # Output of this paper's earlier version, see previous_output_for
+        self.previous_output_dir = previous_output_for(
+            config.get("previous_output_dir"),
+            os.path.basename(self.transed_project_dir),
+        )
+        self.parser_agent: Optional[ParserAgent] = None
+        self.translator_agent: Optional[TranslatorAgent] = None
+        self.validator_agent: Optional[ValidatorAgent] = None
+        self.resumed = False
 
     def run_async(self, coro):
         """Execute an asynchronous coroutine on the coordinator's event loop."""
+        if self.loop is None or self.loop.is_closed():
+            self.loop = asyncio.new_event_loop()
         return self.loop.run_until_complete(coro)
 
     async def workflow_latextrans_async(self) -> None:
         """Run the full translation workflow using asynchronous translator calls."""
-        base_name = os.path.basename(self.project_dir)
-        transed_project_dir = os.path.join(
-            self.output_dir, f"{self.target_language}_{base_name}"
-        )
+        await self.parse()
+        await self.translate()
+        await self.validate()
+        self.generate()
 
-        os.makedirs(transed_project_dir, exist_ok=True)
+    async def parse(self) -> None:
+        """Parse the project into section, caption and environment maps."""
+        os.makedirs(self.transed_project_dir, exist_ok=True)
 
-        parser_agent = ParserAgent(
+        self.parser_agent = ParserAgent(
             config=self.config,
             project_dir=self.project_dir,
-            output_dir=transed_project_dir,
+            output_dir=self.transed_project_dir,
         )
-        parser_agent.execute()
+        if self.limiter is not None:
+            self.parser_agent.limiter = self.limiter
+        self.parser_agent.previous_output_dir = self.previous_output_dir
+        self.resumed = self.resume and await asyncio.to_thread(
+            self.parser_agent.can_resume
+        )
+        if self.resumed:
+            self.parser_agent.log(
+                "♻️ Sources unchanged since the last run, reusing the parsed maps."
+            )
+        else:
+            await self.parser_agent.execute()
 
-        translator_agent = TranslatorAgent(
+    async def translate(self) -> None:
+        """Translate the parsed maps, validating segments on the fly if enabled."""
+        self.translator_agent = TranslatorAgent(
             config=self.config,
             project_dir=self.project_dir,
-            output_dir=transed_project_dir,
+            output_dir=self.transed_project_dir,
             trans_mode=self.mode,
         )
-        await translator_agent.execute()  # await
+        if self.limiter is not None:
+            self.translator_agent.limiter = self.limiter
+        # Only translations that pass validation may be served from the cache
+        self.translator_agent.cache_after_validation = self.enable_validator
+        self.validator_agent = ValidatorAgent(
+            config=self.config,
+            project_dir=self.project_dir,
+            output_dir=self.transed_project_dir,
+        )
+        if self.resumed:
+            kept, total = await asyncio.to_thread(
+                self.translator_agent.prepare_resume,
+                lambda part: self.validator_agent.validate_part(part) is None,
+            )
+            self.translator_agent.log(
+                f"♻️ Resuming: kept {kept}/{total} translated segments, translating the rest."
+            )
+        if self.enable_validator:
+            self.translator_agent.piece_validator = self.validator_agent.validate_part
+        if self.streaming_validation:
+            self.translator_agent.part_validator = self.validator_agent.validate_part
+        await self.translator_agent.execute()  # await
 
-        if self.config.get("enable_validator", True):
-            validator_agent = ValidatorAgent(
-                config=self.config,
-                project_dir=self.project_dir,
-                output_dir=transed_project_dir,
+    async def validate(self) -> None:
+        """Validate the maps and retranslate the errors in passes.
+
+        With streaming validation most segments were already checked and
+        corrected as they were translated. The whole-map pass still runs for
+        the records that never went through the translator's check (kept,
+        resumed or carried-forward ones, and untranslated sections), but only
+        its new errors are sent back for retranslation.
+        """
+        translator_agent = self.translator_agent
+        validator_agent = self.validator_agent
+        if self.enable_validator:
+            # Validation reads and checks every map; run it off the event loop
+            errors_report = await asyncio.to_thread(validator_agent.execute)
+            stream_errors = translator_agent.stream_errors
+            # Errors left after streaming already used up their retries
+            exhausted = [e for e in errors_report if e["num_or_ph"] in stream_errors]
+            errors_report = await self._retranslate_errors(
+                [e for e in errors_report if e["num_or_ph"] not in stream_errors]
             )
+            if exhausted:
+                errors_report = exhausted + errors_report
+                validator_agent.report_errors(errors_report)
+        else:
+            errors_report = []
+        translator_agent.settle_cache(errors_report)
 
-            errors_report = validator_agent.execute()
-            max_retries = int(self.config.get("validator_max_retries", 2))
-            retry_count = 0
+        if self.parser_agent.carry_report is not None:
+            self.parser_agent.log(
+                f"♻️ Incremental translation: {self.parser_agent.carry_report.summary()}."
+            )
 
-            while errors_report and retry_count < max_retries:
-                translator_agent.trans_mode = 1
-                translator_agent.errors_report = errors_report
-                await translator_agent.execute(
-                    error_retry_count=retry_count,
-                    Maxtry=max_retries,
-                )
+    async def _retranslate_errors(self, errors_report: List[Dict]) -> List[Dict]:
+        """Retranslate *errors_report* until it validates or retries run out."""
+        translator_agent = self.translator_agent
+        validator_agent = self.validator_agent
+        max_retries = int(self.config.get("validator_max_retries", 2))
+        retry_count = 0
 
-                retry_count += 1
-                errors_report = validator_agent.execute(errors_report=errors_report)
+        while errors_report and retry_count < max_retries:
+            translator_agent.trans_mode = 1
+            translator_agent.errors_report = errors_report
+            await translator_agent.execute(
+                error_retry_count=retry_count,
+                Maxtry=max_retries,
+            )
 
-            if errors_report:
-                validator_agent.log(
-                    "⚠️ Validation still reports issues after maximum retries.",
-                    level="warning",
-                )
+            retry_count += 1
+            errors_report = await asyncio.to_thread(
+                validator_agent.execute, errors_report=errors_report
+            )
 
+        if errors_report:
+            validator_agent.log(
+                "⚠️ Validation still reports issues after maximum retries.",
+                level="warning",
+            )
+        return errors_report
+
+    def generate(self) -> bool:
+        """Compile the translated project; return whether a PDF was produced."""
+        base_name = os.path.basename(self.project_dir)
         generator_agent = GeneratorAgent(
             config=self.config,
             project_dir=self.project_dir,
-            output_dir=transed_project_dir,
+            output_dir=self.transed_project_dir,
         )
         try:
             PDF_file_path = generator_agent.execute()
@@ -104,25 +221,27 @@ class CoordinatorAgent:
             print(
                 f"🤖🚧 {self.name}: Failed to translated {os.path.basename(self.project_dir)}.{e}"
             )
-            return
+            return False
 
         if PDF_file_path:
             new_PDF_path = os.path.join(
-                transed_project_dir, f"{self.target_language}_{base_name}.pdf"
+                self.transed_project_dir, f"{self.target_language}_{base_name}.pdf"
             )
             shutil.move(PDF_file_path, new_PDF_path)
             print(
                 f"🤖🎉 {self.name}: Successfully translated {os.path.basename(self.project_dir)} to {new_PDF_path}."
             )
+            return True
         else:
             print(
                 f"🤖🚧 {self.name}: Failed to translated {os.path.basename(self.project_dir)}."
             )
+            return False
 
     def workflow_latextrans(self) -> None:
         """Convenience wrapper to launch the async workflow with loop management."""
 
-        if hasattr(self, "loop") and not self.loop.is_closed():
+        if self.loop is not None and not self.loop.is_closed():
             self.loop.close()
 
         self.loop = asyncio.new_event_loop()
@@ -132,6 +251,9 @@ class CoordinatorAgent:
             self.loop.run_until_complete(self.workflow_latextrans_async())
 
         finally:
+            # Release the pooled keep-alive connections bound to this loop
+            self.loop.run_until_complete(close_async_clients())
+
             # Complete all asynchronous resource recycling
             if tasks := asyncio.all_tasks(self.loop):
                 self.loop.run_until_complete(
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
+import contextlib
 import json
+import os
+import tempfile
 import yaml
 import toml
 from pathlib import Path
@@ -85,13 +88,31 @@ class BaseToolAgent(ABC):
     def save_file(self, file_path: Path | str, file_format: str, data: Any):
         """
         Saves data to a file.
+
+        The data is written to a temporary file in the same directory and then
+        renamed over the target, so a crash never leaves a half-written file.
         """
-        if file_format == "json":
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-        elif file_format == "yaml":
-            with open(file_path, "w", encoding="utf-8") as f:
-                yaml.dump(data, f)
-        elif file_format == "toml":
-            with open(file_path, "w", encoding="utf-8") as f:
-                toml.dump(data, f)
+        if file_format not in ("json", "yaml", "toml"):
+            raise ValueError(f"Unsupported file format: {file_format}")
+        file_path = Path(file_path)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                if file_format == "json":
+                    json.dump(data, f, indent=4, ensure_ascii=False)
+                elif file_format == "yaml":
+                    yaml.dump(data, f)
+                elif file_format == "toml":
+                    toml.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates owner-only files; keep the usual permissions
+            mode = file_path.stat().st_mode & 0o777 if file_path.exists() else 0o644
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
@@ -1,6 +1,6 @@
 """Generator agent responsible for reconstructing translated LaTeX projects."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from src.agents.tool_agents.base_tool_agent import BaseToolAgent
 from pathlib import Path
 import sys
@@ -92,6 +92,7 @@ class GeneratorAgent(BaseToolAgent):
         sys.stderr = sys.__stderr__
 
         transed_latex_dir = self._creat_transed_latex_folder(self.project_dir)
+        main_tex_file = self._main_tex_file(transed_latex_dir)
 
         sys.stderr = open(os.devnull, "w")
         self.progress_bar.progress(70)
@@ -109,6 +110,7 @@ class GeneratorAgent(BaseToolAgent):
             inputs=inputs,
             newcommands=newcommands,
             output_latex_dir=transed_latex_dir,
+            main_tex_file=main_tex_file,
         )
         latex_constructor.construct()
 
@@ -117,7 +119,9 @@ class GeneratorAgent(BaseToolAgent):
         self.status_text.text("🛠️ Compiling PDF document...")
         sys.stderr = sys.__stderr__
 
-        latex_compiler = LaTexCompiler(output_latex_dir=transed_latex_dir)
+        latex_compiler = LaTexCompiler(
+            output_latex_dir=transed_latex_dir, main_tex_file=main_tex_file
+        )
         pdf_file = latex_compiler.compile()
 
         sys.stderr = open(os.devnull, "w")
@@ -146,6 +150,16 @@ class GeneratorAgent(BaseToolAgent):
             sys.stderr = sys.__stderr__
             return None
 
+    def _main_tex_file(self, transed_latex_dir: str) -> Optional[str]:
+        """Main file of the cloned project as recorded in the parser's manifest."""
+        from src.formats.latex.manifest import MANIFEST_FILE, ProjectManifest
+
+        manifest_path = Path(self.output_dir, MANIFEST_FILE)
+        if not manifest_path.exists():
+            return None  # Parsed before manifests existed; search the clone
+        manifest = ProjectManifest.from_dict(self.read_file(manifest_path, "json"))
+        return manifest.main_path(transed_latex_dir)
+
     def _creat_transed_latex_folder(self, src_dir: str) -> str:
         """Clone the original project into the translation output directory."""
         if not os.path.isdir(src_dir):
@@ -1,13 +1,25 @@
 """Parser agent responsible for preparing LaTeX inputs for translation."""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from src.agents.tool_agents.base_tool_agent import BaseToolAgent
 import src.formats.latex.prompts as pm
+from src.formats.latex.env_classifier import classify_env, env_decision_key
+from src.formats.latex.incremental import MAP_KINDS, CarryOverReport, carry_forward
+from src.formats.latex.journal import JOURNAL_FILE, TranslationJournal
+from src.formats.latex.manifest import MANIFEST_FILE, ProjectManifest
+from src.llm.cache import translation_cache_from_config
+from src.llm.client import get_aiohttp_session, get_async_ollama_client
+from src.llm.concurrency import AdaptiveConcurrencyLimiter
+from src.llm.balancer import Endpoint, get_balancer
+from src.llm.retry import RetryPolicy
+from src.llm.tokens import count_tokens
 from pathlib import Path
+import json
 import sys
 import os
-import requests
-import time
+import re
+import asyncio
+import aiohttp
 from tqdm import tqdm
 
 # Optional Ollama support to mirror translator agent behaviour
@@ -22,6 +34,52 @@ except ImportError:
 base_dir = os.getcwd()
 sys.path.append(base_dir)
 
+# One "<id>: True/False" answer per line of a batched judge response
+_BATCH_VERDICT_RE = re.compile(r"^\W*(\d+)\W+(true|false)\b", re.IGNORECASE | re.MULTILINE)
+
+
+def format_env_judge_batch(contents: List[str]) -> str:
+    """Wrap environment contents in ``[[ENV n]]`` blocks numbered from 1."""
+
+    return "\n".join(
+        f"[[ENV {i}]]\n{content}\n[[/ENV {i}]]"
+        for i, content in enumerate(contents, start=1)
+    )
+
+
+def parse_env_judge_batch(output: str, count: int) -> Dict[int, bool]:
+    """Map block IDs to verdicts; IDs the model did not answer are left out."""
+
+    verdicts: Dict[int, bool] = {}
+    for match in _BATCH_VERDICT_RE.finditer(output):
+        env_id = int(match.group(1))
+        if 1 <= env_id <= count and env_id not in verdicts:
+            verdicts[env_id] = match.group(2).lower() == "true"
+    return verdicts
+
+
+def parse_env_judgement(output: str) -> bool:
+    """Interpret a single judge answer; anything but an explicit no translates."""
+
+    return output.strip().strip("`.'\"").lower() not in {"false", "0"}
+
+
+# Written once parsing finished; records which sources the maps came from
+RESUME_STATE_FILE = "resume_state.json"
+PARSED_MAP_FILES = (
+    "inputs_map.json",
+    "envs_map.json",
+    "captions_map.json",
+    "newcommands_map.json",
+    "sections_map.json",
+)
+
+
+def project_source_hash(project_dir: str) -> str:
+    """Return a SHA-256 over the relative paths and contents of all project files."""
+
+    return ProjectManifest.build(project_dir).source_hash
+
 
 class ParserAgent(BaseToolAgent):
     """Parse LaTeX projects and flag environments that require translation."""
@@ -58,6 +116,28 @@ class ParserAgent(BaseToolAgent):
             assert self.base_url is not None
             self.ollama_host = self.base_url.replace("/v1/chat/completions", "")
 
+        # Unchanged segments reuse the translations of an earlier version
+        self.previous_output_dir = config.get("previous_output_dir") or None
+        self.carry_report: Optional[CarryOverReport] = None
+        # Built once per run and saved next to the maps for the later agents
+        self.manifest: Optional[ProjectManifest] = None
+        # Obvious environments are decided locally before asking the LLM
+        self.enable_env_rules = config.get("enable_env_rules", True)
+        # LLM verdicts are remembered across runs by env name and content hash
+        self.cache = translation_cache_from_config(config.get("cache"), output_dir)
+        # Environments packed into one judge prompt; 1 asks about each separately
+        self.judge_batch_size = max(1, int(config.get("env_judge_batch_size", 1)))
+        self.limiter = AdaptiveConcurrencyLimiter.from_config(
+            config.get("concurrency"), log=self.log
+        )
+        self.retry_policy = RetryPolicy.from_config(config.get("retry"))
+        # Same endpoints, rate limits and health state as the translator
+        self.balancer = get_balancer(config["llm_config"], log=self.log)
+        if not OLLAMA_AVAILABLE and any(e.use_ollama for e in self.balancer.endpoints):
+            raise ImportError(
+                "Ollama package not installed. Please install with: pip install ollama"
+            )
+
     @staticmethod
     def _is_ollama_endpoint(base_url: Optional[str]) -> bool:
         """Return ``True`` if the provided endpoint appears to target Ollama."""
@@ -67,28 +147,46 @@ class ParserAgent(BaseToolAgent):
         lowered = base_url.lower()
         return "localhost:11434" in lowered or "ollama" in lowered
 
-    def execute(self, data: Any = None, **kwargs: Any) -> Any:
+    async def execute(self, data: Any = None, **kwargs: Any) -> Any:
         """Parse the LaTeX project and evaluate translation requirements.
 
         The method drives the parsing process, identifies environments that
-        should be translated, runs the LLM heuristic for ambiguous cases, and
-        persists the resulting structured metadata to disk.
+        should be translated, runs the LLM heuristic for ambiguous cases
+        concurrently, and persists the resulting structured metadata to disk.
         """
 
         pm.init_prompts(self.config["source_language"], self.config["target_language"])
         self.log(
             f"🤖💬 Starting parsing for project...⏳: {os.path.basename(self.project_dir)}."
         )
+        # Maps from an earlier parse are about to be overwritten
+        Path(self.output_dir, RESUME_STATE_FILE).unlink(missing_ok=True)
 
         from src.formats.latex.parser import LatexParser
 
-        latex_parser = LatexParser(self.project_dir, self.output_dir)
-        latex_parser.parse()
+        # Hashing and parsing are blocking; keep them off the shared event loop
+        manifest = self.manifest or await asyncio.to_thread(self.refresh_manifest)
+        latex_parser = LatexParser(
+            self.project_dir,
+            self.output_dir,
+            main_tex_file=manifest.main_path(self.project_dir),
+        )
+        await asyncio.to_thread(latex_parser.parse)
+
+        if self.previous_output_dir:
+            self.carry_report = await asyncio.to_thread(
+                self._carry_forward_previous, latex_parser
+            )
+        judged_envs = self.carry_report.judged_envs if self.carry_report else set()
 
         env_need_trans = []
         if latex_parser.envs_json:
             for env in latex_parser.envs_json:
-                if env["need_trans"] and env["env_name"] not in ["abstract", "itemize"]:
+                if (
+                    env["need_trans"]
+                    and env["env_name"] not in ["abstract", "itemize"]
+                    and env["placeholder"] not in judged_envs
+                ):
                     env_need_trans.append(env)
 
         if env_need_trans:
@@ -100,23 +198,32 @@ class ParserAgent(BaseToolAgent):
                 env["placeholder"]: i for i, env in enumerate(latex_parser.envs_json)
             }
 
-            for env in tqdm(
-                env_need_trans,
-                desc="Setting need trans",
-                total=len(env_need_trans),
-                unit="env",
-            ):
+            verdicts = await self._set_need_trans(env_need_trans)
+            for env, need_trans in zip(env_need_trans, verdicts):
                 i = placeholder_to_index.get(env["placeholder"])
                 if i is not None:
-                    latex_parser.envs_json[i]["need_trans"] = (
-                        self._request_llm_for_judge(
-                            pm.set_need_trans_for_envs_system_prompt, env["content"]
-                        )
-                    )
+                    latex_parser.envs_json[i]["need_trans"] = need_trans
+
+        await asyncio.to_thread(self._save_parsed, latex_parser, manifest)
+
+        self.log(f"✅ Successfully parsed {os.path.basename(self.project_dir)}.")
+        self.log(f"🤖💬 Parsed files are saved in {self.output_dir}.")
+
+    def _save_parsed(self, latex_parser, manifest: ProjectManifest) -> None:
+        """Write the parsed maps, the manifest and the resume state."""
 
         self.save_file(
             Path(self.output_dir, "inputs_map.json"), "json", latex_parser.inputs_json
         )
+        self.save_file(
+            Path(self.output_dir, MANIFEST_FILE), "json", manifest.to_dict()
+        )
+        # Which tex file inputs which, for stages that work per file
+        self.save_file(
+            Path(self.output_dir, "include_graph.json"),
+            "json",
+            latex_parser.include_graph,
+        )
         self.save_file(
             Path(self.output_dir, "envs_map.json"), "json", latex_parser.envs_json
         )
@@ -136,8 +243,58 @@ class ParserAgent(BaseToolAgent):
             latex_parser.sections_json,
         )
 
-        self.log(f"✅ Successfully parsed {os.path.basename(self.project_dir)}.")
-        self.log(f"🤖💬 Parsed files are saved in {self.output_dir}.")
+        self.save_file(
+            Path(self.output_dir, RESUME_STATE_FILE),
+            "json",
+            {"source_hash": manifest.source_hash},
+        )
+
+    def _carry_forward_previous(self, latex_parser) -> Optional[CarryOverReport]:
+        """Reuse translations from ``previous_output_dir`` for unchanged segments."""
+
+        previous = {}
+        for kind in MAP_KINDS:
+            path = Path(self.previous_output_dir, f"{kind}_map.json")
+            if not path.exists():
+                self.log(
+                    f"⚠️ No {path.name} in {self.previous_output_dir}, translating everything.",
+                    level="warning",
+                )
+                return None
+            previous[kind] = self.read_file(path, "json")
+        # Segments finished by an interrupted run were only journalled
+        TranslationJournal(Path(self.previous_output_dir, JOURNAL_FILE)).apply(previous)
+
+        report = carry_forward(
+            previous,
+            {
+                "sections": latex_parser.sections_json,
+                "captions": latex_parser.captions_json,
+                "envs": latex_parser.envs_json,
+            },
+        )
+        self.log(f"♻️ Compared with {self.previous_output_dir}: {report.summary()}.")
+        return report
+
+    def can_resume(self) -> bool:
+        """Return ``True`` if the maps in ``output_dir`` were parsed from these sources."""
+
+        state_path = Path(self.output_dir, RESUME_STATE_FILE)
+        if not state_path.exists() or not all(
+            Path(self.output_dir, name).exists() for name in PARSED_MAP_FILES
+        ):
+            return False
+        try:
+            state = self.read_file(state_path, "json")
+        except (OSError, json.JSONDecodeError):
+            return False
+        return state.get("source_hash") == self.refresh_manifest().source_hash
+
+    def refresh_manifest(self) -> ProjectManifest:
+        """Build the manifest of ``project_dir`` from the sources as they are now."""
+
+        self.manifest = ProjectManifest.build(self.project_dir)
+        return self.manifest
 
     # def _set_need_trans(self, env: Dict[str, Any]) -> Dict[str, Any]:
     #     """
@@ -152,74 +309,241 @@ class ParserAgent(BaseToolAgent):
     #     )
     #     return set_env
 
-    def _build_judge_payload(self, system_prompt: str, text: str) -> Dict[str, Any]:
+    def _build_judge_payload(
+        self,
+        system_prompt: str,
+        text: str,
+        max_tokens: int = 50,
+        model: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Construct the OpenAI-compatible payload for environment evaluation."""
 
         return {
-            "model": self.model,
+            "model": model or self.model,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": text},
             ],
             "temperature": 0,
-            "max_tokens": 50,
+            "max_tokens": max_tokens,
         }
 
-    def _get_headers(self) -> Dict[str, str]:
+    def _get_headers(self, api_key: Optional[str] = None) -> Dict[str, str]:
         """Return authorization headers for OpenAI-compatible endpoints."""
 
-        if not self.API_KEY:
+        api_key = api_key or self.API_KEY
+        if not api_key:
             return {"Content-Type": "application/json"}
         return {
-            "Authorization": f"Bearer {self.API_KEY}",
+            "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
 
-    def _request_llm_for_judge(self, system_prompt: str, text: str) -> bool:
-        """Run a lightweight LLM call to determine environment translation need."""
+    async def _set_need_trans(self, envs: List[Dict[str, Any]]) -> List[bool]:
+        """Decide ``need_trans`` for *envs*, escalating only unclear ones.
 
-        payload = self._build_judge_payload(system_prompt, text)
+        Environments are first classified by local rules, then looked up in
+        the verdict cache; identical remaining environments share one LLM
+        judge call. Failed judgements default to ``True`` and are not cached.
+        """
 
-        if self.use_ollama:
-            if self.ollama_host is None or ollama is None:
-                raise RuntimeError("Ollama host not configured correctly.")
-            client = ollama.Client(host=self.ollama_host)
-            response = client.chat(
-                model=self.model,
-                messages=payload["messages"],
-                options={"temperature": 0, "num_ctx": 1024},
+        verdicts: List[Optional[bool]] = [None] * len(envs)
+        pending: Dict[str, List[int]] = {}
+        by_rules = by_cache = 0
+
+        for i, env in enumerate(envs):
+            if self.enable_env_rules:
+                decision = classify_env(env["env_name"], env["content"])
+                if decision is not None:
+                    verdicts[i] = decision
+                    by_rules += 1
+                    continue
+            key = env_decision_key(self.model, env["env_name"], env["content"])
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                verdicts[i] = cached == "True"
+                by_cache += 1
+                continue
+            pending.setdefault(key, []).append(i)
+
+        keys = list(pending)
+        judged = await self._judge_envs([envs[pending[key][0]] for key in keys])
+        for key, verdict in zip(keys, judged):
+            for i in pending[key]:
+                verdicts[i] = verdict
+            if verdict is not None and self.cache is not None:
+                self.cache.put(key, str(verdict))
+
+        self.log(
+            f"🧮 need_trans for {len(envs)} environments: {by_rules} by rules, "
+            f"{by_cache} from cache, {len(keys)} judged by the LLM "
+            f"({len(envs) - len(keys)} judge calls skipped)."
+        )
+        return [True if verdict is None else verdict for verdict in verdicts]
+
+    async def _judge_envs(self, envs: List[Dict[str, Any]]) -> List[Optional[bool]]:
+        """Judge every environment concurrently, ``judge_batch_size`` per prompt.
+
+        Returns the ``need_trans`` verdicts in the order of *envs*, with
+        ``None`` where the judge could not be reached.
+        """
+
+        size = self.judge_batch_size
+        batches = [envs[i : i + size] for i in range(0, len(envs), size)]
+
+        async def judge_batch(start: int, batch: List[Dict[str, Any]]):
+            if len(batch) == 1:
+                verdict = await self._request_llm_for_judge(
+                    pm.set_need_trans_for_envs_system_prompt, batch[0]["content"]
+                )
+                return start, [verdict]
+            return start, await self._request_llm_for_judge_batch(
+                [env["content"] for env in batch]
             )
-            output = response["message"]["content"].strip().lower()
-            return output == "true" or output not in {"false", "0"}
 
-        if not self.base_url:
-            raise ValueError(
-                "base_url must be configured for non-Ollama LLM requests in ParserAgent"
+        tasks = [judge_batch(i * size, batch) for i, batch in enumerate(batches)]
+        verdicts: List[Optional[bool]] = [None] * len(envs)
+        if not envs:
+            return verdicts
+        with tqdm(total=len(envs), desc="Setting need trans", unit="env") as bar:
+            for future in asyncio.as_completed(tasks):
+                start, results = await future
+                verdicts[start : start + len(results)] = results
+                bar.update(len(results))
+        return verdicts
+
+    async def _request_llm_for_judge(
+        self, system_prompt: str, text: str
+    ) -> Optional[bool]:
+        """Run a lightweight LLM call to determine environment translation need.
+
+        Returns ``None`` when every attempt failed; callers then translate.
+        """
+
+        output = await self._request_llm_with_retries(system_prompt, text)
+        if output is None:
+            print("⚠️ Failed to Set need trans, set True.")
+            return None
+        return parse_env_judgement(output)
+
+    async def _request_llm_for_judge_batch(
+        self, contents: List[str]
+    ) -> List[Optional[bool]]:
+        """Judge several environments with one ID-tagged prompt.
+
+        Environments whose ID is missing from the answer are judged one by one.
+        """
+
+        output = await self._request_llm_with_retries(
+            pm.set_need_trans_for_envs_batch_system_prompt,
+            format_env_judge_batch(contents),
+            max_tokens=10 * len(contents) + 20,
+        )
+        verdicts: Dict[int, Optional[bool]] = dict(
+            parse_env_judge_batch(output or "", len(contents))
+        )
+        missing = [i for i in range(1, len(contents) + 1) if i not in verdicts]
+        if missing:
+            self.log(
+                f"⚠️ Batched judge answered {len(contents) - len(missing)}/{len(contents)} environments, judging the rest individually.",
+                level="warning",
             )
+            answers = await asyncio.gather(
+                *(
+                    self._request_llm_for_judge(
+                        pm.set_need_trans_for_envs_system_prompt, contents[i - 1]
+                    )
+                    for i in missing
+                )
+            )
+            verdicts.update(zip(missing, answers))
+        return [verdicts[i] for i in range(1, len(contents) + 1)]
+
+    async def _request_llm_with_retries(
+        self, system_prompt: str, text: str, max_tokens: int = 50
+    ) -> Optional[str]:
+        """Send a judge request, retrying transient failures; ``None`` if all fail."""
 
-        headers = self._get_headers()
+        def on_retry(attempt: int, reason: str, delay: float, exc: BaseException):
+            self.log(
+                f"⚠️ Judge request failed ({reason}: {exc}), retrying in {delay:.1f}s.",
+                level="warning",
+            )
 
-        for attempt in range(1, 4):
+        try:
+            return await self.retry_policy.run(
+                lambda: self._send_judge_request(system_prompt, text, max_tokens),
+                on_retry=on_retry,
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+        except Exception as e:
+            # A malformed answer or a misconfigured endpoint must not abort the
+            # other judgements; the caller falls back to translating the env
+            self.log(f"⚠️ Judge request failed: {e!r}", level="warning")
+            return None
+
+    async def _send_judge_request(
+        self, system_prompt: str, text: str, max_tokens: int
+    ) -> str:
+        """Issue one judge call through the shared balancer and limits."""
+
+        estimated_tokens = count_tokens(system_prompt) + count_tokens(text) + max_tokens
+        async with self.limiter.slot() as slot:
+            endpoint = self.balancer.acquire()
+            try:
+                await endpoint.rate_limiter.acquire(estimated_tokens)
+                slot.restart()
+                with self.balancer.track(endpoint):
+                    return await self._post_judge_request(
+                        endpoint, system_prompt, text, max_tokens, estimated_tokens
+                    )
+            finally:
+                self.balancer.release(endpoint)
+
+    async def _post_judge_request(
+        self,
+        endpoint: Endpoint,
+        system_prompt: str,
+        text: str,
+        max_tokens: int,
+        estimated_tokens: int,
+    ) -> str:
+        """Send the judge prompt to *endpoint* and return the raw answer."""
+
+        payload = self._build_judge_payload(
+            system_prompt, text, max_tokens, endpoint.model
+        )
+        if endpoint.use_ollama:
+            if endpoint.ollama_host is None:
+                raise RuntimeError("Ollama host not configured correctly.")
             try:
-                response = requests.post(
-                    self.base_url, json=payload, headers=headers, timeout=100
+                response = await get_async_ollama_client(endpoint.ollama_host).chat(
+                    model=endpoint.model or self.model,
+                    messages=payload["messages"],
+                    options={
+                        "temperature": 0,
+                        "num_ctx": 1024 if estimated_tokens < 1024 else 8192,
+                    },
                 )
-                response.raise_for_status()
-                result = response.json()
-                output = result["choices"][0]["message"]["content"].strip().lower()
-
-                if output == "true":
-                    return True
-                if output == "false":
-                    return False
-                return True
-            except requests.exceptions.RequestException as e:
-                if attempt < 3:
-                    print(f"{e}")
-                    time.sleep(3)
-                else:
-                    print("⚠️ Failed to Set need trans, set True.")
-                    return True
-
-        # Default fallback if all attempts fail
-        return True
+            except Exception as e:
+                raise aiohttp.ClientError(f"Ollama request failed: {e}") from e
+            return response["message"]["content"]
+
+        if not endpoint.base_url:
+            raise ValueError(
+                "base_url must be configured for non-Ollama LLM requests in ParserAgent"
+            )
+
+        async with get_aiohttp_session().post(
+            endpoint.base_url,
+            json=payload,
+            headers=self._get_headers(endpoint.api_key),
+            timeout=aiohttp.ClientTimeout(total=100),
+        ) as response:
+            endpoint.rate_limiter.update_from_headers(response.headers)
+            response.raise_for_status()
+            result = await response.json()
+        usage = result.get("usage") or {}
+        endpoint.rate_limiter.reconcile(estimated_tokens, usage.get("total_tokens"))
+        return result["choices"][0]["message"]["content"]
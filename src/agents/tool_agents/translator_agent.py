@@ -1,6 +1,6 @@
 """Translator tool agent orchestrating LaTeX-aware translation with LLM backends."""
 
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
 from src.agents.tool_agents.base_tool_agent import BaseToolAgent
 
 # from TransLatex.src.formats.latex.prompts import *
@@ -11,7 +11,35 @@ from src.formats.latex.utils import (
     replace_href,
     replace_includegraphics,
 )
+from src.formats.latex.glossary import GlossaryIndex
+from src.formats.latex.journal import JOURNAL_FILE, KEY_FIELDS, TranslationJournal
+from src.formats.latex.splitter import split_for_token_budget
+from src.formats.latex.prompt_builder import (
+    build_glossary_request,
+    build_packed_request,
+    build_retranslation_request,
+    parse_packed_response,
+)
 from src.formats.latex.validation_utils import sanitize_translated_text
+from src.llm.cache import make_cache_key, translation_cache_from_config
+from src.llm.client import (
+    get_aiohttp_session,
+    get_async_ollama_client,
+    get_ollama_client,
+    get_requests_session,
+)
+from src.llm.concurrency import AdaptiveConcurrencyLimiter
+from src.llm.hedging import Hedger
+from src.llm.packing import RequestPacker
+from src.llm.retry import OnRetry, RetryLog, RetryPolicy
+from src.llm.balancer import Endpoint, get_balancer
+from src.llm.streaming import (
+    collect_stream,
+    iter_sse_events,
+    ollama_delta_text,
+    openai_delta_text,
+)
+from src.llm.tokens import cached_prompt_tokens, count_tokens
 from pathlib import Path
 import sys
 import os
@@ -20,7 +48,6 @@ import json
 import asyncio
 import aiohttp
 import requests
-import time
 import pandas as pd
 from tqdm import tqdm
 import streamlit as st
@@ -37,6 +64,23 @@ except ImportError:
 base_dir = os.getcwd()
 sys.path.append(base_dir)
 
+CAP_PLACEHOLDER_RE = re.compile(r"<PLACEHOLDER_CAP_\d+>")
+ENV_PLACEHOLDER_RE = re.compile(r"<PLACEHOLDER_ENV_\d+>")
+# Map kind targeted by each ``part`` of a validator error report.
+ERROR_PART_KINDS = {"sec": "sections", "cap": "captions", "env": "envs"}
+ERROR_FIELDS = ("command_error", "ph_error", "bracket_error", "artifact_error")
+
+# Validates one translated record; returns an error report or ``None``.
+PartValidator = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def error_message_from_report(error_report: Dict[str, Any]) -> str:
+    """Join the validator messages of *error_report* for a correction prompt."""
+
+    return "\n".join(
+        error_report[field] for field in ERROR_FIELDS if field in error_report
+    )
+
 
 class TranslatorAgent(BaseToolAgent):
     """Coordinates translation of LaTeX sources by delegating to LLM APIs."""
@@ -84,25 +128,93 @@ class TranslatorAgent(BaseToolAgent):
 
         # Detect if using Ollama
         self.use_ollama = self._is_ollama_endpoint()
-        self.ollama_client = None
         self.ollama_host = None
         if self.use_ollama and not OLLAMA_AVAILABLE:
             raise ImportError(
                 "Ollama package not installed. Please install with: pip install ollama"
             )
 
-        # Initialize Ollama client if needed
+        # Pooled Ollama clients are looked up per request (see src.llm.client)
         if self.use_ollama:
-            assert ollama is not None  # for type checkers
             self.ollama_host = (
                 self.base_url.replace("/v1/chat/completions", "")
                 if self.base_url
                 else "http://localhost:11434"
             )
-            self.ollama_client = ollama.AsyncClient(host=self.ollama_host)
+
+        # AIMD limiter bounding in-flight LLM requests for this backend
+        self.limiter = AdaptiveConcurrencyLimiter.from_config(
+            config.get("concurrency"), log=self.log
+        )
+        # Endpoints (each with its own rate limiter) shared by all agents
+        self.balancer = get_balancer(config["llm_config"], log=self.log)
+        if not OLLAMA_AVAILABLE and any(e.use_ollama for e in self.balancer.endpoints):
+            raise ImportError(
+                "Ollama package not installed. Please install with: pip install ollama"
+            )
+        # Duplicate requests that are slower than the observed tail latency
+        self.hedger = Hedger.from_config(config.get("hedging"), log=self.log)
+        # Classified retries with jittered exponential backoff
+        self.retry_policy = RetryPolicy.from_config(config.get("retry"))
+        self.retry_log = RetryLog()
+        # Expected completion size relative to the text being translated
+        self.completion_token_ratio = float(
+            config["llm_config"].get("completion_token_ratio", 1.2)
+        )
+        # Streamed responses time out on silence instead of total duration
+        self.stream = bool(config["llm_config"].get("stream", False))
+        self.first_token_timeout = float(
+            config["llm_config"].get("first_token_timeout", 60.0)
+        )
+        self.idle_timeout = float(config["llm_config"].get("idle_timeout", 30.0))
+        # Sections above this many tokens are translated as concurrent pieces
+        self.max_section_tokens = int(
+            config["llm_config"].get("max_section_tokens", 3000)
+        )
 
         self.project_dir = project_dir  # Project path for parsing
         self.output_dir = output_dir  # Output directory for parsed files
+        # Finished segments are journalled; the maps are saved per stage
+        self.journal = TranslationJournal(Path(output_dir, JOURNAL_FILE))
+        # Segments that already carry a translation (resumed, or reused from
+        # an earlier paper version) are not sent again
+        self.keep_translations = bool(
+            config.get("resume", False) or config.get("previous_output_dir")
+        )
+        # Key -> position lookups per map, see _index_of
+        self._indexes: Dict[
+            str, Tuple[List[Dict[str, Any]], int, Dict[str, int]]
+        ] = {}
+        # Set by the coordinator to validate each segment as soon as it is
+        # translated and send failures straight back with the errors attached
+        self.part_validator: Optional[PartValidator] = None
+        # Set whenever a validator runs; finds the failing pieces of a split
+        # section so that only those are sent back for correction
+        self.piece_validator: Optional[PartValidator] = None
+        # Section number -> [source piece, separator, translation] of the
+        # sections _translate_in_pieces had to split
+        self._section_pieces: Dict[str, List[List[str]]] = {}
+        self.validator_max_retries = int(config.get("validator_max_retries", 2))
+        self.stream_errors: Dict[str, Dict[str, Any]] = {}
+        self.stream_validated = 0
+        self.stream_retranslated = 0
+
+        # Small captions/environments translated at the same time share a request
+        packing_config = config.get("packing", {})
+        self.packer = None
+        if packing_config.get("enabled", False):
+            self.packer = RequestPacker.from_config(self._send_packed, packing_config)
+        self.pack_item_max_tokens = int(packing_config.get("item_max_tokens", 200))
+        self.pack_json_mode = bool(packing_config.get("json_mode", False))
+
+        # Content-addressed translation cache shared across runs and papers
+        self.cache = translation_cache_from_config(config.get("cache"), output_dir)
+        # Set by the coordinator when a validator runs: translations are then
+        # only cached once their record validates, see _settle_cache
+        self.cache_after_validation = False
+        # Record key -> [cache key, source text, translation] awaiting validation
+        self._unvalidated: Dict[str, List[List[str]]] = {}
+
         self.fail_section_nums = []
         self.fail_caption_phs = []
         self.fail_env_phs = []
@@ -111,6 +223,15 @@ class TranslatorAgent(BaseToolAgent):
         self.trans_mode = trans_mode if trans_mode is not None else 0
         # self.term_dict = config.get("term_dict", {})  # Dictionary for terminology translation
         self.term_dict = {}
+        # Aho-Corasick index over term_dict keys, rebuilt when the glossary grows
+        self.glossary_index: Optional[GlossaryIndex] = None
+        self._glossary_indexed_size = 0
+        self._full_glossary_tokens = 0
+        self.glossary_tokens_full = 0
+        self.glossary_tokens_sent = 0
+        # Prompt tokens reported by the backend and how many hit its prefix cache
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
         self.summary = ""
         self.prev_text = ""
         self.prev_transed_text = ""
@@ -123,12 +244,12 @@ class TranslatorAgent(BaseToolAgent):
         return "localhost:11434" in self.base_url or "ollama" in self.base_url.lower()
 
     def _build_chat_payload(
-        self, system_prompt: str, user_content: str
+        self, system_prompt: str, user_content: str, model: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create the OpenAI-compatible payload shared by sync and async calls."""
 
         return {
-            "model": self.model,
+            "model": model or self.model,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_content},
@@ -137,11 +258,11 @@ class TranslatorAgent(BaseToolAgent):
             "max_new_tokens": 8192,
         }
 
-    def _get_auth_headers(self) -> Dict[str, str]:
+    def _get_auth_headers(self, api_key: Optional[str] = None) -> Dict[str, str]:
         """Build authorization headers for OpenAI-compatible APIs."""
 
         return {
-            "Authorization": f"Bearer {self.API_KEY}",
+            "Authorization": f"Bearer {api_key or self.API_KEY}",
             "Content-Type": "application/json",
         }
 
@@ -150,9 +271,18 @@ class TranslatorAgent(BaseToolAgent):
         system_prompt: str,
         user_content: str,
         session: Optional[aiohttp.ClientSession] = None,
+        json_mode: bool = False,
+        served_by: Optional[List[str]] = None,
     ) -> str:
         """Call the configured LLM asynchronously, honoring pooled sessions.
 
+        The request first takes a slot of :attr:`limiter`, so the number of
+        requests in flight adapts to how the backends cope with the load.
+        :attr:`balancer` then picks the endpoint, whose rate limiter reserves
+        the estimated prompt and completion tokens. When hedging is enabled, a request
+        slower than the configured latency percentile is raced against a
+        duplicate sent to another endpoint when there is one.
+
         Parameters
         ----------
         system_prompt:
@@ -161,7 +291,11 @@ class TranslatorAgent(BaseToolAgent):
             Primary message describing the translation task.
         session:
             Optional externally-managed :class:`aiohttp.ClientSession`. When not
-            provided, a short-lived session is created for the single request.
+            provided, the pooled session of the running event loop is used.
+        json_mode:
+            Ask the backend to answer with a JSON object.
+        served_by:
+            When given, the model of the endpoint that answered is appended.
 
         Returns
         -------
@@ -169,42 +303,147 @@ class TranslatorAgent(BaseToolAgent):
             Raw assistant message produced by the backend.
         """
 
-        if self.use_ollama:
+        estimated_tokens = self._estimate_request_tokens(system_prompt, user_content)
+
+        async def send(endpoint: Endpoint) -> str:
+            with self.balancer.track(endpoint):
+                content = await self._send_llm_request(
+                    system_prompt,
+                    user_content,
+                    endpoint,
+                    session,
+                    estimated_tokens,
+                    json_mode,
+                )
+            if served_by is not None:
+                served_by.append(endpoint.model or self.model)
+            return content
+
+        # Pick the endpoint only once the request may run, so that queued
+        # requests neither count as outstanding nor miss a circuit opening
+        async with self.limiter.slot() as slot:
+            endpoint = self.balancer.acquire()
+            try:
+                await endpoint.rate_limiter.acquire(estimated_tokens)
+                slot.restart()
+
+                async def send_hedge() -> str:
+                    # The duplicate shares the slot but pays for its own quota.
+                    alternate = self.balancer.acquire(exclude=endpoint)
+                    try:
+                        await alternate.rate_limiter.acquire(estimated_tokens)
+                        return await send(alternate)
+                    finally:
+                        self.balancer.release(alternate)
+
+                if self.hedger is None:
+                    return await send(endpoint)
+                return await self.hedger.run(lambda: send(endpoint), send_hedge)
+            finally:
+                self.balancer.release(endpoint)
+
+    def _estimate_request_tokens(self, system_prompt: str, user_content: str) -> int:
+        """Estimate prompt plus completion tokens for quota budgeting."""
+
+        user_tokens = count_tokens(user_content)
+        return (
+            count_tokens(system_prompt)
+            + user_tokens
+            + int(user_tokens * self.completion_token_ratio)
+        )
+
+    async def _send_llm_request(
+        self,
+        system_prompt: str,
+        user_content: str,
+        endpoint: Endpoint,
+        session: Optional[aiohttp.ClientSession] = None,
+        estimated_tokens: int = 0,
+        json_mode: bool = False,
+    ) -> str:
+        """Issue a single chat completion to *endpoint* without admission control."""
+
+        rate_limiter = endpoint.rate_limiter
+        if endpoint.use_ollama:
             # Use Ollama client
-            if self.ollama_client is None:
-                raise aiohttp.ClientError("Ollama client not initialized.")
+            if endpoint.ollama_host is None:
+                raise aiohttp.ClientError("Ollama host not configured.")
             try:
-                response = await self.ollama_client.chat(
-                    model=self.model,
+                ollama_client = get_async_ollama_client(endpoint.ollama_host)
+                response = await ollama_client.chat(
+                    model=endpoint.model or self.model,
                     messages=[
                         {"role": "system", "content": system_prompt},
                         {"role": "user", "content": user_content},
                     ],
                     options={"temperature": 0.7, "num_ctx": 8192},
+                    format="json" if json_mode else None,
+                    stream=self.stream,
                 )
-                return response["message"]["content"].strip()
+                if self.stream:
+                    content, response = await collect_stream(
+                        response,
+                        ollama_delta_text,
+                        self.first_token_timeout,
+                        self.idle_timeout,
+                    )
+                else:
+                    content = response["message"]["content"]
             except Exception as e:
-                raise aiohttp.ClientError(f"Ollama request failed: {e}")
-
-        payload = self._build_chat_payload(system_prompt, user_content)
-        headers = self._get_auth_headers()
+                raise aiohttp.ClientError(f"Ollama request failed: {e}") from e
+            response = response or {}
+            used_tokens = (response.get("prompt_eval_count") or 0) + (
+                response.get("eval_count") or 0
+            )
+            rate_limiter.reconcile(estimated_tokens, used_tokens or None)
+            return content.strip()
+
+        payload = self._build_chat_payload(system_prompt, user_content, endpoint.model)
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        headers = self._get_auth_headers(endpoint.api_key)
+        if self.stream:
+            payload["stream"] = True
+            # Without this, streamed responses carry no token usage at all
+            payload["stream_options"] = {"include_usage": True}
+            # No total bound: the body is guarded by the first-token and idle
+            # timeouts in collect_stream. sock_read also bounds the wait for
+            # the response headers, which collect_stream never sees.
+            timeout = aiohttp.ClientTimeout(
+                total=None, sock_connect=30, sock_read=self.first_token_timeout
+            )
+        else:
+            timeout = aiohttp.ClientTimeout(total=100)
 
         async def _post(session_obj: aiohttp.ClientSession) -> str:
             async with session_obj.post(
-                self.base_url,
+                endpoint.base_url,
                 json=payload,
                 headers=headers,
-                timeout=aiohttp.ClientTimeout(total=100),
+                timeout=timeout,
             ) as response:
+                # Retry-After / x-ratelimit-* pause the next request instead of
+                # letting it run into another 429.
+                rate_limiter.update_from_headers(response.headers)
                 response.raise_for_status()
+                if self.stream:
+                    content, usage_chunk = await collect_stream(
+                        iter_sse_events(response.content),
+                        openai_delta_text,
+                        self.first_token_timeout,
+                        self.idle_timeout,
+                    )
+                    usage = (usage_chunk or {}).get("usage") or {}
+                    rate_limiter.reconcile(estimated_tokens, usage.get("total_tokens"))
+                    self._record_usage(usage)
+                    return content.strip()
                 result = await response.json()
+                usage = result.get("usage") or {}
+                rate_limiter.reconcile(estimated_tokens, usage.get("total_tokens"))
+                self._record_usage(usage)
                 return result["choices"][0]["message"]["content"].strip()
 
-        if session is not None:
-            return await _post(session)
-
-        async with aiohttp.ClientSession() as temp_session:
-            return await _post(temp_session)
+        return await _post(session or get_aiohttp_session())
 
     def _make_llm_request_sync(self, system_prompt: str, user_content: str) -> str:
         """Perform a blocking LLM request using either Ollama or OpenAI APIs."""
@@ -213,7 +452,7 @@ class TranslatorAgent(BaseToolAgent):
             if not self.ollama_host or ollama is None:
                 raise RuntimeError("Ollama host not configured.")
             try:
-                sync_client = ollama.Client(host=self.ollama_host)
+                sync_client = get_ollama_client(self.ollama_host)
                 response = sync_client.chat(
                     model=self.model,
                     messages=[
@@ -229,7 +468,7 @@ class TranslatorAgent(BaseToolAgent):
         payload = self._build_chat_payload(system_prompt, user_content)
         headers = self._get_auth_headers()
 
-        response = requests.post(
+        response = get_requests_session().post(
             self.base_url,
             json=payload,
             headers=headers,
@@ -239,6 +478,277 @@ class TranslatorAgent(BaseToolAgent):
         result = response.json()
         return result["choices"][0]["message"]["content"].strip()
 
+    def _cache_models(self) -> List[str]:
+        """Models the endpoints serve, in endpoint order without duplicates."""
+
+        return list(
+            dict.fromkeys(
+                endpoint.model or self.model for endpoint in self.balancer.endpoints
+            )
+        )
+
+    def _cache_key(
+        self,
+        system_prompt: str,
+        text: str,
+        glossary: Optional[Dict[str, str]] = None,
+        model: Optional[str] = None,
+    ) -> Optional[str]:
+        """Return the cache key of a translation by *model*, if caching is on."""
+
+        if self.cache is None:
+            return None
+        return make_cache_key(model or self.model, system_prompt, text, glossary)
+
+    def _cached_translation(
+        self,
+        system_prompt: str,
+        text: str,
+        glossary: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Return ``(cache key, translation)`` from any model an endpoint serves.
+
+        Translations are cached under the model that produced them, so with
+        endpoints serving different models one of them is as good as another
+        but none from a model that is no longer configured is served.
+        """
+
+        if self.cache is None:
+            return None, None
+        for model in self._cache_models():
+            cache_key = self._cache_key(system_prompt, text, glossary, model)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cache_key, cached
+        return None, None
+
+    def _served_model(self, served_by: List[str]) -> Optional[str]:
+        """The model that answered, or the only one configured if unknown."""
+
+        if served_by:
+            return served_by[0]
+        models = self._cache_models()
+        return models[0] if len(models) == 1 else None
+
+    def _store_translation(
+        self,
+        fail_part: str,
+        system_prompt: str,
+        text: str,
+        translated: str,
+        glossary: Optional[Dict[str, str]] = None,
+        model: Optional[str] = None,
+        cache_key: Optional[str] = None,
+    ) -> None:
+        """Cache *translated* by *model* now, or once record *fail_part* validates.
+
+        Nothing is cached when the model that produced it is unknown.
+        """
+
+        if self.cache is None or (model is None and cache_key is None):
+            return
+        cache_key = cache_key or self._cache_key(system_prompt, text, glossary, model)
+        if self.cache_after_validation:
+            self._unvalidated.setdefault(fail_part, []).append(
+                [
+                    cache_key,
+                    text,
+                    translated,
+                    lambda model: self._cache_key(system_prompt, text, glossary, model),
+                ]
+            )
+        else:
+            self.cache.put(cache_key, translated)
+
+    def _revise_translation(
+        self, fail_part: str, text: str, translated: str, model: Optional[str]
+    ) -> None:
+        """Replace the pending translation of *text* by its correction by *model*."""
+
+        for entry in list(self._unvalidated.get(fail_part, ())):
+            if entry[1] != text:
+                continue
+            cache_key = entry[3](model) if model is not None else None
+            if cache_key != entry[0]:
+                # The replaced translation may have been a cache hit
+                self.cache.delete(entry[0])
+            if cache_key is None:
+                self._unvalidated[fail_part].remove(entry)
+                continue
+            entry[0] = cache_key
+            entry[2] = translated
+
+    def _settle_cache(self, key: str, valid: bool) -> None:
+        """Cache the pending translations of record *key*, or drop them if invalid."""
+
+        for cache_key, _, translated, _ in self._unvalidated.pop(key, ()):
+            if valid:
+                self.cache.put(cache_key, translated)
+            else:
+                self.cache.delete(cache_key)
+
+    def settle_cache(self, errors_report: List[Dict[str, Any]]) -> None:
+        """Settle all pending translations; records in *errors_report* are dropped."""
+
+        failed = {error_report["num_or_ph"] for error_report in errors_report}
+        for key in list(self._unvalidated):
+            self._settle_cache(key, key not in failed)
+
+    def _log_cache_stats(self) -> None:
+        """Report translation cache effectiveness for this run."""
+
+        if self.cache is None:
+            return
+        stats = self.cache.stats()
+        self.log(
+            f"🗃️ Translation cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%}), {stats['entries']} entries, "
+            f"{stats['bytes'] / 1024 / 1024:.1f} MB, {stats['evictions']} evicted."
+        )
+
+    def _record_usage(self, usage: Dict[str, Any]) -> None:
+        """Accumulate prompt and prefix-cached token counts from ``usage``."""
+
+        cached = cached_prompt_tokens(usage)
+        if cached is None:
+            return
+        self.prompt_tokens += int(usage.get("prompt_tokens") or 0)
+        self.cached_prompt_tokens += cached
+
+    def _log_prompt_cache_stats(self) -> None:
+        """Report how much of the prompt traffic hit the backend's prefix cache."""
+
+        if not self.prompt_tokens:
+            return
+        self.log(
+            f"🧊 Prompt cache: {self.cached_prompt_tokens} of {self.prompt_tokens} "
+            f"prompt tokens served from the backend cache "
+            f"({self.cached_prompt_tokens / self.prompt_tokens:.0%})."
+        )
+
+    def _relevant_terms(self, text: str) -> Dict[str, str]:
+        """Return only the glossary entries whose term occurs in *text*."""
+
+        if (
+            self.glossary_index is None
+            or self._glossary_indexed_size != len(self.term_dict)
+        ):
+            self.glossary_index = GlossaryIndex(self.term_dict)
+            self._glossary_indexed_size = len(self.term_dict)
+            self._full_glossary_tokens = count_tokens(str(self.term_dict))
+        return self.glossary_index.prune(self.term_dict, text)
+
+    def _record_glossary_tokens(self, terms: Dict[str, str]) -> None:
+        """Track prompt tokens saved by sending a pruned glossary."""
+
+        self.glossary_tokens_full += self._full_glossary_tokens
+        self.glossary_tokens_sent += count_tokens(str(terms))
+
+    def _log_glossary_savings(self) -> None:
+        """Report how many glossary prompt tokens pruning avoided."""
+
+        if not self.glossary_tokens_full:
+            return
+        saved = self.glossary_tokens_full - self.glossary_tokens_sent
+        self.log(
+            f"📉 Glossary pruning: sent {self.glossary_tokens_sent} of "
+            f"{self.glossary_tokens_full} glossary tokens, saved {saved} "
+            f"({saved / self.glossary_tokens_full:.0%})."
+        )
+
+    async def _send_packed(
+        self, system_prompt: str, texts: List[str]
+    ) -> List[Optional[str]]:
+        """Translate several small segments with one packed request.
+
+        Segments missing from a malformed answer come back as ``None`` so
+        the caller translates them individually.
+        """
+
+        packed_prompt, user_content = build_packed_request(
+            system_prompt, texts, json_mode=self.pack_json_mode
+        )
+        try:
+            raw = await self._make_llm_request(
+                packed_prompt, user_content, json_mode=self.pack_json_mode
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.log(
+                f"⚠️ Packed request for {len(texts)} segments failed, translating them one by one: {e}",
+                level="warning",
+            )
+            return [None] * len(texts)
+
+        segments = parse_packed_response(raw, len(texts), json_mode=self.pack_json_mode)
+        if len(segments) < len(texts):
+            self.log(
+                f"⚠️ Packed answer covered {len(segments)}/{len(texts)} segments, translating the rest one by one.",
+                level="warning",
+            )
+        return [
+            self._clean_translated_text(segments[i]) if i in segments else None
+            for i in range(1, len(texts) + 1)
+        ]
+
+    def _log_hedging_stats(self) -> None:
+        """Report how often hedged requests were sent and won."""
+
+        if self.hedger is None or not self.hedger.requests:
+            return
+        p = self.hedger.latencies.percentile(self.hedger.percentile)
+        latency = f", p{self.hedger.percentile * 100:.0f} latency {p:.1f}s" if p else ""
+        self.log(
+            f"🪂 Hedging: {self.hedger.hedged}/{self.hedger.requests} requests hedged, "
+            f"{self.hedger.hedge_wins} won by the hedge{latency}."
+        )
+
+    def _retry_recorder(self, segment: Any) -> OnRetry:
+        """Return an ``on_retry`` callback that records retries of *segment*."""
+
+        def on_retry(attempt: int, reason: str, delay: float, exc: BaseException):
+            self.retry_log.record(str(segment), reason)
+            self.log(
+                f"🔁 Attempt {attempt} for {segment} failed ({reason}), retrying in {delay:.1f}s."
+            )
+
+        return on_retry
+
+    def _record_failure(self, fail_part: Any, type: str, exc: BaseException) -> None:
+        """Queue *fail_part* for the retranslation pass after retries ran out."""
+
+        self.have_fail_parts = True
+        if type == "sec":
+            self.fail_section_nums.append(fail_part)
+        elif type == "cap":
+            self.fail_caption_phs.append(fail_part)
+        else:
+            self.fail_env_phs.append(fail_part)
+        self.retry_log.fail(str(fail_part), exc)
+
+    def _log_retry_stats(self) -> None:
+        """Report retries per reason and the segments that still failed."""
+
+        if not self.retry_log.retries and not self.retry_log.failures:
+            return
+        self.log(f"🔁 Retries: {self.retry_log.summary()}.")
+        for segment, reason in self.retry_log.failures.items():
+            retries = self.retry_log.segments.get(segment, [])
+            self.log(
+                f"❌ {segment}: gave up on {reason} after {len(retries)} retries "
+                f"({', '.join(retries) or 'not retryable'}).",
+                level="warning",
+            )
+
+    def _log_packing_stats(self) -> None:
+        """Report how many segments were translated in packed requests."""
+
+        if self.packer is None or not self.packer.requests:
+            return
+        self.log(
+            f"📦 Packing: {self.packer.items} segments translated in "
+            f"{self.packer.requests} packed requests, {self.packer.fallbacks} fell back to single requests."
+        )
+
     def _clean_translated_text(self, text: str) -> str:
         """Remove reasoning artifacts and leading chatter before LaTeX commands."""
 
@@ -285,115 +795,115 @@ class TranslatorAgent(BaseToolAgent):
             process_bar.progress(5)
             sys.stderr = sys.__stderr__
 
-            async with aiohttp.ClientSession() as session:
-                sem = asyncio.Semaphore(
-                    10
-                )  # Considering the api response speed, processing one section approximately takes about 10 seconds, and initiating a call every half second,
-                # around 10 should not waste api tokens
-
-                async def process_section(i, sec):
-                    async with sem:
-                        translated = await self.translate(sec, envs, captions, session)
-                        return i, translated
-
-                tasks = [process_section(i, sec) for i, sec in enumerate(sections)]
-
-                completed = 0
-
-                for future in tqdm(
-                    asyncio.as_completed(tasks),
-                    total=len(tasks),
-                    desc="Translating...",
-                    unit="section",
-                ):
-                    i, translated_section = await future
-                    sections[i] = translated_section
-
-                    completed += 1
-
-                    sys.stderr = open(os.devnull, "w")
-                    process = int(5 + 90 * completed / len(tasks))
-                    process_bar.progress(process)
-                    sys.stderr = sys.__stderr__
-
-                    # It can be considered to save and modify to integrate memory once for hard memory read and write,
-                    # and save each section once for the convenience of observing the translation situation.
-                    self.save_file(
-                        Path(self.output_dir, "sections_map.json"), "json", sections
-                    )
-                    self.save_file(
-                        Path(self.output_dir, "captions_map.json"), "json", captions
-                    )
-                    self.save_file(Path(self.output_dir, "envs_map.json"), "json", envs)
+            session = get_aiohttp_session()
+            # Map and journal writes are fsync'd; keep them off the shared loop
+            await asyncio.to_thread(self.journal.reset)
+            # In-flight requests are bounded by self.limiter inside
+            # _make_llm_request, so every section can be scheduled at once.
+            async def process_section(i, sec):
+                translated = await self.translate(sec, envs, captions, session)
+                return i, translated
+
+            tasks = [process_section(i, sec) for i, sec in enumerate(sections)]
+
+            completed = 0
+
+            for future in tqdm(
+                asyncio.as_completed(tasks),
+                total=len(tasks),
+                desc="Translating...",
+                unit="section",
+            ):
+                i, translated_section = await future
+                sections[i] = translated_section
+
+                completed += 1
 
                 sys.stderr = open(os.devnull, "w")
-                status_text.text("🔍 Validating translation results ..")
-                process_bar.progress(95)
+                process = int(5 + 90 * completed / len(tasks))
+                process_bar.progress(process)
                 sys.stderr = sys.__stderr__
 
-                await self._val_fail_parts(
-                    Maxtry=Maxtry,
-                    sections=sections,
-                    captions=captions,
-                    envs=envs,
-                    session=session,
+                await asyncio.to_thread(
+                    self.journal.append, "sections", translated_section
                 )
 
-                self.log("✅ Successfully translated sections!")
+            await asyncio.to_thread(self._save_maps, sections, captions, envs)
 
-                sys.stderr = open(os.devnull, "w")
-                status_text.text("✅ Successfully translated sections!")
-                process_bar.progress(100)
-                st.success("✅ Successfully translated sections!")
-                process_b.empty()
-                status_text.empty()
-                sys.stderr = sys.__stderr__
+            sys.stderr = open(os.devnull, "w")
+            status_text.text("🔍 Validating translation results ..")
+            process_bar.progress(95)
+            sys.stderr = sys.__stderr__
+
+            await self._val_fail_parts(
+                Maxtry=Maxtry,
+                sections=sections,
+                captions=captions,
+                envs=envs,
+                session=session,
+            )
+
+            self.log(
+                f"✅ Successfully translated sections! Final concurrency limit: {self.limiter.limit}."
+            )
+            self._log_cache_stats()
+            self._log_glossary_savings()
+            self._log_prompt_cache_stats()
+            self._log_packing_stats()
+            self._log_hedging_stats()
+            self._log_retry_stats()
+            self._log_stream_validation_stats()
+
+            sys.stderr = open(os.devnull, "w")
+            status_text.text("✅ Successfully translated sections!")
+            process_bar.progress(100)
+            st.success("✅ Successfully translated sections!")
+            process_b.empty()
+            status_text.empty()
+            sys.stderr = sys.__stderr__
 
         elif self.trans_mode == 1:
             sys.stderr = open(os.devnull, "w")
             status_text = st.empty()
             sys.stderr = sys.__stderr__
-            async with aiohttp.ClientSession() as session:
-                error_parts = [
-                    error_part["num_or_ph"] for error_part in self.errors_report
-                ]
-                self.log(
-                    f"🤖💬 Starting retranslating for error parts:{error_parts}, the {error_retry_count + 1} chance for {Maxtry} total."
-                )
-                sys.stderr = open(os.devnull, "w")
-                status_text.text(
-                    f"🤖💬 Starting retranslating for error parts:{error_parts}, the {error_retry_count + 1} chance for {Maxtry} total."
-                )
-                sys.stderr = sys.__stderr__
-                await self._retranslate_error_parts(
-                    secs=sections, caps=captions, envs=envs, session=session
-                )
+            session = get_aiohttp_session()
+            error_parts = [
+                error_part["num_or_ph"] for error_part in self.errors_report
+            ]
+            self.log(
+                f"🤖💬 Starting retranslating for error parts:{error_parts}, the {error_retry_count + 1} chance for {Maxtry} total."
+            )
+            sys.stderr = open(os.devnull, "w")
+            status_text.text(
+                f"🤖💬 Starting retranslating for error parts:{error_parts}, the {error_retry_count + 1} chance for {Maxtry} total."
+            )
+            sys.stderr = sys.__stderr__
+            await self._retranslate_error_parts(
+                secs=sections, caps=captions, envs=envs, session=session
+            )
 
-                self.save_file(
-                    Path(self.output_dir, "sections_map.json"), "json", sections
-                )
-                self.save_file(
-                    Path(self.output_dir, "captions_map.json"), "json", captions
-                )
-                self.save_file(Path(self.output_dir, "envs_map.json"), "json", envs)
-
-                self.fail_section_nums.clear()
-                self.fail_caption_phs.clear()
-                self.fail_env_phs.clear()
-                self.have_fail_parts = False
-
-                await self._val_fail_parts(
-                    Maxtry=Maxtry,
-                    sections=sections,
-                    captions=captions,
-                    envs=envs,
-                    session=session,
-                )
+            await asyncio.to_thread(self._save_maps, sections, captions, envs)
+
+            self.fail_section_nums.clear()
+            self.fail_caption_phs.clear()
+            self.fail_env_phs.clear()
+            self.have_fail_parts = False
+
+            await self._val_fail_parts(
+                Maxtry=Maxtry,
+                sections=sections,
+                captions=captions,
+                envs=envs,
+                session=session,
+            )
 
             self.log("✅ Successfully retranslated error parts!")
+            self._log_glossary_savings()
+            self._log_prompt_cache_stats()
+            self._log_retry_stats()
             sys.stderr = open(os.devnull, "w")
             status_text.text("✅ Successfully retranslated error parts!")
-            time.sleep(3)
+            await asyncio.sleep(3)
             status_text.empty()
             sys.stderr = sys.__stderr__
 
@@ -422,37 +932,208 @@ class TranslatorAgent(BaseToolAgent):
         dict
             The updated section record with translated content merged in.
         """
-        placeholder_pattern_cap = r"<PLACEHOLDER_CAP_\d+>"
-        placeholder_pattern_env = r"<PLACEHOLDER_ENV_\d+>"
-        placeholders_cap = re.findall(placeholder_pattern_cap, section["content"])
-        placeholders_env = re.findall(placeholder_pattern_env, section["content"])
+        placeholders_cap = CAP_PLACEHOLDER_RE.findall(section["content"])
+        placeholders_env = ENV_PLACEHOLDER_RE.findall(section["content"])
 
         if section["section"] == "-1" or section["section"] == "0":
             section = section
-        else:
-            section = await self._translate_section(section, session)
+        elif not self._keeps_translation(section):
+            section = await self._translate_checked(
+                section, self._translate_section, session
+            )
 
+        # Environments and captions are translated concurrently so that small
+        # ones can be packed together when packing is enabled.
+        env_index = self._index_of("envs", envs)
+        env_indices = []
         for placeholder in placeholders_env:
-            for i, env in enumerate(envs):
-                if placeholder == env["placeholder"]:
-                    placeholders_cap_in_env = re.findall(
-                        placeholder_pattern_cap, env["content"]
-                    )
-                    placeholders_cap.extend(placeholders_cap_in_env)
-                    envs[i] = await self._translate_env(env, session)
-                    break
+            i = env_index.get(placeholder)
+            if i is not None:
+                placeholders_cap.extend(CAP_PLACEHOLDER_RE.findall(envs[i]["content"]))
+                env_indices.append(i)
+        env_indices = [i for i in env_indices if not self._keeps_translation(envs[i])]
+        env_results = await asyncio.gather(
+            *(
+                self._translate_checked(envs[i], self._translate_env, session)
+                for i in env_indices
+            )
+        )
+        for i, transed_env in zip(env_indices, env_results):
+            envs[i] = transed_env
+            await asyncio.to_thread(self.journal.append, "envs", transed_env)
 
         # remove duplicates
         placeholders_cap = list(dict.fromkeys(placeholders_cap))
 
-        for placeholder in placeholders_cap:
-            for i, caption in enumerate(captions):
-                if placeholder == caption["placeholder"]:
-                    captions[i] = await self._translate_caption(caption, session)
-                    break
+        cap_index = self._index_of("captions", captions)
+        cap_indices = [
+            cap_index[placeholder]
+            for placeholder in placeholders_cap
+            if placeholder in cap_index
+        ]
+        cap_indices = [i for i in cap_indices if not self._keeps_translation(captions[i])]
+        cap_results = await asyncio.gather(
+            *(
+                self._translate_checked(captions[i], self._translate_caption, session)
+                for i in cap_indices
+            )
+        )
+        for i, transed_caption in zip(cap_indices, cap_results):
+            captions[i] = transed_caption
+            await asyncio.to_thread(self.journal.append, "captions", transed_caption)
 
         return section
 
+    async def _translate_checked(
+        self,
+        record: Dict[str, Any],
+        translate: Callable[..., Awaitable[Dict[str, Any]]],
+        session: aiohttp.ClientSession,
+    ) -> Dict[str, Any]:
+        """Translate *record* and validate the result right away.
+
+        Without a :attr:`part_validator` this is just ``translate``. Otherwise
+        a translation that fails validation is sent back at once with the
+        validator's errors, up to ``validator_max_retries`` times, so the
+        segment never waits for the rest of the paper. Errors left after the
+        last attempt are kept in :attr:`stream_errors`. The translations of
+        the record are cached only once it validates, corrections included.
+        """
+
+        key = record.get("section") or record["placeholder"]
+        # Pending translations of an earlier attempt are superseded
+        self._unvalidated.pop(key, None)
+        translated = await translate(record, session)
+        if self.part_validator is None:
+            return translated
+
+        self.stream_validated += 1
+        attempt = 0
+        while True:
+            error_report = self.part_validator(translated)
+            if error_report is None:
+                self.stream_errors.pop(key, None)
+                self._settle_cache(key, valid=True)
+                return translated
+            if attempt >= self.validator_max_retries:
+                self.stream_errors[key] = error_report
+                self._settle_cache(key, valid=False)
+                return translated
+            attempt += 1
+            self.stream_retranslated += 1
+            translated = await self._retranslate_with_errors(
+                translated, error_report, session
+            )
+
+    async def _retranslate_with_errors(
+        self,
+        record: Dict[str, Any],
+        error_report: Dict[str, Any],
+        session: aiohttp.ClientSession,
+    ) -> Dict[str, Any]:
+        """Ask for a corrected translation of *record* given the validator errors."""
+
+        retranslated = record.copy()
+        if error_report["part"] == "sec":
+            retranslated["trans_content"] = await self._retranslate_in_pieces(
+                retranslated,
+                error_message=error_message_from_report(error_report),
+                fail_part=error_report["num_or_ph"],
+                session=session,
+            )
+            return retranslated
+        retranslated["trans_content"] = await self._request_llm_for_retrans_error_parts(
+            pm.retrans_error_parts_system_prompt,
+            part=retranslated,
+            error_message=error_message_from_report(error_report),
+            fail_part=error_report["num_or_ph"],
+            type=error_report["part"],
+            session=session,
+        )
+        return retranslated
+
+    def _log_stream_validation_stats(self) -> None:
+        """Report how many segments were validated and corrected in the stream."""
+
+        if self.part_validator is None or not self.stream_validated:
+            return
+        self.log(
+            f"🔍 Validated {self.stream_validated} segments as they were translated: "
+            f"{self.stream_retranslated} corrections sent, "
+            f"{len(self.stream_errors)} segments still reported."
+        )
+
+    def _index_of(self, kind: str, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Map the key of every record of map *kind* to its position.
+
+        Records are only ever replaced in place, so the index is built once
+        per list and reused by translation, retries and error passes; it is
+        rebuilt when the list is another one or its length changed. The
+        first record wins on duplicate keys, as with a linear scan.
+        """
+
+        cached = self._indexes.get(kind)
+        if cached is not None and cached[0] is records and cached[1] == len(records):
+            return cached[2]
+        field = KEY_FIELDS[kind]
+        index: Dict[str, int] = {}
+        for i, record in enumerate(records):
+            index.setdefault(record[field], i)
+        self._indexes[kind] = (records, len(records), index)
+        return index
+
+    def _keeps_translation(self, record: Dict[str, Any]) -> bool:
+        """Whether *record* already has a translation that must be kept."""
+
+        return self.keep_translations and bool(record.get("trans_content"))
+
+    def prepare_resume(
+        self, is_valid: Callable[[Dict[str, Any]], bool]
+    ) -> Tuple[int, int]:
+        """Recover the translations of an interrupted run before :meth:`execute`.
+
+        The journal is folded into the saved maps. Translations that are
+        missing, fell back to the source text or fail *is_valid* are cleared
+        so that only those segments are translated again.
+
+        Returns
+        -------
+        tuple of int
+            Segments kept and segments considered.
+        """
+
+        maps = {
+            kind: self.read_file(Path(self.output_dir, f"{kind}_map.json"), "json")
+            for kind in ("sections", "captions", "envs")
+        }
+        self.journal.apply(maps)
+        kept = total = 0
+        for kind, records in maps.items():
+            for record in records:
+                if kind == "sections" and record["section"] in ("-1", "0"):
+                    continue
+                total += 1
+                translation = record.get("trans_content")
+                if translation and translation != record["content"] and is_valid(record):
+                    kept += 1
+                else:
+                    record["trans_content"] = ""
+        self._save_maps(maps["sections"], maps["captions"], maps["envs"])
+        return kept, total
+
+    def _save_maps(
+        self,
+        sections: List[Dict[str, Any]],
+        captions: List[Dict[str, Any]],
+        envs: List[Dict[str, Any]],
+    ) -> None:
+        """Write the three maps atomically and drop the now redundant journal."""
+
+        self.save_file(Path(self.output_dir, "sections_map.json"), "json", sections)
+        self.save_file(Path(self.output_dir, "captions_map.json"), "json", captions)
+        self.save_file(Path(self.output_dir, "envs_map.json"), "json", envs)
+        self.journal.reset()
+
     async def _val_fail_parts(
         self,
         sections,
@@ -487,7 +1168,7 @@ class TranslatorAgent(BaseToolAgent):
                 sys.stderr = open(os.devnull, "w")
                 status_text.error(f"❌ Failed to translate {fail_parts}")
                 st.error(f"❌ Failed to translate {fail_parts}")
-                time.sleep(3)
+                await asyncio.sleep(3)
                 sys.stderr = sys.__stderr__
                 break
             self.log(
@@ -501,13 +1182,11 @@ class TranslatorAgent(BaseToolAgent):
             await self._retranslate_fail_parts(
                 secs=sections, caps=captions, envs=envs, session=session
             )
-            self.save_file(Path(self.output_dir, "sections_map.json"), "json", sections)
-            self.save_file(Path(self.output_dir, "captions_map.json"), "json", captions)
-            self.save_file(Path(self.output_dir, "envs_map.json"), "json", envs)
+            await asyncio.to_thread(self._save_maps, sections, captions, envs)
 
             fail_retry_count += 1
             sys.stderr = open(os.devnull, "w")
-            time.sleep(3)
+            await asyncio.sleep(3)
             status_text = st.empty()
             sys.stderr = sys.__stderr__
 
@@ -532,17 +1211,18 @@ class TranslatorAgent(BaseToolAgent):
         Any
             Legacy return value preserved for backward compatibility.
         """
-        sec_nums = self.fail_section_nums[:]
-        cap_phs = self.fail_caption_phs[:]
-        env_phs = self.fail_env_phs[:]
+        # A split section may have been recorded once per failed piece
+        sec_nums = list(dict.fromkeys(self.fail_section_nums))
+        cap_phs = list(dict.fromkeys(self.fail_caption_phs))
+        env_phs = list(dict.fromkeys(self.fail_env_phs))
         self.fail_section_nums.clear()
         self.fail_caption_phs.clear()
         self.fail_env_phs.clear()
         self.have_fail_parts = False
 
-        sec_dict = {s["section"]: i for i, s in enumerate(secs)}
-        cap_dict = {c["placeholder"]: i for i, c in enumerate(caps)}
-        env_dict = {e["placeholder"]: i for i, e in enumerate(envs)}
+        sec_dict = self._index_of("sections", secs)
+        cap_dict = self._index_of("captions", caps)
+        env_dict = self._index_of("envs", envs)
 
         if sec_nums:
             self.log(f"Retranslating for {sec_nums}")
@@ -551,7 +1231,9 @@ class TranslatorAgent(BaseToolAgent):
                     continue
                 if sec_num in sec_dict:
                     i = sec_dict[sec_num]
-                    secs[i] = await self._translate_section(secs[i], session)
+                    secs[i] = await self._translate_checked(
+                        secs[i], self._translate_section, session
+                    )
             # else:
             #     print(f"[Warning] Section {sec_num} not found.")
         if cap_phs:
@@ -559,7 +1241,9 @@ class TranslatorAgent(BaseToolAgent):
             for cap_ph in cap_phs:
                 if cap_ph in cap_dict:
                     i = cap_dict[cap_ph]
-                    caps[i] = await self._translate_caption(caps[i], session)
+                    caps[i] = await self._translate_checked(
+                        caps[i], self._translate_caption, session
+                    )
             # else:
             #     print(f"[Warning] Caption placeholder {cap_ph} not found.")
         if env_phs:
@@ -567,7 +1251,9 @@ class TranslatorAgent(BaseToolAgent):
             for env_ph in env_phs:
                 if env_ph in env_dict:
                     i = env_dict[env_ph]
-                    envs[i] = await self._translate_env(envs[i], session)
+                    envs[i] = await self._translate_checked(
+                        envs[i], self._translate_env, session
+                    )
             # else:
             #     print(f"[Warning] Environment placeholder {env_ph} not found.")
 
@@ -586,153 +1272,77 @@ class TranslatorAgent(BaseToolAgent):
         Any
             Mirrors previous behaviour; kept for compatibility with callers.
         """
-        async with aiohttp.ClientSession() as session:
-            sem = asyncio.Semaphore(20)
+        sys.stderr = open(os.devnull, "w")
+        process_b = st.empty()
+        with process_b:
+            process_bar = process_b.progress(0)
+        status_text = st.empty()
+        sys.stderr = sys.__stderr__
+        completed = 0
 
-            sys.stderr = open(os.devnull, "w")
-            process_b = st.empty()
-            with process_b:
-                process_bar = process_b.progress(0)
-            status_text = st.empty()
-            sys.stderr = sys.__stderr__
-            completed = 0
+        maps = {"sections": secs, "captions": caps, "envs": envs}
 
-            async def process_ErrorPart(i, error_report):
-                async with sem:
-                    error_message = []
-                    if "command_error" in error_report:
-                        error_message.append(error_report["command_error"])
-                    if "ph_error" in error_report:
-                        error_message.append(error_report["ph_error"])
-                    if "bracket_error" in error_report:
-                        error_message.append(error_report["bracket_error"])
-                    error_message = "\n".join(error_message)
-
-                    if error_report["part"] == "sec":
-
-                        async def process_section(i, sec):
-                            async with sem:
-                                if error_report["num_or_ph"] == sec["section"]:
-                                    sec_async = await self._translate_section(
-                                        section=sec,
-                                        error_message=error_message,
-                                        session=session,
-                                    )
-                                    return {
-                                        "index": i,
-                                        "result": sec_async,
-                                        "is_valid": True,
-                                    }
-                                else:
-                                    return {
-                                        "index": None,
-                                        "result": None,
-                                        "is_valid": False,
-                                    }
-
-                        tasks_sec = [
-                            process_section(i, sec) for i, sec in enumerate(secs)
-                        ]
-                        for future in asyncio.as_completed(tasks_sec):
-                            result = await future
-
-                            if result["is_valid"]:
-                                i = result["index"]
-                                _sec = result["result"]
-                                secs[i] = _sec
-                    elif error_report["part"] == "env":
-
-                        async def process_env(i, env):
-                            async with sem:
-                                if error_report["num_or_ph"] == env["placeholder"]:
-                                    env_async = await self._translate_env(
-                                        env=env,
-                                        error_message=error_message,
-                                        session=session,
-                                    )
-                                    return {
-                                        "index": i,
-                                        "result": env_async,
-                                        "is_valid": True,
-                                    }
-                                else:
-                                    return {
-                                        "index": None,
-                                        "result": None,
-                                        "is_valid": False,
-                                    }
-
-                        tasks_env = [process_env(i, env) for i, env in enumerate(envs)]
-                        for future in asyncio.as_completed(tasks_env):
-                            result = await future
-
-                            if result["is_valid"]:
-                                i = result["index"]
-                                _env = result["result"]
-                                envs[i] = _env
-                    elif error_report["part"] == "cap":
-
-                        async def process_cap(i, cap):
-                            async with sem:
-                                if error_report["num_or_ph"] == cap["placeholder"]:
-                                    cap_async = await self._translate_caption(
-                                        caption=cap,
-                                        error_message=error_message,
-                                        session=session,
-                                    )
-                                    return {
-                                        "index": i,
-                                        "result": cap_async,
-                                        "is_valid": True,
-                                    }
-                                else:
-                                    return {
-                                        "index": None,
-                                        "result": None,
-                                        "is_valid": False,
-                                    }
-
-                        tasks_cap = [process_cap(i, cap) for i, cap in enumerate(caps)]
-                        for future in asyncio.as_completed(tasks_cap):
-                            result = await future
-
-                            if result["is_valid"]:
-                                i = result["index"]
-                                _cap = result["result"]
-                                caps[i] = _cap
-                    return i
-
-            tasks_ErrorPart = [
-                process_ErrorPart(i, error_report)
-                for i, error_report in enumerate(self.errors_report)
-            ]
-            for future in tqdm(
-                asyncio.as_completed(tasks_ErrorPart),
-                total=len(tasks_ErrorPart),
-                desc="Translating...",
-                unit="section",
-            ):
-                result = await future
-                completed += 1
-                sys.stderr = open(os.devnull, "w")
-                process_bar.progress(completed / len(tasks_ErrorPart))
-                status_text.text(
-                    f"Completed {completed}/{len(tasks_ErrorPart)} part（{completed / len(tasks_ErrorPart):.1%}）"
-                )
-                sys.stderr = sys.__stderr__
+        async def process_ErrorPart(error_report):
+            error_message = error_message_from_report(error_report)
 
-                if result is not None:
-                    # Result indicates which error part finished, kept for potential debugging
-                    pass
+            kind = ERROR_PART_KINDS.get(error_report["part"])
+            if kind is None:
+                return None
+            records = maps[kind]
+            i = self._index_of(kind, records).get(error_report["num_or_ph"])
+            if i is None:
+                return None
 
+            if kind == "sections":
+                records[i] = await self._translate_section(
+                    section=records[i],
+                    error_message=error_message,
+                    session=session,
+                )
+            elif kind == "envs":
+                records[i] = await self._translate_env(
+                    env=records[i],
+                    error_message=error_message,
+                    session=session,
+                )
+            else:
+                records[i] = await self._translate_caption(
+                    caption=records[i],
+                    error_message=error_message,
+                    session=session,
+                )
+            return i
+
+        tasks_ErrorPart = [
+            process_ErrorPart(error_report) for error_report in self.errors_report
+        ]
+        for future in tqdm(
+            asyncio.as_completed(tasks_ErrorPart),
+            total=len(tasks_ErrorPart),
+            desc="Translating...",
+            unit="section",
+        ):
+            result = await future
+            completed += 1
             sys.stderr = open(os.devnull, "w")
-            process_bar.progress(100)
-            status_text.text("Complete a retranslation once")
-            time.sleep(3)
-            process_b.empty()
-            status_text.empty()
+            process_bar.progress(completed / len(tasks_ErrorPart))
+            status_text.text(
+                f"Completed {completed}/{len(tasks_ErrorPart)} part（{completed / len(tasks_ErrorPart):.1%}）"
+            )
             sys.stderr = sys.__stderr__
 
+            if result is not None:
+                # Result indicates which error part finished, kept for potential debugging
+                pass
+
+        sys.stderr = open(os.devnull, "w")
+        process_bar.progress(100)
+        status_text.text("Complete a retranslation once")
+        await asyncio.sleep(3)
+        process_b.empty()
+        status_text.empty()
+        sys.stderr = sys.__stderr__
+
     async def _translate_section(
         self,
         section: Dict[str, Any],
@@ -758,22 +1368,18 @@ class TranslatorAgent(BaseToolAgent):
         transed_section = section.copy()
         section_num = section["section"]
         if self.trans_mode == 0:
-            transed_section["trans_content"] = await self._request_llm_for_trans(
+            transed_section["trans_content"] = await self._translate_in_pieces(
+                self._request_llm_for_trans,
                 pm.section_system_prompt,
                 section["content"],
                 fail_part=section_num,
-                type="sec",
                 session=session,
             )
         elif self.trans_mode == 1:
-            transed_section[
-                "trans_content"
-            ] = await self._request_llm_for_retrans_error_parts(
-                pm.retrans_error_parts_system_prompt,
-                part=transed_section,
+            transed_section["trans_content"] = await self._retranslate_in_pieces(
+                transed_section,
                 error_message=error_message,
                 fail_part=section_num,
-                type="sec",
                 session=session,
             )
 
@@ -782,21 +1388,19 @@ class TranslatorAgent(BaseToolAgent):
             Combined with terminology translation
             """
             if not self.term_dict:
-                transed_section["trans_content"] = await self._request_llm_for_trans(
+                transed_section["trans_content"] = await self._translate_in_pieces(
+                    self._request_llm_for_trans,
                     pm.section_system_prompt,
                     section["content"],
                     fail_part=section_num,
-                    type="sec",
                     session=session,
                 )
             else:
-                transed_section[
-                    "trans_content"
-                ] = await self._request_llm_for_trans_with_terms(
+                transed_section["trans_content"] = await self._translate_in_pieces(
+                    self._request_llm_for_trans_with_terms,
                     pm.section_system_prompt_with_dict,
                     section["content"],
                     fail_part=section_num,
-                    type="sec",
                     session=session,
                 )
 
@@ -823,6 +1427,137 @@ class TranslatorAgent(BaseToolAgent):
 
         return transed_section
 
+    async def _translate_in_pieces(
+        self,
+        request,
+        system_prompt: str,
+        text: str,
+        fail_part: str,
+        session: aiohttp.ClientSession,
+    ) -> str:
+        """Translate a section, splitting it when it exceeds the token budget.
+
+        Oversized sections are cut at paragraph or placeholder boundaries by
+        :func:`split_for_token_budget`; the pieces are translated concurrently
+        and joined in their original order with the original separators.
+
+        Parameters
+        ----------
+        request:
+            Either :meth:`_request_llm_for_trans` or
+            :meth:`_request_llm_for_trans_with_terms`.
+        system_prompt:
+            Prompt passed through to *request*.
+        text:
+            Section content to translate.
+        fail_part:
+            Section number recorded if any piece fails.
+        session:
+            Session issuing the asynchronous HTTP calls.
+
+        Returns
+        -------
+        str
+            The translated section content.
+        """
+        pieces = split_for_token_budget(text, self.max_section_tokens)
+        if len(pieces) == 1:
+            self._section_pieces.pop(fail_part, None)
+            return await request(
+                system_prompt, text, fail_part=fail_part, type="sec", session=session
+            )
+
+        self.log(
+            f"✂️ Section {fail_part} exceeds {self.max_section_tokens} tokens, translating it as {len(pieces)} pieces."
+        )
+
+        async def translate_piece(piece: str) -> str:
+            if not piece.strip():
+                return piece
+            return await request(
+                system_prompt, piece, fail_part=fail_part, type="sec", session=session
+            )
+
+        translated = await asyncio.gather(
+            *(translate_piece(piece) for piece, _ in pieces)
+        )
+        self._section_pieces[fail_part] = [
+            [piece, separator, trans]
+            for trans, (piece, separator) in zip(translated, pieces)
+        ]
+        return "".join(
+            trans + separator for trans, (_, separator) in zip(translated, pieces)
+        )
+
+    async def _retranslate_in_pieces(
+        self,
+        section: Dict[str, Any],
+        error_message: str,
+        fail_part: str,
+        session: aiohttp.ClientSession,
+    ) -> str:
+        """Correct a section that failed validation, piece by piece if it was split.
+
+        A section within the token budget is sent back whole with
+        *error_message*. For a split section only the pieces that fail
+        :attr:`piece_validator` (all of them without one) are corrected, each
+        with its own translation, and the section is joined again. If the
+        pieces kept by :meth:`_translate_in_pieces` no longer match the
+        section, it is translated afresh in pieces instead.
+        """
+        pieces = split_for_token_budget(section["content"], self.max_section_tokens)
+        if len(pieces) == 1:
+            return await self._request_llm_for_retrans_error_parts(
+                pm.retrans_error_parts_system_prompt,
+                part=section,
+                error_message=error_message,
+                fail_part=fail_part,
+                type="sec",
+                session=session,
+            )
+
+        known = self._section_pieces.get(fail_part)
+        if (
+            known is None
+            or [piece for piece, _, _ in known] != [piece for piece, _ in pieces]
+            or sanitize_translated_text(
+                "".join(trans + separator for _, separator, trans in known)
+            )
+            != sanitize_translated_text(section["trans_content"])
+        ):
+            self.log(
+                f"✂️ No matching pieces for section {fail_part}, translating it again in pieces."
+            )
+            return await self._translate_in_pieces(
+                self._request_llm_for_trans,
+                pm.section_system_prompt,
+                section["content"],
+                fail_part=fail_part,
+                session=session,
+            )
+
+        async def correct_piece(entry: List[str]) -> None:
+            piece, _, trans = entry
+            if not piece.strip():
+                return
+            part = {"section": fail_part, "content": piece, "trans_content": trans}
+            if (
+                self.piece_validator is not None
+                and self.piece_validator(dict(part)) is None
+            ):
+                return
+            entry[2] = await self._request_llm_for_retrans_error_parts(
+                pm.retrans_error_parts_system_prompt,
+                part=part,
+                error_message=error_message,
+                fail_part=fail_part,
+                type="sec",
+                session=session,
+            )
+
+        await asyncio.gather(*(correct_piece(entry) for entry in known))
+        return "".join(trans + separator for _, separator, trans in known)
+
     async def _translate_caption(
         self,
         caption: Dict[str, Any],
@@ -1032,28 +1767,50 @@ class TranslatorAgent(BaseToolAgent):
         str
             Translated content or the original text upon repeated failures.
         """
-        for attempt in range(1, 4):
-            try:
-                raw = await self._make_llm_request(system_prompt, text, session)
-                return self._clean_translated_text(raw)
-            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                if attempt < 3:
-                    await asyncio.sleep(5)
-                else:
-                    self.have_fail_parts = True
-                    if type == "sec":
-                        self.fail_section_nums.append(fail_part)
-                    elif type == "cap":
-                        self.fail_caption_phs.append(fail_part)
-                    else:
-                        self.fail_env_phs.append(fail_part)
-
-                    print(
-                        f"❌ Failed to translate text, return the original text:{fail_part}. {e}"
-                    )
-                    return text
+        cache_key, cached = self._cached_translation(system_prompt, text)
+        if cached is not None:
+            if self.cache_after_validation:
+                self._store_translation(
+                    fail_part, system_prompt, text, cached, cache_key=cache_key
+                )
+            return cached
+
+        if (
+            self.packer is not None
+            and type in ("cap", "env")
+            and count_tokens(text) <= self.pack_item_max_tokens
+        ):
+            packed = await self.packer.submit(system_prompt, text)
+            if packed is not None:
+                # Which endpoint answered a packed request is not tracked
+                self._store_translation(
+                    fail_part, system_prompt, text, packed, model=self._served_model([])
+                )
+                return packed
 
-        return "N/A"
+        served_by: List[str] = []
+        try:
+            raw = await self.retry_policy.run(
+                lambda: self._make_llm_request(
+                    system_prompt, text, session, served_by=served_by
+                ),
+                on_retry=self._retry_recorder(fail_part),
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._record_failure(fail_part, type, e)
+            print(
+                f"❌ Failed to translate text, return the original text:{fail_part}. {e}"
+            )
+            return text
+        translated = self._clean_translated_text(raw)
+        self._store_translation(
+            fail_part,
+            system_prompt,
+            text,
+            translated,
+            model=self._served_model(served_by),
+        )
+        return translated
 
     async def _request_llm_for_trans_with_terms(
         self,
@@ -1083,33 +1840,45 @@ class TranslatorAgent(BaseToolAgent):
         str
             Translated content or original snippet if retries exhaust.
         """
-        enhanced_prompt = f"{system_prompt}\nWhen translating, you must strictly use the following glossary for substitution. This is the highest priority rule to ensure the consistency of terms throughout the text.\n<Glossary>:\n{self.term_dict}\nNow, please translate the following new paragraph. Maintain the terminology from the glossary provided. If there was no text to begin with (e.g., an empty caption), return an empty string."
-        user_content = f"[Current LaTeX Paragraph]:\n{text}"
+        terms = self._relevant_terms(text)
+        # Static system prefix, variable glossary and segment in the user turn
+        enhanced_prompt, user_content = build_glossary_request(
+            system_prompt, terms, text
+        )
 
-        for attempt in range(1, 4):
-            try:
-                raw = await self._make_llm_request(
-                    enhanced_prompt, user_content, session
+        cache_key, cached = self._cached_translation(system_prompt, text, terms)
+        if cached is not None:
+            if self.cache_after_validation:
+                self._store_translation(
+                    fail_part, system_prompt, text, cached, terms, cache_key=cache_key
                 )
-                return self._clean_translated_text(raw)
-            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                if attempt < 3:
-                    await asyncio.sleep(5)
-                else:
-                    self.have_fail_parts = True
-                    if type == "sec":
-                        self.fail_section_nums.append(fail_part)
-                    elif type == "cap":
-                        self.fail_caption_phs.append(fail_part)
-                    else:
-                        self.fail_env_phs.append(fail_part)
-
-                    print(
-                        f"❌ Failed to translate text, return the original text:{fail_part}. {e}"
-                    )
-                    return text
+            return cached
+        self._record_glossary_tokens(terms)
 
-        return "N/A"
+        served_by: List[str] = []
+        try:
+            raw = await self.retry_policy.run(
+                lambda: self._make_llm_request(
+                    enhanced_prompt, user_content, session, served_by=served_by
+                ),
+                on_retry=self._retry_recorder(fail_part),
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._record_failure(fail_part, type, e)
+            print(
+                f"❌ Failed to translate text, return the original text:{fail_part}. {e}"
+            )
+            return text
+        translated = self._clean_translated_text(raw)
+        self._store_translation(
+            fail_part,
+            system_prompt,
+            text,
+            translated,
+            terms,
+            model=self._served_model(served_by),
+        )
+        return translated
 
     async def _request_llm_for_retrans_error_parts(
         self,
@@ -1142,37 +1911,41 @@ class TranslatorAgent(BaseToolAgent):
         str
             Improved translation or the existing translation on repeated failure.
         """
-        enhanced_prompt = f"{system_prompt}\nWhen translating, you must strictly use the following glossary for substitution. This is the highest priority rule to ensure the consistency of terms throughout the text.\n<Glossary>:\n{self.term_dict}\nNow, please translate the following new paragraph. Maintain the terminology from the glossary provided."
-        user_content = f"[Original]:\n{part['content']}\n[Translation]:\n{part['trans_content']}\n[Error]:\n{error_message}"
-
-        for attempt in range(1, 4):
-            try:
-                raw = await self._make_llm_request(
-                    enhanced_prompt, user_content, session
-                )
-                return self._clean_translated_text(raw)
-            except (
-                requests.exceptions.RequestException,
-                aiohttp.ClientError,
-                asyncio.TimeoutError,
-            ) as e:
-                if attempt < 3:
-                    await asyncio.sleep(5)
-                else:
-                    self.have_fail_parts = True
-                    if type == "sec":
-                        self.fail_section_nums.append(fail_part)
-                    elif type == "cap":
-                        self.fail_caption_phs.append(fail_part)
-                    else:
-                        self.fail_env_phs.append(fail_part)
-
-                    print(
-                        f"❌ Failed to translate text, return the original text:{fail_part}. {e}"
-                    )
-                    return part["trans_content"]
+        terms = self._relevant_terms(part["content"])
+        self._record_glossary_tokens(terms)
+        enhanced_prompt, user_content = build_retranslation_request(
+            system_prompt,
+            terms,
+            part["content"],
+            part["trans_content"],
+            error_message,
+        )
 
-        return "N/A"
+        retry_on = (
+            requests.exceptions.RequestException,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        )
+        served_by: List[str] = []
+        try:
+            raw = await self.retry_policy.run(
+                lambda: self._make_llm_request(
+                    enhanced_prompt, user_content, session, served_by=served_by
+                ),
+                on_retry=self._retry_recorder(fail_part),
+                retry_on=retry_on,
+            )
+        except retry_on as e:
+            self._record_failure(fail_part, type, e)
+            print(
+                f"❌ Failed to translate text, return the original text:{fail_part}. {e}"
+            )
+            return part["trans_content"]
+        translated = self._clean_translated_text(raw)
+        self._revise_translation(
+            fail_part, part["content"], translated, self._served_model(served_by)
+        )
+        return translated
 
     async def _request_llm_for_extract_terms(
         self, system_prompt, src, tgt, session: aiohttp.ClientSession
@@ -1197,20 +1970,17 @@ class TranslatorAgent(BaseToolAgent):
         """
         user_content = f"<en source>\n{src}\n<zh translation>\n{tgt}"
 
-        for attempt in range(1, 4):
-            try:
-                return await self._make_llm_request(
-                    system_prompt, user_content, session
-                )
-            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
-                if attempt < 3:
-                    self.log(f"⚠️ Term extraction attempt failed: {exc}")
-                    await asyncio.sleep(5)
-                else:
-                    print("⚠️ Failed to extract terms, set N/A.")
-                    return "N/A"
+        def on_retry(attempt: int, reason: str, delay: float, exc: BaseException):
+            self.log(f"⚠️ Term extraction attempt failed: {exc}")
 
-        return "N/A"
+        try:
+            return await self.retry_policy.run(
+                lambda: self._make_llm_request(system_prompt, user_content, session),
+                on_retry=on_retry,
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            print("⚠️ Failed to extract terms, set N/A.")
+            return "N/A"
 
     def _request_llm_for_summary(self, system_prompt: str, text: str) -> str:
         """Generate a fresh summary for the accumulated translated content.
@@ -1229,18 +1999,16 @@ class TranslatorAgent(BaseToolAgent):
         """
         user_content = f"<Text to summarize>:\n{text}\n<Summary>:\n"
 
-        for attempt in range(1, 4):
-            try:
-                return self._make_llm_request_sync(system_prompt, user_content)
-            except (requests.exceptions.RequestException, RuntimeError) as e:
-                if attempt < 3:
-                    print(f"{e}")
-                    time.sleep(3)
-                else:
-                    print("⚠️ Failed to summarize text, set N/A.")
-                    return "N/A"
-
-        return "N/A"
+        retry_on = (requests.exceptions.RequestException, RuntimeError)
+        try:
+            return self.retry_policy.run_sync(
+                lambda: self._make_llm_request_sync(system_prompt, user_content),
+                on_retry=lambda attempt, reason, delay, e: print(f"{e}"),
+                retry_on=retry_on,
+            )
+        except retry_on:
+            print("⚠️ Failed to summarize text, set N/A.")
+            return "N/A"
 
     def _request_llm_for_refine_summary(
         self, system_prompt: str, text: str, sum: str
@@ -1265,18 +2033,16 @@ class TranslatorAgent(BaseToolAgent):
             f"<prev_summary>:\n{sum}\n<new_section>:\n{text}\n<refined_summary>:\n"
         )
 
-        for attempt in range(1, 4):
-            try:
-                return self._make_llm_request_sync(system_prompt, user_content)
-            except (requests.exceptions.RequestException, RuntimeError) as e:
-                if attempt < 3:
-                    print(f"{e}")
-                    time.sleep(3)
-                else:
-                    print("⚠️ Failed to refine summary, set N/A.")
-                    return "N/A"
-
-        return "N/A"
+        retry_on = (requests.exceptions.RequestException, RuntimeError)
+        try:
+            return self.retry_policy.run_sync(
+                lambda: self._make_llm_request_sync(system_prompt, user_content),
+                on_retry=lambda attempt, reason, delay, e: print(f"{e}"),
+                retry_on=retry_on,
+            )
+        except retry_on:
+            print("⚠️ Failed to refine summary, set N/A.")
+            return "N/A"
 
     def _updated_term_dict(self, text: str) -> None:
         """Parse bilingual pairs from the LLM output and update glossary.
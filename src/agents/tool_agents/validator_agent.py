@@ -59,7 +59,7 @@ class ValidatorAgent(BaseToolAgent):
             )
         errors_report = []
         for part in parts_need_val:
-            error_report = self._validate(part)
+            error_report = self.validate_part(part)
             if error_report:
                 errors_report.append(error_report)
 
@@ -67,6 +67,11 @@ class ValidatorAgent(BaseToolAgent):
             self.save_file(Path(self.output_dir, "sections_map.json"), "json", sections)
             self.save_file(Path(self.output_dir, "captions_map.json"), "json", captions)
             self.save_file(Path(self.output_dir, "envs_map.json"), "json", envs)
+        self.report_errors(errors_report)
+        return errors_report
+
+    def report_errors(self, errors_report: List[Dict]) -> None:
+        """Save *errors_report* and log how many errors remain."""
         if errors_report:
             self.save_file(
                 Path(self.output_dir, "errors_report.json"), "json", errors_report
@@ -75,10 +80,9 @@ class ValidatorAgent(BaseToolAgent):
         self.log(
             f"✅ Verification Complete for {os.path.basename(self.project_dir)}, remaining Errors: {len(errors_report)}."
         )
-        return errors_report
 
-    def _validate(self, part: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Dispatch validation steps for a single document fragment."""
+    def validate_part(self, part: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Validate a single document fragment; ``None`` when it has no errors."""
         self._sanitize_part_translation(part)
         command_error = self._validate_command(part)
         ph_error = self._validate_placeholder(part)
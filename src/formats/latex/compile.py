@@ -6,14 +6,17 @@ from .utils import *
 
 
 class LaTexCompiler:
-    def __init__(self, output_latex_dir: str):
+    def __init__(self, output_latex_dir: str, main_tex_file: str = None):
         self.output_latex_dir = output_latex_dir
+        self.main_tex_file = main_tex_file  # Found from the output if not given
 
     def compile(self):
         """
         Compile the LaTeX document .
         """
-        tex_file_to_compile = find_main_tex_file(self.output_latex_dir)
+        tex_file_to_compile = self.main_tex_file or find_main_tex_file(
+            self.output_latex_dir
+        )
         if not tex_file_to_compile:
             print("⚠️ Warning: There is no main tex file to compile in this directory.")
             return None
@@ -69,7 +72,9 @@ class LaTexCompiler:
         """
         Compile the LaTeX document .
         """
-        tex_file_to_compile = find_main_tex_file(self.output_latex_dir)
+        tex_file_to_compile = self.main_tex_file or find_main_tex_file(
+            self.output_latex_dir
+        )
         if not tex_file_to_compile:
             print("⚠️ Warning: There is no main tex file to compile in this directory.")
             return None
@@ -103,7 +108,9 @@ class LaTexCompiler:
             pdf_dir = self.output_latex_dir
         os.makedirs(pdf_dir, exist_ok=True)  # Ensure directory exists
 
-        tex_file_to_compile = find_main_tex_file(self.output_latex_dir)
+        tex_file_to_compile = self.main_tex_file or find_main_tex_file(
+            self.output_latex_dir
+        )
         if not tex_file_to_compile:
             print("⚠️ Warning: No main .tex file found in directory.")
             return None
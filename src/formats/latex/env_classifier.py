@@ -0,0 +1,153 @@
+"""Rule-based pre-classification of LaTeX environments.
+
+``ParserAgent`` asks an LLM whether each remaining environment contains text
+worth translating. Many environments are obvious either way (pure math,
+graphics, code, or plain prose), so they are decided locally and only the
+ambiguous ones are escalated to the LLM judge.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Optional
+
+from pylatexenc.latex2text import LatexNodes2Text
+
+# Environment names whose content is never prose. Complements
+# ``no_translate_envs`` in ``LatexParser._extract_envs``.
+MATH_ENVS = {
+    "math",
+    "displaymath",
+    "eqnarray",
+    "eqnarray*",
+    "array",
+    "matrix",
+    "pmatrix",
+    "bmatrix",
+    "Bmatrix",
+    "vmatrix",
+    "Vmatrix",
+    "smallmatrix",
+    "aligned",
+    "alignedat",
+    "gathered",
+    "dcases",
+    "IEEEeqnarray",
+    "IEEEeqnarray*",
+    "dmath",
+    "dmath*",
+}
+CODE_ENVS = {
+    "Verbatim",
+    "BVerbatim",
+    "LVerbatim",
+    "alltt",
+    "comment",
+    "code",
+    "lstlisting",
+    "minted",
+    "pythoncode",
+    "pseudocode",
+}
+GRAPHICS_ENVS = {
+    "picture",
+    "pgfpicture",
+    "tikzcd",
+    "axis",
+    "semilogyaxis",
+    "semilogxaxis",
+    "loglogaxis",
+    "groupplot",
+    "forest",
+    "circuitikz",
+    "pspicture",
+}
+# Environments that hold running text whenever they contain words at all.
+PROSE_ENVS = {
+    "theorem",
+    "lemma",
+    "corollary",
+    "proposition",
+    "definition",
+    "assumption",
+    "remark",
+    "example",
+    "proof",
+    "claim",
+    "conjecture",
+    "observation",
+    "note",
+    "quote",
+    "quotation",
+    "itemize",
+    "enumerate",
+    "description",
+    "abstract",
+}
+
+_NON_PROSE_ENVS = MATH_ENVS | CODE_ENVS | GRAPHICS_ENVS
+
+# Rendered text needs this many words before the ratios below are trusted.
+MIN_PROSE_WORDS = 8
+# Share of letters among visible characters of the rendered text.
+MIN_LETTER_RATIO = 0.75
+# Share of the raw LaTeX that survives rendering (the rest is markup).
+MIN_TEXT_RATIO = 0.4
+
+_BEGIN_RE = re.compile(r"^\s*\\begin\{[^}]*\}(\[[^\]]*\])?")
+_END_RE = re.compile(r"\\end\{[^}]*\}\s*$")
+# Placeholders and pylatexenc stand-ins such as "<cit.>" or "< g r a p h i c s >"
+_ANGLE_TOKEN_RE = re.compile(r"<[^<>\n]*>")
+_WORD_RE = re.compile(r"[^\W\d_]{3,}")
+_LETTER_RE = re.compile(r"[^\W\d_]")
+
+_to_text = LatexNodes2Text(math_mode="remove")
+
+
+def _strip_env_wrapper(content: str) -> str:
+    return _END_RE.sub("", _BEGIN_RE.sub("", content, count=1), count=1)
+
+
+def classify_env(env_name: str, content: str) -> Optional[bool]:
+    """Decide locally whether an environment needs translation.
+
+    Returns ``True`` (translate), ``False`` (keep verbatim) or ``None`` when
+    the rules are not confident and the LLM judge should decide.
+    """
+
+    base_name = env_name.rstrip("*")
+    if env_name in _NON_PROSE_ENVS or base_name in _NON_PROSE_ENVS:
+        return False
+
+    inner = _strip_env_wrapper(content)
+    try:
+        text = _to_text.latex_to_text(inner)
+    except Exception:
+        return None
+    text = _ANGLE_TOKEN_RE.sub(" ", text)
+
+    words = _WORD_RE.findall(text)
+    if not words:
+        return False  # only math, markup, graphics or placeholders
+
+    if base_name in PROSE_ENVS and len(words) >= 3:
+        return True
+
+    visible = len(re.sub(r"\s+", "", text))
+    raw = len(re.sub(r"\s+", "", inner))
+    letters = len(_LETTER_RE.findall(text))
+    if (
+        len(words) >= MIN_PROSE_WORDS
+        and letters / visible >= MIN_LETTER_RATIO
+        and visible / raw >= MIN_TEXT_RATIO
+    ):
+        return True
+    return None
+
+
+def env_decision_key(model: str, env_name: str, content: str) -> str:
+    """Key under which an LLM ``need_trans`` verdict is cached."""
+
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return f"need_trans:{model}:{env_name}:{digest}"
@@ -0,0 +1,97 @@
+"""Multi-pattern glossary lookup used to prune terminology from prompts."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+def _fold(text: str) -> str:
+    """Lower-case *text* character by character, keeping every index stable."""
+
+    return "".join(
+        lowered if len(lowered) == 1 else char
+        for char, lowered in ((char, char.lower()) for char in text)
+    )
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class GlossaryIndex:
+    """Aho-Corasick automaton over glossary terms.
+
+    The automaton is built once per glossary; :meth:`find` then reports every
+    term occurring in a segment in a single pass over the text, independent
+    of the glossary size. Matching ignores case, and terms that start or end
+    with a word character only match on word boundaries (``"art"`` does not
+    match inside ``"start"``).
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        self.size = 0
+        for term in terms:
+            if isinstance(term, str) and term:
+                self._add(term)
+                self.size += 1
+        self._link()
+
+    def _add(self, term: str) -> None:
+        state = 0
+        for char in _fold(term):
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(term)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> List[str]:
+        """Return the glossary terms present in *text*, in order of appearance."""
+
+        found: Dict[str, None] = {}
+        state = 0
+        for end, char in enumerate(_fold(text)):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for term in self._out[state]:
+                if term in found:
+                    continue
+                start = end - len(term) + 1
+                if _is_word_char(term[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if (
+                    _is_word_char(term[-1])
+                    and end + 1 < len(text)
+                    and _is_word_char(text[end + 1])
+                ):
+                    continue
+                found[term] = None
+        return list(found)
+
+    def prune(self, glossary: Dict[str, str], text: str) -> Dict[str, str]:
+        """Restrict *glossary* to the entries whose term occurs in *text*."""
+
+        return {term: glossary[term] for term in self.find(text) if term in glossary}
@@ -0,0 +1,118 @@
+"""Carry translations forward from the output of an earlier paper version.
+
+Segments are matched on a hash of their content with whitespace collapsed
+and the numbers of environment, caption and newcommand placeholders removed,
+because inserting one figure in v2 renumbers every later placeholder. When a
+segment matches, its translation is reused with the old placeholders renamed
+to the new ones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Set
+
+from src.llm.tokens import count_tokens
+
+NUMBERED_PLACEHOLDER_RE = re.compile(r"<PLACEHOLDER_(ENV|CAP|NEWCOMMAND)_\d+>")
+MAP_KINDS = ("sections", "captions", "envs")
+
+
+def segment_key(content: str) -> str:
+    """Hash *content* ignoring whitespace layout and placeholder numbering."""
+
+    normalised = NUMBERED_PLACEHOLDER_RE.sub(r"<PLACEHOLDER_\1>", content)
+    normalised = " ".join(normalised.split())
+    return hashlib.sha256(normalised.encode("utf-8")).hexdigest()
+
+
+def remap_placeholders(
+    old_content: str, new_content: str, translation: str
+) -> Optional[str]:
+    """Rename the placeholders of *translation* from *old_content* to *new_content*.
+
+    Returns ``None`` if the placeholders do not correspond one to one.
+    """
+
+    old_names = [m.group(0) for m in NUMBERED_PLACEHOLDER_RE.finditer(old_content)]
+    new_names = [m.group(0) for m in NUMBERED_PLACEHOLDER_RE.finditer(new_content)]
+    if len(old_names) != len(new_names):
+        return None
+    mapping: Dict[str, str] = {}
+    for old_name, new_name in zip(old_names, new_names):
+        if mapping.setdefault(old_name, new_name) != new_name:
+            return None
+    if len(set(mapping.values())) != len(mapping):
+        return None
+    return NUMBERED_PLACEHOLDER_RE.sub(
+        lambda m: mapping.get(m.group(0), m.group(0)), translation
+    )
+
+
+def _translatable(kind: str, record: Dict[str, Any]) -> bool:
+    return not (kind == "sections" and record.get("section") in ("-1", "0"))
+
+
+class CarryOverReport:
+    """What was reused from the previous version."""
+
+    def __init__(self) -> None:
+        self.segments = 0
+        self.carried = 0
+        self.tokens_saved = 0
+        # Placeholders of current environments whose need_trans was reused
+        self.judged_envs: Set[str] = set()
+
+    def summary(self) -> str:
+        return (
+            f"reused {self.carried}/{self.segments} translated segments, "
+            f"~{self.tokens_saved:,} tokens saved"
+        )
+
+
+def carry_forward(
+    previous: Dict[str, List[Dict[str, Any]]],
+    current: Dict[str, List[Dict[str, Any]]],
+) -> CarryOverReport:
+    """Copy translations of unchanged segments from *previous* into *current*.
+
+    Both arguments map ``"sections"``, ``"captions"`` and ``"envs"`` to the
+    records of the corresponding map. *current* is updated in place: matched
+    segments get ``trans_content`` and matched environments also keep their
+    ``need_trans`` verdict. Tokens saved are estimated as source plus
+    translation tokens of every reused segment.
+    """
+
+    report = CarryOverReport()
+    for kind in MAP_KINDS:
+        index: Dict[str, Dict[str, Any]] = {}
+        for record in previous.get(kind, []):
+            if _translatable(kind, record):
+                index.setdefault(segment_key(record["content"]), record)
+
+        for record in current.get(kind, []):
+            if not _translatable(kind, record):
+                continue
+            report.segments += 1
+            old = index.get(segment_key(record["content"]))
+            if old is None:
+                continue
+            if kind == "envs" and "need_trans" in old:
+                record["need_trans"] = old["need_trans"]
+                report.judged_envs.add(record["placeholder"])
+
+            translation = old.get("trans_content")
+            if not translation or translation == old["content"]:
+                continue  # never translated, or fell back to the source
+            translation = remap_placeholders(
+                old["content"], record["content"], translation
+            )
+            if translation is None:
+                continue
+            record["trans_content"] = translation
+            report.carried += 1
+            report.tokens_saved += count_tokens(record["content"]) + count_tokens(
+                translation
+            )
+    return report
@@ -0,0 +1,99 @@
+"""Append-only journal of translated segments.
+
+Rewriting ``sections_map.json``, ``captions_map.json`` and ``envs_map.json``
+after every finished section writes O(N²) bytes per paper. Instead, each
+finished segment is appended to a JSONL journal as one line, and the maps
+are written once (atomically) at the end of the stage. Every line goes out
+in a single flushed ``write``, so a crash can at most leave a truncated last
+line; :meth:`TranslationJournal.replay` skips it and the next append cuts it
+off.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+# Field identifying a record in each map.
+KEY_FIELDS = {"sections": "section", "captions": "placeholder", "envs": "placeholder"}
+JOURNAL_FILE = "translation_journal.jsonl"
+
+
+class TranslationJournal:
+    """JSONL log of ``(kind, record)`` entries, where kind names a map."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._file: Optional[TextIO] = None
+        # Appends may come from several worker threads at once
+        self._lock = threading.Lock()
+
+    def _open(self) -> TextIO:
+        if self._file is None:
+            self._drop_torn_tail()
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _drop_torn_tail(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def append(self, kind: str, record: Dict[str, Any]) -> None:
+        """Journal the finished *record* of map *kind*."""
+
+        entry = {"kind": kind, "key": record[KEY_FIELDS[kind]], "record": record}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            f = self._open()
+            f.write(line)
+            f.flush()
+
+    def replay(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Yield ``(kind, key, record)`` for every complete journal line."""
+
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # torn write from a crash
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                yield entry["kind"], entry["key"], entry["record"]
+
+    def apply(self, maps: Dict[str, List[Dict[str, Any]]]) -> int:
+        """Overlay journalled records onto *maps* in place; later entries win.
+
+        Returns the number of entries applied. Entries whose key is not in
+        the map (e.g. from an older parse) are ignored.
+        """
+
+        positions = {
+            kind: {record[KEY_FIELDS[kind]]: i for i, record in enumerate(records)}
+            for kind, records in maps.items()
+        }
+        applied = 0
+        for kind, key, record in self.replay():
+            index = positions.get(kind, {}).get(key)
+            if index is None:
+                continue
+            maps[kind][index] = record
+            applied += 1
+        return applied
+
+    def reset(self) -> None:
+        """Discard the journal, e.g. once the maps have been saved."""
+
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.path.unlink(missing_ok=True)
@@ -0,0 +1,249 @@
+"""Single-pass LaTeX tokenizer used to extract placeholders in linear time.
+
+The parser used to loop ``pattern.search(tex)`` from position 0 and then
+``tex.replace(match, placeholder, 1)``, rescanning and copying the whole
+document once per match. :class:`LatexLexer` instead walks the document
+once, recording commands, ``\\begin``/``\\end`` markers, brace groups and
+comments with their offsets. The ``find_*`` helpers read the spans the old
+regexes would have replaced off the token stream, and :func:`replace_spans`
+rebuilds the text with placeholders in one more linear sweep.
+
+Environments are paired by a stack rather than a ``\\begin{(.*?)}...\\end{\\1}``
+regex, which backtracked on unclosed environments and paired nested ones of
+the same name with the inner ``\\end``.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+
+from .utils import options, spaces
+
+COMMENT = "comment"
+COMMAND = "command"
+BEGIN = "begin"
+END = "end"
+
+_TOKEN_RE = re.compile(
+    r"(?P<comment>%[^\n]*)"
+    r"|\\(?P<env>begin|end)[ \t]*\{(?P<env_name>[^{}]*)\}"
+    r"|\\(?P<command>[a-zA-Z]+|.)"
+    r"|(?P<open>\{)"
+    r"|(?P<close>\})",
+    re.DOTALL,
+)
+# Environments the parser never replaces by a placeholder.
+_KEPT_ENV_RE = re.compile(r"(?:document|center|proof|multicols)\b")
+_NEWCOMMANDS = r"newcommand\*?|def|renewcommand|newenvironment|renewenvironment"
+_NEWCOMMAND_HEAD_RE = re.compile(
+    rf"\\(?:{_NEWCOMMANDS}){spaces}"
+    rf"(?:\{{\\([a-zA-Z]+)\}}|\\([a-zA-Z]+)){spaces}(?:\[(\d)\])?{spaces}(?=\{{)"
+)
+
+
+@lru_cache(maxsize=None)
+def _command_head(command_name: str) -> "re.Pattern[str]":
+    """``\\name[options]`` up to the opening brace of the argument."""
+
+    return re.compile(rf"\\({command_name}){spaces}({options})?{spaces}(?=\{{)")
+
+
+@lru_cache(maxsize=None)
+def _command_names(command_name: str) -> "re.Pattern[str]":
+    """Matches the letters of a command name that *command_name* may start with."""
+
+    return re.compile(rf"(?:{command_name})")
+
+
+class Token(NamedTuple):
+    kind: str
+    start: int
+    end: int
+    name: str = ""
+
+
+class Span(NamedTuple):
+    """``tex[start:end]`` is replaced by one placeholder."""
+
+    start: int
+    end: int
+    name: str
+    arguments: int = 0
+
+
+class EnvNode:
+    """An environment from ``\\begin`` to its ``\\end``, with nested ones."""
+
+    __slots__ = ("name", "start", "body_start", "body_end", "end", "children")
+
+    def __init__(self, name: str, start: int, body_start: int):
+        self.name = name
+        self.start = start
+        self.body_start = body_start  # just past \begin{name}
+        self.body_end = -1  # at \end{name}
+        self.end = -1
+        self.children: List[EnvNode] = []
+
+    @property
+    def closed(self) -> bool:
+        return self.end >= 0
+
+
+class LatexLexer:
+    """Tokens of one LaTeX document, produced in a single left-to-right pass.
+
+    Escaped characters (``\\{``, ``\\%``) are control-symbol commands, so they
+    neither open groups nor start comments. Brace groups are recorded as
+    spans (see :meth:`group_end`); text between tokens is not materialised.
+    """
+
+    def __init__(self, tex: str):
+        self.tex = tex
+        # Commands, \begin/\end markers and comments; groups are kept apart
+        self.tokens: List[Token] = []
+        # Offset of each balanced "{" -> offset just past its "}"
+        self._group_ends: Dict[int, int] = {}
+        append = self.tokens.append
+        stack: List[int] = []
+        for match in _TOKEN_RE.finditer(tex):
+            kind = match.lastgroup
+            if kind == "open":
+                stack.append(match.start())
+            elif kind == "close":
+                if stack:
+                    self._group_ends[stack.pop()] = match.end()
+            elif kind == "command":
+                append(Token(COMMAND, match.start(), match.end(), match.group(kind)))
+            elif kind == "env_name":
+                name = match.group(kind)
+                append(Token(match.group("env"), match.start(), match.end(), name))
+            else:
+                append(Token(COMMENT, match.start(), match.end()))
+
+    def group_end(self, pos: int) -> Optional[int]:
+        """End offset of the brace group opening at *pos*, if it is closed."""
+
+        return self._group_ends.get(pos)
+
+    def find_commands(self, command_name: str) -> List[Span]:
+        """Outermost ``\\name[options]{argument}`` commands.
+
+        *command_name* is a regex alternation as passed to
+        :func:`~src.formats.latex.utils.get_command_pattern`.
+        """
+
+        return self._find_heads(
+            _command_head(command_name),
+            _command_names(command_name),
+            lambda match: Span(0, 0, match.group(1)),
+        )
+
+    def find_newcommands(self) -> List[Span]:
+        """``\\newcommand``-style definitions; ``arguments`` holds ``[n]``."""
+
+        def span(match) -> Span:
+            n_arguments = match.group(3)
+            return Span(
+                0,
+                0,
+                match.group(1) or match.group(2),
+                int(n_arguments) if n_arguments is not None else 0,
+            )
+
+        return self._find_heads(
+            _NEWCOMMAND_HEAD_RE, _command_names(_NEWCOMMANDS), span
+        )
+
+    def _find_heads(self, head, names, make_span) -> List[Span]:
+        spans: List[Span] = []
+        last_end = 0
+        candidates: Dict[str, bool] = {}
+        for token in self.tokens:
+            if token.kind != COMMAND or token.start < last_end:
+                continue
+            candidate = candidates.get(token.name)
+            if candidate is None:
+                candidate = candidates[token.name] = bool(names.fullmatch(token.name))
+            if not candidate:
+                continue
+            match = head.match(self.tex, token.start)
+            if match is None:
+                continue
+            end = self.group_end(match.end())
+            if end is None:
+                continue
+            spans.append(make_span(match)._replace(start=token.start, end=end))
+            last_end = end
+        return spans
+
+    def environment_tree(self) -> List[EnvNode]:
+        """Closed environments as a tree with offsets, built in linear time.
+
+        ``\\begin``/``\\end`` markers are matched with a stack, so nested
+        environments of the same name pair correctly. An ``\\end`` without
+        an open environment of its name is ignored; one that closes an outer
+        environment drops the still-open inner ones, whose own children are
+        kept. Every marker is pushed and popped at most once.
+        """
+
+        opened: List[EnvNode] = []
+        stack: List[EnvNode] = []
+        open_names: Dict[str, int] = {}
+        for token in self.tokens:
+            if token.kind == BEGIN:
+                node = EnvNode(token.name, token.start, token.end)
+                opened.append(node)
+                stack.append(node)
+                open_names[token.name] = open_names.get(token.name, 0) + 1
+            elif token.kind == END and open_names.get(token.name):
+                while True:
+                    node = stack.pop()
+                    open_names[node.name] -= 1
+                    if node.name == token.name:
+                        node.body_end = token.start
+                        node.end = token.end
+                        break
+
+        # Closed nodes are properly nested; attach them in order of their start
+        roots: List[EnvNode] = []
+        parents: List[EnvNode] = []
+        for node in opened:
+            if not node.closed:
+                continue
+            while parents and parents[-1].end <= node.start:
+                parents.pop()
+            (parents[-1].children if parents else roots).append(node)
+            parents.append(node)
+        return roots
+
+    def find_environments(self) -> List[Span]:
+        """Outermost translatable environments of :meth:`environment_tree`.
+
+        ``document``, ``center``, ``proof`` and ``multicols`` stay in the text,
+        but the environments inside them are returned.
+        """
+
+        spans: List[Span] = []
+        pending = list(reversed(self.environment_tree()))
+        while pending:
+            node = pending.pop()
+            if _KEPT_ENV_RE.match(node.name):
+                pending.extend(reversed(node.children))
+            else:
+                spans.append(Span(node.start, node.end, node.name))
+        return spans
+
+
+def replace_spans(tex: str, spans: List[Span], placeholders: List[str]) -> str:
+    """Replace each of the ordered, disjoint *spans* by its placeholder."""
+
+    pieces = []
+    pos = 0
+    for span, placeholder in zip(spans, placeholders):
+        pieces.append(tex[pos : span.start])
+        pieces.append(placeholder)
+        pos = span.end
+    pieces.append(tex[pos:])
+    return "".join(pieces)
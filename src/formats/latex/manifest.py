@@ -0,0 +1,105 @@
+"""What a LaTeX project is made of, computed once and shared by the agents.
+
+Finding the main file used to walk the whole tree and read every ``.tex``
+from the parser, the constructor and the compiler, each time on a directory
+that may hold tens of megabytes of figures. :class:`ProjectManifest` records
+the main file, the tex files, the assets and a size and content hash per
+file in a single walk; the parser agent saves it next to the maps as
+:data:`MANIFEST_FILE` and later stages read the main file from there.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Any, Dict, List, Optional
+
+from .utils import find_main_tex_file
+
+MANIFEST_FILE = "project_manifest.json"
+
+
+class ProjectManifest:
+    """Main file, tex files, assets and per-file size and SHA-256 of a project."""
+
+    def __init__(
+        self,
+        main_tex_file: Optional[str] = None,
+        files: Optional[Dict[str, Dict[str, Any]]] = None,
+        source_hash: str = "",
+    ):
+        # Paths are relative to the project, with "/" separators
+        self.main_tex_file = main_tex_file
+        self.files: Dict[str, Dict[str, Any]] = files or {}
+        # Covers paths and contents of every file; changes with any edit
+        self.source_hash = source_hash
+
+    @property
+    def tex_files(self) -> List[str]:
+        return [path for path in self.files if path.endswith(".tex")]
+
+    @property
+    def assets(self) -> List[str]:
+        return [path for path in self.files if not path.endswith(".tex")]
+
+    def main_path(self, root: str) -> Optional[str]:
+        """The main file inside *root*, the project or a copy of it."""
+
+        if self.main_tex_file is None:
+            return None
+        return os.path.join(root, *self.main_tex_file.split("/"))
+
+    @classmethod
+    def build(cls, project_dir: str) -> ProjectManifest:
+        """Walk *project_dir* once, hashing each file in sorted path order.
+
+        The main file is then probed among the ``.tex`` files of that walk.
+        """
+
+        files: Dict[str, Dict[str, Any]] = {}
+        tex_paths: List[str] = []
+        digest = hashlib.sha256()
+        for root, dirs, names in os.walk(project_dir):
+            dirs.sort()
+            for name in sorted(names):
+                path = os.path.join(root, name)
+                relative = _relative(path, project_dir)
+                if name.endswith(".tex"):
+                    tex_paths.append(path)
+                file_digest = hashlib.sha256()
+                digest.update(relative.encode("utf-8") + b"\0")
+                with open(path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(chunk)
+                        file_digest.update(chunk)
+                digest.update(b"\0")
+                files[relative] = {
+                    "size": os.path.getsize(path),
+                    "sha256": file_digest.hexdigest(),
+                }
+
+        main_tex_file = find_main_tex_file(project_dir, tex_paths)
+        if main_tex_file is not None:
+            main_tex_file = _relative(main_tex_file, project_dir)
+        return cls(main_tex_file, files, digest.hexdigest())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "main_tex_file": self.main_tex_file,
+            "source_hash": self.source_hash,
+            "tex_files": self.tex_files,
+            "assets": self.assets,
+            "files": self.files,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> ProjectManifest:
+        return cls(
+            data.get("main_tex_file"),
+            data.get("files", {}),
+            data.get("source_hash", ""),
+        )
+
+
+def _relative(path: str, root: str) -> str:
+    return os.path.relpath(path, root).replace(os.sep, "/")
@@ -1,5 +1,7 @@
 from typing import Any
 from .utils import *
+from .lexer import LatexLexer, replace_spans
+from .pieces import PieceTable
 import tiktoken
 import sys
 import os
@@ -8,7 +10,7 @@ import streamlit as st
 
 
 class LatexParser:
-    def __init__(self, dir: str, output_dir: str):
+    def __init__(self, dir: str, output_dir: str, main_tex_file: str = None):
         self.inputs_json = []
         self.envs_json = []
         self.captions_json = []
@@ -16,8 +18,13 @@ class LatexParser:
         self.sections_json = []
         self.dir = dir  # LaTex profect directory
         self.output_dir = output_dir  # Output directory for parsed files
+        self.main_tex_file = main_tex_file  # Found from the project if not given
         self.env_count = 0
         self.caption_count = 0
+        # Project-relative tex file -> the files it inputs, in order of appearance
+        self.include_graph = {}
+        self._input_paths = {}
+        self._input_texts = {}
 
     def parse(self):
         """
@@ -29,7 +36,7 @@ class LatexParser:
             process_bar = st.progress(0, text="Parsing LaTeX document...")
         sys.stderr = sys.__stderr__
 
-        main_tex_file = find_main_tex_file(self.dir)
+        main_tex_file = self.main_tex_file or find_main_tex_file(self.dir)
         if not main_tex_file:
             print("⚠️ Warning: There is no main tex file to compile in this directory.")
             return None
@@ -48,7 +55,7 @@ class LatexParser:
         sys.stderr = sys.__stderr__
 
         main_tex = remove_comments(main_tex)
-        full_tex = self._merge_inputs(main_tex)
+        full_tex = self._merge_inputs(main_tex, main_tex_file)
         full_tex = self._extract_newcommands(full_tex)
 
         full_tex = compress_newlines(
@@ -110,42 +117,48 @@ class LatexParser:
     #     self._split_to_sections(full_tex)
     #     self._merge_short_sections(min_tokens=20)  # Merge short sections to avoid too many sections
 
-    def _merge_inputs(self, tex: str) -> str:
+    def _merge_inputs(self, tex: str, path: str = "") -> str:
         """
         Merge all the inputs in the main tex file and genarate a json file for the inputs.
+        The merged tex is assembled as a piece table over the files and joined once.
+        path is the main tex file; it names the root of include_graph.
+        """
+        root = os.path.relpath(path, self.dir).replace(os.sep, "/") if path else ""
+        document = PieceTable()
+        self._splice_inputs(remove_comments(tex), document, [root])
+        return document.text()
+
+    def _splice_inputs(self, tex: str, document: PieceTable, including: list) -> None:
+        """
+        Append tex to the document with each \\input or \\include replaced by the file it names.
+        including lists the files from the main file down to the one tex comes from;
+        an input of one of them would never end and is left as it is.
         """
-        main_tex = remove_comments(tex)
         command_name = r"input|include"
         pattern_input = get_command_pattern(
             command_name
         )  # \input{file.tex} or \input{file} or \include{file.tex} or \include{file}
+        included = self.include_graph.setdefault(including[-1], [])
         pos = 0
-        while True:
-            result = pattern_input.search(main_tex, pos)
-            if result is None:
-                break
+        for result in pattern_input.finditer(tex):
             begin, end = result.span()
-            pos = result.end()
             match = result.group(4)
-            inputfilepath = os.path.join(self.dir, match)
-
-            if os.path.exists(f"{inputfilepath}"):
-                inputfilepath = f"{inputfilepath}"
-            elif os.path.exists(f"{inputfilepath}.tex"):
-                inputfilepath = f"{inputfilepath}.tex"
-            else:
-                print(
-                    f"⚠️ Warning: File not found: {inputfilepath}.tex or {inputfilepath}"
-                )
-                pos = result.end()  # Skip this input and continue
+            inputfilepath = self._find_input(match)
+            if inputfilepath is None:
+                continue  # Skip this input and continue
+
+            relative_path = os.path.relpath(inputfilepath, self.dir).replace(os.sep, "/")
+            if relative_path in including:
+                cycle = " -> ".join(including + [relative_path])
+                print(f"⚠️ Warning: Cyclic input skipped: {cycle}")
                 continue
+            if relative_path not in included:
+                included.append(relative_path)
 
-            input_tex = read_tex_file(inputfilepath)
-            input_tex = remove_comments(input_tex)
             input_begin = f"<PLACEHOLDER_{match}_begin>"
             input_end = f"<PLACEHOLDER_{match}_end>"
-            input_tex = input_begin + input_tex + input_end
-            main_tex = main_tex[:begin] + input_tex + main_tex[end:]
+            document.append(tex, pos, begin)
+            document.append(input_begin)
             self.inputs_json.append(
                 {
                     "command": result.group(0),
@@ -154,8 +167,40 @@ class LatexParser:
                     "path": match,
                 }
             )
+            including.append(relative_path)
+            self._splice_inputs(self._read_input(inputfilepath), document, including)
+            including.pop()
+            document.append(input_end)
+            pos = end
 
-        return main_tex
+        document.append(tex, pos)
+
+    def _find_input(self, match: str):
+        """
+        Return the path of the file an input names, or None if it does not exist.
+        """
+        if match not in self._input_paths:
+            inputfilepath = os.path.join(self.dir, match)
+            if os.path.exists(f"{inputfilepath}"):
+                self._input_paths[match] = f"{inputfilepath}"
+            elif os.path.exists(f"{inputfilepath}.tex"):
+                self._input_paths[match] = f"{inputfilepath}.tex"
+            else:
+                print(
+                    f"⚠️ Warning: File not found: {inputfilepath}.tex or {inputfilepath}"
+                )
+                self._input_paths[match] = None
+        return self._input_paths[match]
+
+    def _read_input(self, inputfilepath: str) -> str:
+        """
+        Read an input file without comments, once however often it is included.
+        """
+        if inputfilepath not in self._input_texts:
+            self._input_texts[inputfilepath] = remove_comments(
+                read_tex_file(inputfilepath)
+            )
+        return self._input_texts[inputfilepath]
 
     def _extract_envs(self, tex: str) -> str:
         """
@@ -163,10 +208,8 @@ class LatexParser:
         The environments are replaced with placeholders in the full tex.
         """
         full_tex = remove_comments(tex)
-        command_name = r".*?"
-        pattern_env = get_env_pattern(
-            command_name
-        )  # \begin{env}...\end{env} or \begin{env}...\end{env}* or \begin{env}[options]...\end{env}
+        # \begin{env}...\end{env} or \begin{env}[options]...\end{env}
+        spans = LatexLexer(full_tex).find_environments()
         placeholder_pattern_cap = r"<PLACEHOLDER_CAP_\d+>"
         no_translate_envs = [
             "equation",
@@ -220,13 +263,11 @@ class LatexParser:
             "algorithmic*",
             "algorithm*",
         ]
-        while True:
-            result = pattern_env.search(full_tex)
-            if result is None:
-                break
+        placeholders = []
+        for span in spans:
             self.env_count += 1
-            env_name = result.group(1)
-            env_content = result.group(0)
+            env_name = span.name
+            env_content = full_tex[span.start : span.end]
             placeholders_cap_in_env = re.findall(placeholder_pattern_cap, env_content)
 
             need_trans = True
@@ -239,7 +280,7 @@ class LatexParser:
                 need_trans = False
 
             placeholder = f"<PLACEHOLDER_ENV_{self.env_count}>"
-            full_tex = full_tex.replace(env_content, placeholder, 1)
+            placeholders.append(placeholder)
             self.envs_json.append(
                 {
                     "placeholder": placeholder,
@@ -250,7 +291,7 @@ class LatexParser:
                 }
             )
 
-        return full_tex
+        return replace_spans(full_tex, spans, placeholders)
 
     def _extract_captions(self, tex: str) -> str:
         """
@@ -259,64 +300,48 @@ class LatexParser:
         """
         full_tex = remove_comments(tex)
         command_name = r"caption|caption\*|subcaption|subcaption\*|title|keywords|abstract|icmltitle|icmltitlerunning"  # Unable to handle \captionof{}{}
-        pattern_caption = get_command_pattern(
+        spans = LatexLexer(full_tex).find_commands(
             command_name
         )  # \caption{...} or \caption*{...} or \caption[...]{...}
         # pattern_captionof = get_captionof_pattern() # \captionof{type}{content} or \captionof*{type}{content}
 
-        while True:
-            result = pattern_caption.search(full_tex)
-            if result is None:
-                break
+        placeholders = []
+        for span in spans:
             self.caption_count += 1
             placeholder = f"<PLACEHOLDER_CAP_{self.caption_count}>"
-            full_tex = full_tex.replace(result.group(0), placeholder, 1)
+            placeholders.append(placeholder)
             self.captions_json.append(
                 {
                     "placeholder": placeholder,
-                    "cap_type": result.group(1),
-                    "content": result.group(0),
+                    "cap_type": span.name,
+                    "content": full_tex[span.start : span.end],
                     "trans_content": "",
                 }
             )
 
-        return full_tex
+        return replace_spans(full_tex, spans, placeholders)
 
     def _extract_newcommands(self, tex: str) -> str:
         """
         Extract all the newcommands in the full tex and genarate a json file for the newcommands.
         """
-
-        def get_nonNone(*args):
-            result = [arg for arg in args if arg is not None]
-            assert len(result) == 1
-            return result[0]
-
         full_tex = remove_comments(tex)
-        pattern = get_newcommand_pattern()  # \newcommand{name}[n_arguments]{content} or \renewcommand{name}[n_arguments]{content} or
+        spans = LatexLexer(full_tex).find_newcommands()  # \newcommand{name}[n_arguments]{content} or \renewcommand{name}[n_arguments]{content} or
         # \newenvironment{name}[n_arguments]{content} or \renewenvironment{name}[n_arguments]{content}
-        count = 0
-
-        while True:
-            match = pattern.search(full_tex)
-            if match is None:
-                break
-            name1 = match.group(1)
-            name2 = match.group(2)
-            name = get_nonNone(name1, name2)
-            n_arguments = match.group(3)
-            if n_arguments is None:
-                n_arguments = 0
-            else:
-                n_arguments = int(n_arguments)
+
+        placeholders = []
+        for count, span in enumerate(spans):
             placeholder = f"<PLACEHOLDER_NEWCOMMAND_{count}>"
-            full_tex = full_tex.replace(match.group(0), placeholder, 1)
+            placeholders.append(placeholder)
             self.newcommands_json.append(
-                {"placeholder": placeholder, "name": name, "content": match.group(0)}
+                {
+                    "placeholder": placeholder,
+                    "name": span.name,
+                    "content": full_tex[span.start : span.end],
+                }
             )
-            count += 1
 
-        return full_tex
+        return replace_spans(full_tex, spans, placeholders)
 
     def _split_to_sections(self, tex: str) -> Any:
         """
@@ -0,0 +1,58 @@
+"""Piece table over the source texts of a LaTeX project.
+
+Merging ``\\input`` files and reverting placeholders used to rebuild the
+whole document string for every substitution (``tex[:begin] + new +
+tex[end:]`` or one ``str.replace`` per placeholder), which is quadratic in
+the number of substitutions and keeps several copies of a large thesis
+alive. A :class:`PieceTable` instead references spans of texts that are
+stored once; substitutions only append pieces, and the document is joined
+into a single string when a caller finally needs it.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, List, NamedTuple, Optional
+
+
+class Piece(NamedTuple):
+    """``text[start:end]`` of a stored text."""
+
+    text: str
+    start: int
+    end: int
+
+
+class PieceTable:
+    """A document assembled from spans of other texts, without copying them."""
+
+    def __init__(self, text: str = ""):
+        self.pieces: List[Piece] = []
+        self._length = 0
+        self.append(text)
+
+    def append(self, text: str, start: int = 0, end: Optional[int] = None) -> None:
+        """Append ``text[start:end]`` by reference."""
+
+        end = len(text) if end is None else end
+        if start >= end:
+            return
+        self.pieces.append(Piece(text, start, end))
+        self._length += end - start
+
+    def extend(self, other: PieceTable) -> None:
+        """Append the pieces of *other*, which is left unchanged."""
+
+        self.pieces.extend(other.pieces)
+        self._length += len(other)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[str]:
+        for text, start, end in self.pieces:
+            yield text if start == 0 and end == len(text) else text[start:end]
+
+    def text(self) -> str:
+        """The document as one string; the only full copy that is made."""
+
+        return "".join(self)
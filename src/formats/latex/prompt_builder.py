@@ -0,0 +1,132 @@
+"""Assemble chat requests so that their prefix is shared across a paper.
+
+Provider-side prompt caching (OpenAI, DeepSeek) and prefix KV reuse in vLLM
+or Ollama only help when consecutive requests start with the same bytes. The
+system prompts from :mod:`src.formats.latex.prompts` depend only on the
+language pair, so they are kept verbatim as the static prefix. Everything
+that changes per request (the pruned glossary, the segment, validator
+feedback) goes into the user message, with the segment last.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Dict, List, Tuple
+
+GLOSSARY_RULE = (
+    "When translating, you must strictly use the glossary given at the start of "
+    "the user message (after <Glossary>:) for substitution. This is the highest "
+    "priority rule to ensure the consistency of terms throughout the text. "
+    "Maintain the terminology from the glossary provided."
+)
+PACKED_RULE = (
+    "The user message contains several independent segments. Each one starts "
+    "with a line [[SEG n]] and ends with a line [[/SEG n]]. Translate every "
+    "segment on its own according to the rules above and answer with exactly "
+    "the same markers and IDs, in the same order, with only the translated "
+    "segment between them. Never merge, drop or renumber segments."
+)
+PACKED_JSON_RULE = (
+    "The user message is a JSON object mapping segment IDs to independent "
+    "segments. Translate every segment on its own according to the rules above "
+    "and answer with a JSON object mapping the same IDs to the translated "
+    "segments. Never merge, drop or renumber segments."
+)
+EMPTY_TEXT_RULE = (
+    "If there was no text to begin with (e.g., an empty caption), return an "
+    "empty string."
+)
+
+
+def build_glossary_request(
+    system_prompt: str, glossary: Dict[str, str], text: str
+) -> Tuple[str, str]:
+    """Return ``(system, user)`` messages for a glossary-constrained translation."""
+
+    system = f"{system_prompt}\n{GLOSSARY_RULE}\n{EMPTY_TEXT_RULE}"
+    user = f"<Glossary>:\n{glossary}\n[Current LaTeX Paragraph]:\n{text}"
+    return system, user
+
+
+def build_retranslation_request(
+    system_prompt: str,
+    glossary: Dict[str, str],
+    original: str,
+    translation: str,
+    error_message: str,
+) -> Tuple[str, str]:
+    """Return ``(system, user)`` messages for correcting a failed translation."""
+
+    system = f"{system_prompt}\n{GLOSSARY_RULE}"
+    user = (
+        f"<Glossary>:\n{glossary}\n[Original]:\n{original}\n"
+        f"[Translation]:\n{translation}\n[Error]:\n{error_message}"
+    )
+    return system, user
+
+
+_PACKED_SEGMENT_RE = re.compile(r"\[\[SEG (\d+)\]\]\n?(.*?)\n?\[\[/SEG \1\]\]", re.DOTALL)
+
+
+def build_packed_request(
+    system_prompt: str, texts: List[str], json_mode: bool = False
+) -> Tuple[str, str]:
+    """Return ``(system, user)`` messages translating *texts* in one request.
+
+    Segments are numbered from 1, either between ``[[SEG n]]`` markers or as
+    a JSON object when the backend supports JSON output.
+    """
+
+    if json_mode:
+        system = f"{system_prompt}\n{PACKED_JSON_RULE}"
+        user = json.dumps(
+            {str(i): text for i, text in enumerate(texts, start=1)},
+            ensure_ascii=False,
+            indent=1,
+        )
+        return system, user
+
+    system = f"{system_prompt}\n{PACKED_RULE}"
+    user = "\n".join(
+        f"[[SEG {i}]]\n{text}\n[[/SEG {i}]]" for i, text in enumerate(texts, start=1)
+    )
+    return system, user
+
+
+def parse_packed_response(
+    output: str, count: int, json_mode: bool = False
+) -> Dict[int, str]:
+    """Split a packed answer into ``{segment ID: translation}``.
+
+    IDs that are missing, duplicated or out of range are left out, so the
+    caller can fall back to per-segment requests for them.
+    """
+
+    if json_mode:
+        start, end = output.find("{"), output.rfind("}")
+        try:
+            data = json.loads(output[start : end + 1]) if start != -1 else {}
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        items = [(key, value) for key, value in data.items() if isinstance(value, str)]
+    else:
+        items = [(m.group(1), m.group(2)) for m in _PACKED_SEGMENT_RE.finditer(output)]
+
+    segments: Dict[int, str] = {}
+    duplicates = set()
+    for key, value in items:
+        try:
+            segment_id = int(key)
+        except (TypeError, ValueError):
+            continue
+        if not 1 <= segment_id <= count:
+            continue
+        if segment_id in segments:
+            duplicates.add(segment_id)
+        segments[segment_id] = value
+    for segment_id in duplicates:
+        del segments[segment_id]
+    return segments
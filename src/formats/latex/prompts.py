@@ -16,6 +16,7 @@ caption_system_prompt_with_dict = None
 section_system_prompt_with_dict = None
 env_system_prompt_with_dict = None
 set_need_trans_for_envs_system_prompt = None
+set_need_trans_for_envs_batch_system_prompt = None
 retrans_error_parts_system_prompt = None
 extract_terminology_system_prompt = None
 refine_summary_system_prompt = None
@@ -36,6 +37,7 @@ def init_prompts(source_lang: str, target_lang: str):
         section_system_prompt_with_dict, \
         env_system_prompt_with_dict, \
         set_need_trans_for_envs_system_prompt, \
+        set_need_trans_for_envs_batch_system_prompt, \
         retrans_error_parts_system_prompt, \
         extract_terminology_system_prompt, \
         get_summary_system_prompt, \
@@ -264,6 +266,53 @@ def init_prompts(source_lang: str, target_lang: str):
     false
     """
 
+    set_need_trans_for_envs_batch_system_prompt = rf"""
+    You are a LaTeX translation assistant.
+    
+    The user sends several LaTeX environments at once. Each one is wrapped in an ID-tagged block:
+    
+    [[ENV <id>]]
+    <content of the environment>
+    [[/ENV <id>]]
+    
+    For **every** block, analyze only the content itself (environment names can be custom-defined and should be ignored) and decide whether it should be translated when translating an academic paper.
+    
+    ---
+    
+    ### Answer `True` if the content:
+    - Contains complete or partial sentences written in natural language (e.g., {source_lang}), such as explanations, definitions, figure/table captions, theorem statements, or descriptions.
+    - Helps the reader understand the paper and would lose meaning if left untranslated.
+    
+    ### Answer `False` if the content:
+    - Contains only code, pseudocode, mathematical formulas, drawing instructions (e.g., TikZ), formatting macros, or raw markup.
+    - Does not include any human-readable sentences or phrases.
+    
+    ---
+    
+    Only output one line per block, in the same order, formatted as `<id>: True` or `<id>: False`.
+    No explanations or additional text.
+    
+    ---
+    
+    Example:
+    
+    Input:
+    [[ENV 1]]
+    \begin{{mybox}}
+    A graph is connected if there is a path between every pair of vertices.
+    \end{{mybox}}
+    [[/ENV 1]]
+    [[ENV 2]]
+    \begin{{randomenv}}
+    \draw[->] (0,0) -- (1,1);
+    \end{{randomenv}}
+    [[/ENV 2]]
+    
+    Output:
+    1: True
+    2: False
+    """
+
     retrans_error_parts_system_prompt = rf"""
     You are a professional academic translator and LaTeX translation corrector.  
     Your task is to revise and improve machine-translated LaTeX academic texts based on three components provided by the user: the original {source_lang} LaTeX source, the existing {target_lang} translation, and the error information describing the issue(s). Your revision must strictly preserve LaTeX syntax integrity and comply with the following rules. Note that some LaTeX commands might have no text to translate in which case you just copy the LaTeX code as is.
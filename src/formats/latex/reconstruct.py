@@ -2,6 +2,10 @@ from typing import List, Dict, Any
 import os
 import re
 from .utils import *
+from .pieces import PieceTable
+
+# Placeholders of envs, captions and newcommands left in the translated sections
+PLACEHOLDER_PATTERN = re.compile(r"<PLACEHOLDER_(?:ENV|CAP|NEWCOMMAND)_\d+>")
 
 
 class LatexConstructor:
@@ -13,6 +17,7 @@ class LatexConstructor:
         inputs: List[Dict[str, Any]],
         newcommands: List[Dict[str, Any]],
         output_latex_dir: str,
+        main_tex_file: str = None,
     ):
         self.sections = sections
         self.captions = captions
@@ -20,113 +25,121 @@ class LatexConstructor:
         self.inputs = inputs
         self.newcommands = newcommands
         self.output_latex_dir = output_latex_dir
+        self.main_tex_file = main_tex_file  # Found from the output if not given
 
     def construct(self):
         """
         Construct the translated latex project from the sections, envs, captions and inputs
         """
-        tex = self._merge_sections()
-        tex = self._revert_envs(tex)
-        tex = self._revert_captions(tex)
-        tex = self._revert_newcommands(tex)
+        document = self._revert_placeholders()
 
         # process japanese specific packages ----------
         # tex = self._comment_out_latex_packages_for_ja(tex)
         # tex = self._add_lualatex_option_to_documentclass_for_ja(tex)
         # ---------------------------------------------
 
-        self._revert_inputs(tex)
-
-    def _merge_sections(self) -> str:
-        """
-        Merge all the sections to a tex
-        """
-        tex = ""
-        for section in self.sections:
-            tex += section["trans_content"] + "\n"
-        return tex
+        self._revert_inputs(document)
 
-    def _revert_envs(self, tex: str) -> str:
+    def _revert_placeholders(self) -> PieceTable:
         """
-        Revert all the envs to tex
+        Merge all the sections and revert the envs, captions and newcommands in a single pass.
+        Replacements are appended as pieces, so the tex is not rebuilt per placeholder.
         """
+        replacements = {}
         for env in self.envs:
-            placeholder = env["placeholder"]
-            tex = tex.replace(placeholder, env["trans_content"])
-
-        return tex
-
-    def _revert_captions(self, tex: str) -> str:
-        """
-        Revert all the captions to tex
-        """
+            replacements.setdefault(env["placeholder"], env["trans_content"])
         for caption in self.captions:
-            placeholder = caption["placeholder"]
-            tex = tex.replace(placeholder, caption["trans_content"])
+            replacements.setdefault(caption["placeholder"], caption["trans_content"])
+        for newcommand in self.newcommands:
+            replacements.setdefault(newcommand["placeholder"], newcommand["content"])
 
-        return tex
+        document = PieceTable()
+        for section in self.sections:
+            self._expand_placeholders(
+                section["trans_content"], replacements, document, set()
+            )
+            document.append("\n")
+        return document
 
-    def _revert_newcommands(self, tex: str) -> str:
+    def _expand_placeholders(
+        self,
+        tex: str,
+        replacements: Dict[str, str],
+        document: PieceTable,
+        active: set,
+    ) -> None:
         """
-        Revert all the newcommands to tex
+        Append tex to the document with the placeholders in it, and in their contents, reverted.
+        A placeholder inside its own content is left as it is.
         """
-        for newcommand in self.newcommands:
-            placeholder = newcommand["placeholder"]
-            tex = tex.replace(placeholder, newcommand["content"])
-
-        return tex
+        pos = 0
+        for match in PLACEHOLDER_PATTERN.finditer(tex):
+            placeholder = match.group()
+            if placeholder not in replacements or placeholder in active:
+                continue
+            document.append(tex, pos, match.start())
+            active.add(placeholder)
+            self._expand_placeholders(
+                replacements[placeholder], replacements, document, active
+            )
+            active.discard(placeholder)
+            pos = match.end()
+        document.append(tex, pos)
 
-    def _revert_inputs(self, tex: str):
+    def _revert_inputs(self, document: PieceTable):
         begin_map = {sec["begin"]: sec for sec in self.inputs}
         end_map = {sec["end"]: sec for sec in self.inputs}
         pattern = re.compile(r"<PLACEHOLDER_[^>]+?_begin>|<PLACEHOLDER_[^>]+?_end>")
 
-        stack = []
-        pos = 0
-
-        while True:
-            match = pattern.search(tex, pos)
-            if not match:
-                break
-
-            tag = match.group()
-
-            if tag in begin_map:
-                stack.append((tag, match.start()))
-                pos = match.end()
-            elif tag in end_map:
-                if not stack:
-                    raise ValueError(f"Unmatched end tag: {tag}")
-                begin_tag, begin_pos = stack.pop()
-                if end_map[tag] != begin_map[begin_tag]:
-                    raise ValueError(f"Mismatched tags: {begin_tag} vs {tag}")
-
-                input_info = begin_map[begin_tag]
-                end_pos = match.end()
-
-                inner_start = begin_pos + len(begin_tag)
-                inner_end = match.start()
-                inner_content = tex[inner_start:inner_end].strip()
-
-                relative_path = input_info["path"]
-                if not relative_path.endswith(".tex"):
-                    relative_path += ".tex"
-                output_path = os.path.join(self.output_latex_dir, relative_path)
-                with open(output_path, "w", encoding="utf-8") as f:
-                    f.write(inner_content + "\n")
-
-                tex = tex[:begin_pos] + input_info["command"] + tex[end_pos:]
-
-                pos = begin_pos + len(input_info["command"])
-
-            else:
-                pos = match.end()
+        main = PieceTable()
+        stack = []  # (begin tag, content of the input file so far)
+
+        for text, start, end in document.pieces:
+            pos = start
+            for match in pattern.finditer(text, start, end):
+                tag = match.group()
+                current = stack[-1][1] if stack else main
+
+                if tag in begin_map:
+                    current.append(text, pos, match.start())
+                    stack.append((tag, PieceTable()))
+                    pos = match.end()
+                elif tag in end_map:
+                    if not stack:
+                        raise ValueError(f"Unmatched end tag: {tag}")
+                    current.append(text, pos, match.start())
+                    begin_tag, content = stack.pop()
+                    if end_map[tag] != begin_map[begin_tag]:
+                        raise ValueError(f"Mismatched tags: {begin_tag} vs {tag}")
+
+                    input_info = begin_map[begin_tag]
+                    inner_content = content.text().strip()
+
+                    relative_path = input_info["path"]
+                    if not relative_path.endswith(".tex"):
+                        relative_path += ".tex"
+                    output_path = os.path.join(self.output_latex_dir, relative_path)
+                    with open(output_path, "w", encoding="utf-8") as f:
+                        f.write(inner_content + "\n")
+
+                    (stack[-1][1] if stack else main).append(input_info["command"])
+                    pos = match.end()
+
+            (stack[-1][1] if stack else main).append(text, pos, end)
 
         if stack:
             unclosed_tags = [tag for tag, _ in stack]
             print(
                 f"⚠️ Warning: Unclosed begin placeholder(s) found and skipped: {unclosed_tags}"
             )
+            # Keep their text in place; the tags are removed as residuals below
+            for index in range(len(stack) - 1, -1, -1):
+                tag, content = stack[index]
+                parent = stack[index - 1][1] if index else main
+                parent.append(tag)
+                parent.extend(content)
+
+        tex = main.text()
 
         residual_matches = re.findall(r"<PLACEHOLDER_[^>]*>", tex)
         if residual_matches:
@@ -138,7 +151,7 @@ class LatexConstructor:
         tex = add_ctex_package(tex)  # zh
         # tex = add_ja_package(tex)  # ja
 
-        main_file_path = find_main_tex_file(self.output_latex_dir)
+        main_file_path = self.main_tex_file or find_main_tex_file(self.output_latex_dir)
         if main_file_path and os.path.exists(main_file_path):
             with open(main_file_path, "w", encoding="utf-8") as f:
                 f.write(tex)
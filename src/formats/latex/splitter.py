@@ -0,0 +1,77 @@
+"""Token-aware splitting of oversized sections into translatable pieces."""
+
+from __future__ import annotations
+
+import re
+from typing import List, Pattern, Sequence, Tuple
+
+from src.llm.tokens import count_tokens
+
+# Boundaries tried from coarsest to finest. The matched text becomes the
+# separator between two pieces and is copied verbatim on reassembly, so
+# placeholder-only lines never reach the model.
+BOUNDARIES: Sequence[Pattern[str]] = (
+    re.compile(r"\n[ \t]*\n\s*"),  # blank line between paragraphs
+    re.compile(r"\n(?:[ \t]*<PLACEHOLDER_[^>\n]+>[ \t]*\n)+"),  # placeholder lines
+    re.compile(r"\n"),  # any line break
+)
+
+_BEGIN_RE = re.compile(r"\\begin\{")
+_END_RE = re.compile(r"\\end\{")
+
+
+def _env_depth(text: str) -> int:
+    return len(_BEGIN_RE.findall(text)) - len(_END_RE.findall(text))
+
+
+def split_for_token_budget(
+    text: str,
+    max_tokens: int,
+    boundaries: Sequence[Pattern[str]] = BOUNDARIES,
+) -> List[Tuple[str, str]]:
+    """Split *text* into ``(piece, separator)`` pairs of at most *max_tokens*.
+
+    Pieces are packed greedily at the coarsest boundary that works and never
+    cut inside a ``\\begin{...}``/``\\end{...}`` pair. A piece that cannot be
+    split further is returned as is, even when it exceeds the budget.
+    ``"".join(piece + separator for piece, separator in pairs)`` always
+    reproduces *text*.
+    """
+
+    if max_tokens <= 0 or count_tokens(text) <= max_tokens or not boundaries:
+        return [(text, "")]
+
+    units = []
+    position = 0
+    for match in boundaries[0].finditer(text):
+        units.append((text[position : match.start()], match.group(0)))
+        position = match.end()
+    units.append((text[position:], ""))
+    if len(units) == 1:
+        return split_for_token_budget(text, max_tokens, boundaries[1:])
+
+    packed: List[Tuple[str, str]] = []
+    buffer, buffer_separator = units[0]
+    buffer_tokens = count_tokens(buffer)
+    depth = _env_depth(buffer)
+    for unit, separator in units[1:]:
+        unit_tokens = count_tokens(unit)
+        if depth != 0 or buffer_tokens + unit_tokens <= max_tokens:
+            buffer += buffer_separator + unit
+            buffer_tokens += unit_tokens
+        else:
+            packed.append((buffer, buffer_separator))
+            buffer, buffer_tokens = unit, unit_tokens
+        buffer_separator = separator
+        depth = _env_depth(buffer)
+    packed.append((buffer, buffer_separator))
+
+    pieces: List[Tuple[str, str]] = []
+    for piece, separator in packed:
+        if count_tokens(piece) <= max_tokens:
+            pieces.append((piece, separator))
+            continue
+        finer = split_for_token_budget(piece, max_tokens, boundaries[1:])
+        finer[-1] = (finer[-1][0], finer[-1][1] + separator)
+        pieces.extend(finer)
+    return pieces
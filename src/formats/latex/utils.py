@@ -55,28 +55,37 @@ def extract_compressed_files(folder_path):
     # paths = []
     for root, _, files in os.walk(folder_path):
         for file in files:
-            file_path = os.path.join(root, file)
-            if zipfile.is_zipfile(file_path):
-                with zipfile.ZipFile(file_path, "r") as zip_ref:
-                    extract_path = os.path.join(root, file.replace(".zip", ""))
-                    zip_ref.extractall(extract_path)
-                    print(f"Extracted {file} to {extract_path}")
-                    # paths.append(extract_path)
-                os.remove(file_path)
-                # print(f"Deleted source file: {file_path}")
-            elif tarfile.is_tarfile(file_path):
-                with tarfile.open(file_path, "r:*") as tar_ref:
-                    extract_path = os.path.join(
-                        root, file.replace(".tar", "").replace(".gz", "")
-                    )
-                    tar_ref.extractall(extract_path)
-                    print(f"Extracted {file} to {extract_path}")
-                    # paths.append(extract_path)
-                os.remove(file_path)
-                # print(f"Deleted source file: {file_path}")
+            extract_compressed_file(os.path.join(root, file))
     # return paths
 
 
+def extract_compressed_file(file_path):
+    """
+    Extract a single zip or tar archive next to itself and delete it.
+    Other files are left untouched.
+
+    Args:
+        file_path (str): Path to the archive.
+    """
+    root, file = os.path.split(file_path)
+    if zipfile.is_zipfile(file_path):
+        with zipfile.ZipFile(file_path, "r") as zip_ref:
+            extract_path = os.path.join(root, file.replace(".zip", ""))
+            zip_ref.extractall(extract_path)
+            print(f"Extracted {file} to {extract_path}")
+        os.remove(file_path)
+        # print(f"Deleted source file: {file_path}")
+    elif tarfile.is_tarfile(file_path):
+        with tarfile.open(file_path, "r:*") as tar_ref:
+            extract_path = os.path.join(
+                root, file.replace(".tar", "").replace(".gz", "")
+            )
+            tar_ref.extractall(extract_path)
+            print(f"Extracted {file} to {extract_path}")
+        os.remove(file_path)
+        # print(f"Deleted source file: {file_path}")
+
+
 def get_profect_dirs(folder_path):
     """
     Get a list of all subdirectories in the given folder.
@@ -617,9 +626,41 @@ def add_ja_package(latex_code):
     return latex_code
 
 
-def find_main_tex_file(dir):
+# \documentclass is looked for in the first characters of each file, and
+# further only when those hold nothing but comments and filecontents blocks
+MAIN_TEX_HEAD_CHARS = 16384
+
+
+def read_tex_head(path, size=MAIN_TEX_HEAD_CHARS):
+    """
+    Read the first characters of a tex file, where \\documentclass belongs.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read(size)
+
+
+# filecontents blocks, closed or cut off at the end of a head
+_FILECONTENTS_RE = re.compile(
+    r"\\begin\s*\{filecontents\*?\}.*?(?:\\end\s*\{filecontents\*?\}|\Z)", re.DOTALL
+)
+_OPEN_COMMENT_ENV_RE = re.compile(r"\\begin\s*\{comment\}.*\Z", re.DOTALL)
+
+
+def _only_comments_and_filecontents(tex):
+    """
+    Whether *tex*, possibly cut off, holds nothing but comments, filecontents
+    blocks and whitespace, i.e. \\documentclass may still follow.
+    """
+    tex = remove_comments(_FILECONTENTS_RE.sub("", tex))
+    return not _OPEN_COMMENT_ENV_RE.sub("", tex).strip()
+
+
+def find_main_tex_file(dir, tex_files=None):
     """
     Find the main LaTeX file in the given directory.
+
+    Candidates are the *tex_files* paths when given, in their order, instead
+    of every .tex file found by walking *dir*.
     """
     readme_path = os.path.join(dir, "00README.json")
     if os.path.exists(readme_path):
@@ -630,22 +671,26 @@ def find_main_tex_file(dir):
                 main_file_path = os.path.join(dir, main_file_name)
                 return main_file_path if os.path.exists(main_file_path) else None
 
-    tex_files = find_tex_files(dir)
+    if tex_files is None:
+        tex_files = find_tex_files(dir)
     documentclass_pattern = re.compile(
         r"\\document(class|style)(\[.*?\])?\{.*?\}", re.DOTALL
     )
 
     for tex_file in tex_files:
-        # Read the LaTeX code
-        with open(tex_file, "r", encoding="utf-8") as f:
-            latex_code = f.read()
-        latex_code = remove_comments(latex_code)
+        # Read the head of the LaTeX code
+        head = read_tex_head(tex_file)
 
         # Check if \documentclass is present
-        if not documentclass_pattern.search(latex_code):
-            continue
-
-        return tex_file
+        if documentclass_pattern.search(remove_comments(head)):
+            return tex_file
+
+        # A long comment header or filecontents blocks may push it further
+        if len(head) == MAIN_TEX_HEAD_CHARS and _only_comments_and_filecontents(head):
+            latex_code = _FILECONTENTS_RE.sub("", read_tex_file(tex_file))
+            latex_code = remove_comments(latex_code)
+            if documentclass_pattern.search(latex_code):
+                return tex_file
 
     return None
 
@@ -0,0 +1,238 @@
+"""Spread LLM requests over several equivalent endpoints."""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from src.llm.concurrency import get_status_code, is_overload_error
+from src.llm.rate_limit import EndpointRateLimiter, get_rate_limiter
+from src.llm.retry import CircuitBreaker, CircuitOpenError
+
+
+def is_ollama_url(base_url: Optional[str]) -> bool:
+    """Return ``True`` if *base_url* appears to target an Ollama server."""
+
+    if not base_url:
+        return False
+    lowered = base_url.lower()
+    return ":11434" in lowered or "ollama" in lowered
+
+
+class Endpoint:
+    """One backend serving the configured model, plus its health state."""
+
+    def __init__(
+        self,
+        base_url: Optional[str],
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        weight: float = 1.0,
+        rate_limiter: Optional[EndpointRateLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.model = model
+        self.weight = max(float(weight), 0.001)
+        self.rate_limiter = rate_limiter or EndpointRateLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.use_ollama = is_ollama_url(base_url)
+        self.ollama_host = (
+            (base_url or "http://localhost:11434").replace("/v1/chat/completions", "")
+            if self.use_ollama
+            else None
+        )
+        self.outstanding = 0
+        self.ewma_latency: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.base_url!r}, weight={self.weight})"
+
+
+def is_endpoint_failure(exc: BaseException) -> bool:
+    """Errors that say something about the endpoint's health.
+
+    Timeouts, dropped connections and 5xx responses count; quota errors
+    (429) and bad requests do not, since another replica would fail the same
+    way or the rate limiter already handles them.
+    """
+
+    if get_status_code(exc) == 429:
+        return False
+    return is_overload_error(exc)
+
+
+class EndpointBalancer:
+    """Pick an endpoint per request and skip endpoints that keep failing.
+
+    ``least_outstanding`` routes to the endpoint with the fewest in-flight
+    requests relative to its weight; ``ewma`` additionally multiplies by the
+    endpoint's exponentially weighted latency. Timeouts, dropped connections
+    and 5xx responses feed each endpoint's :class:`CircuitBreaker`; while it
+    is open the endpoint is ejected, and when every endpoint is ejected
+    requests fail fast with :class:`CircuitOpenError`.
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[Endpoint],
+        strategy: str = "least_outstanding",
+        ewma_alpha: float = 0.3,
+        log: Optional[Callable[[str], Any]] = None,
+    ):
+        if not endpoints:
+            raise ValueError("at least one endpoint is required")
+        if strategy not in ("least_outstanding", "ewma"):
+            raise ValueError(f"Unknown balancing strategy: {strategy}")
+        self.endpoints = list(endpoints)
+        self.strategy = strategy
+        self.ewma_alpha = ewma_alpha
+        self._log = log
+
+    def _score(self, endpoint: Endpoint) -> float:
+        load = (endpoint.outstanding + 1) / endpoint.weight
+        if self.strategy == "ewma":
+            # Unmeasured endpoints look fast so that they get probed.
+            return load * (endpoint.ewma_latency or 0.0)
+        return load
+
+    def choose(self, exclude: Optional[Endpoint] = None) -> Endpoint:
+        """Return the best endpoint, avoiding *exclude* when possible."""
+
+        healthy = [e for e in self.endpoints if e.breaker.allow()]
+        if not healthy:
+            retry_in = min(e.breaker.retry_in() for e in self.endpoints)
+            raise CircuitOpenError(
+                f"All LLM endpoints are failing; next probe in {retry_in:.0f}s"
+            )
+        candidates = [e for e in healthy if e is not exclude] or healthy
+        return min(candidates, key=lambda e: (self._score(e), e.outstanding))
+
+    def acquire(self, exclude: Optional[Endpoint] = None) -> Endpoint:
+        """Choose an endpoint and count a request as outstanding on it.
+
+        Every call must be paired with :meth:`release`.
+        """
+
+        endpoint = self.choose(exclude)
+        endpoint.breaker.on_request()
+        endpoint.outstanding += 1
+        return endpoint
+
+    def release(self, endpoint: Endpoint) -> None:
+        endpoint.outstanding = max(endpoint.outstanding - 1, 0)
+
+    def record(
+        self,
+        endpoint: Endpoint,
+        latency: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Update the latency average and health of *endpoint*."""
+
+        if error is not None and is_endpoint_failure(error):
+            if endpoint.breaker.record_failure() and self._log is not None:
+                self._log(
+                    f"🚑 Ejecting {endpoint.base_url} for "
+                    f"{endpoint.breaker.retry_in():.0f}s after repeated failures."
+                )
+            return
+        # Any other outcome, even a 4xx, shows that the endpoint is up.
+        endpoint.breaker.record_success()
+        if error is None:
+            if endpoint.ewma_latency is None:
+                endpoint.ewma_latency = latency
+            else:
+                endpoint.ewma_latency += self.ewma_alpha * (
+                    latency - endpoint.ewma_latency
+                )
+
+    @contextlib.contextmanager
+    def track(self, endpoint: Endpoint) -> Iterator[None]:
+        """Time the request in the ``with`` block and :meth:`record` its outcome.
+
+        Cancelled requests (e.g. a losing hedge) are not recorded.
+        """
+
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.record(endpoint, time.monotonic() - started, e)
+            raise
+        self.record(endpoint, time.monotonic() - started)
+
+
+_BALANCERS: Dict[Tuple, EndpointBalancer] = {}
+
+
+def get_balancer(
+    llm_config: Mapping[str, Any],
+    log: Optional[Callable[[str], Any]] = None,
+) -> EndpointBalancer:
+    """Return the balancer shared by every agent using this ``llm_config``.
+
+    ``llm_config.endpoints`` is a list of tables with ``base_url`` and
+    optional ``weight``, ``api_key`` and ``model``; without it the single
+    ``base_url`` is used. Each endpoint gets its own request/token budget
+    and circuit breaker (``failure_threshold``, ``ejection_time``). Nothing
+    in it is bound to an event loop, so papers run on separate loops (one
+    per ``workflow_latextrans`` call) share it safely.
+    """
+
+    specs: List[Mapping[str, Any]] = list(llm_config.get("endpoints") or [])
+    if not specs:
+        specs = [{"base_url": llm_config.get("base_url")}]
+
+    key = tuple(
+        (spec.get("base_url"), spec.get("model"), float(spec.get("weight", 1.0)))
+        for spec in specs
+    )
+    balancer = _BALANCERS.get(key)
+    if balancer is not None:
+        return balancer
+
+    endpoints = []
+    for spec in specs:
+        base_url = spec.get("base_url")
+        endpoints.append(
+            Endpoint(
+                base_url,
+                api_key=spec.get("api_key", llm_config.get("api_key")),
+                model=spec.get("model", llm_config.get("model")),
+                weight=spec.get("weight", 1.0),
+                rate_limiter=get_rate_limiter(
+                    base_url,
+                    requests_per_minute=spec.get(
+                        "requests_per_minute", llm_config.get("requests_per_minute", 0)
+                    ),
+                    tokens_per_minute=spec.get(
+                        "tokens_per_minute", llm_config.get("tokens_per_minute", 0)
+                    ),
+                    log=log,
+                ),
+                breaker=CircuitBreaker(
+                    failure_threshold=int(llm_config.get("failure_threshold", 5)),
+                    reset_timeout=float(llm_config.get("ejection_time", 30.0)),
+                ),
+            )
+        )
+    balancer = EndpointBalancer(
+        endpoints,
+        strategy=llm_config.get("balancing", "least_outstanding"),
+        log=log,
+    )
+    _BALANCERS[key] = balancer
+    return balancer
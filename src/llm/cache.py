@@ -0,0 +1,191 @@
+"""Persistent, content-addressed cache for LLM translations."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+# Bump when the meaning of cached values changes so stale entries are ignored
+CACHE_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used);
+"""
+
+
+def make_cache_key(
+    model: str,
+    system_prompt: str,
+    content: str,
+    glossary: Optional[Dict[str, str]] = None,
+) -> str:
+    """Hash everything that influences a translation into a cache key."""
+
+    material = json.dumps(
+        [
+            CACHE_SCHEMA_VERSION,
+            model,
+            system_prompt,
+            sorted((glossary or {}).items()),
+            content,
+        ],
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """SQLite-backed key/value store with least-recently-used eviction.
+
+    Entries are evicted oldest-first once the stored values exceed
+    ``max_bytes``. Hits and misses are counted for reporting.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()
+        self._total_bytes = int(row[0])
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes of cached values currently stored."""
+
+        return self._total_bytes
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for *key* and refresh its recency."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE translations SET last_used = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store *value* under *key*, evicting old entries when over budget."""
+
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * 0.9))
+
+    def delete(self, key: str) -> None:
+        """Remove *key*, e.g. a translation that failed validation."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return
+            self._conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+            self._total_bytes -= row[0]
+
+    def _evict(self, target_bytes: int) -> None:
+        while self._total_bytes > target_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM translations ORDER BY last_used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for key, size in rows:
+                self._conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+                self._total_bytes -= size
+                self.evictions += 1
+                if self._total_bytes <= target_bytes:
+                    return
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and storage usage."""
+
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self._total_bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_CACHES: Dict[str, TranslationCache] = {}
+
+
+def get_translation_cache(path: str, max_bytes: int) -> TranslationCache:
+    """Return the cache instance shared by every agent using *path*."""
+
+    key = os.path.abspath(path)
+    cache = _CACHES.get(key)
+    if cache is None:
+        cache = TranslationCache(path, max_bytes=max_bytes)
+        _CACHES[key] = cache
+    return cache
+
+
+def translation_cache_from_config(
+    options: Optional[Mapping[str, Any]], output_dir: str
+) -> Optional[TranslationCache]:
+    """Build the cache described by the ``[cache]`` config table.
+
+    The database defaults to ``translation_cache.sqlite`` next to the
+    per-paper output directory, so every paper of a run shares it. Returns
+    ``None`` when the cache is disabled.
+    """
+
+    options = options or {}
+    if not options.get("enabled", True):
+        return None
+    path = options.get("path") or os.path.join(
+        os.path.dirname(os.path.abspath(output_dir)), "translation_cache.sqlite"
+    )
+    max_bytes = int(float(options.get("max_size_mb", 512)) * 1024 * 1024)
+    return get_translation_cache(path, max_bytes=max_bytes)
@@ -0,0 +1,146 @@
+"""Shared, keep-alive HTTP clients for every agent talking to an LLM backend.
+
+Creating a session or Ollama client per request pays DNS, TCP and TLS setup
+on every call. The helpers below hand out pooled clients instead:
+
+* synchronous ``requests`` sessions and ``ollama.Client`` instances live for
+  the whole process and are shared by all papers of a batch;
+* ``aiohttp`` sessions and ``ollama.AsyncClient`` instances are bound to the
+  event loop that created them, so one pool exists per running loop and is
+  released with :func:`close_async_clients` before the loop shuts down.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+
+try:
+    import ollama
+except ImportError:
+    ollama = None  # type: ignore[assignment]
+
+DEFAULT_POOL_OPTIONS: Dict[str, Any] = {
+    "limit": 100,  # connections across all hosts
+    "limit_per_host": 32,
+    "keepalive_timeout": 60.0,  # seconds an idle connection is kept open
+    "dns_cache_ttl": 300,  # seconds
+}
+
+_pool_options: Dict[str, Any] = dict(DEFAULT_POOL_OPTIONS)
+_lock = threading.Lock()
+_requests_session: Optional[requests.Session] = None
+_ollama_clients: Dict[str, Any] = {}
+_aiohttp_sessions: Dict[int, Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+_async_ollama_clients: Dict[Tuple[int, str], Any] = {}
+
+
+def configure_http_pool(options: Optional[Mapping[str, Any]]) -> None:
+    """Override the pool sizes from the ``[http_pool]`` config table.
+
+    Only clients created afterwards pick up the new values.
+    """
+
+    for key, value in (options or {}).items():
+        if key in DEFAULT_POOL_OPTIONS:
+            _pool_options[key] = type(DEFAULT_POOL_OPTIONS[key])(value)
+
+
+def get_requests_session() -> requests.Session:
+    """Return the process-wide ``requests`` session with keep-alive pooling."""
+
+    global _requests_session
+    with _lock:
+        if _requests_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_pool_options["limit_per_host"],
+                pool_maxsize=_pool_options["limit_per_host"],
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _requests_session = session
+        return _requests_session
+
+
+def get_ollama_client(host: str) -> Any:
+    """Return a cached synchronous Ollama client for *host*."""
+
+    if ollama is None:
+        raise ImportError(
+            "Ollama package not installed. Please install with: pip install ollama"
+        )
+    with _lock:
+        client = _ollama_clients.get(host)
+        if client is None:
+            client = ollama.Client(host=host, **_httpx_pool_kwargs())
+            _ollama_clients[host] = client
+        return client
+
+
+def get_aiohttp_session() -> aiohttp.ClientSession:
+    """Return the pooled ``aiohttp`` session of the running event loop."""
+
+    loop = asyncio.get_running_loop()
+    entry = _aiohttp_sessions.get(id(loop))
+    if entry is not None and entry[0] is loop and not entry[1].closed:
+        return entry[1]
+
+    connector = aiohttp.TCPConnector(
+        limit=_pool_options["limit"],
+        limit_per_host=_pool_options["limit_per_host"],
+        ttl_dns_cache=_pool_options["dns_cache_ttl"],
+        keepalive_timeout=_pool_options["keepalive_timeout"],
+    )
+    session = aiohttp.ClientSession(connector=connector)
+    _aiohttp_sessions[id(loop)] = (loop, session)
+    return session
+
+
+def get_async_ollama_client(host: str) -> Any:
+    """Return the ``ollama.AsyncClient`` for *host* on the running loop."""
+
+    if ollama is None:
+        raise ImportError(
+            "Ollama package not installed. Please install with: pip install ollama"
+        )
+    key = (id(asyncio.get_running_loop()), host)
+    client = _async_ollama_clients.get(key)
+    if client is None:
+        client = ollama.AsyncClient(host=host, **_httpx_pool_kwargs())
+        _async_ollama_clients[key] = client
+    return client
+
+
+async def close_async_clients() -> None:
+    """Close the pooled async clients bound to the running event loop."""
+
+    loop_id = id(asyncio.get_running_loop())
+    entry = _aiohttp_sessions.pop(loop_id, None)
+    if entry is not None and not entry[1].closed:
+        await entry[1].close()
+    for key in [key for key in _async_ollama_clients if key[0] == loop_id]:
+        client = _async_ollama_clients.pop(key)
+        await client.close()
+
+
+def _httpx_pool_kwargs() -> Dict[str, Any]:
+    if httpx is None:
+        return {}
+    return {
+        "limits": httpx.Limits(
+            max_connections=_pool_options["limit"],
+            max_keepalive_connections=_pool_options["limit_per_host"],
+            keepalive_expiry=_pool_options["keepalive_timeout"],
+        )
+    }
@@ -0,0 +1,241 @@
+"""Adaptive (AIMD) concurrency control for outbound LLM requests."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional
+
+import aiohttp
+
+# httpx backs the Ollama client; its timeouts do not derive from TimeoutError
+try:
+    import httpx
+
+    _TRANSIENT_ERRORS: tuple = (
+        asyncio.TimeoutError,
+        aiohttp.ServerDisconnectedError,
+        httpx.TimeoutException,
+        httpx.RemoteProtocolError,
+    )
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+    _TRANSIENT_ERRORS = (asyncio.TimeoutError, aiohttp.ServerDisconnectedError)
+
+# Outcomes reported back to the limiter when a slot is released.
+OUTCOME_OK = "ok"
+OUTCOME_OVERLOAD = "overload"
+OUTCOME_ERROR = "error"
+
+_OVERLOAD_STATUSES = {408, 429}
+
+
+def iter_exception_chain(exc: BaseException):
+    """Yield *exc* and every exception it was raised from."""
+
+    seen = set()
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
+
+
+def get_status_code(exc: BaseException) -> Optional[int]:
+    """Return the HTTP status carried by *exc* (aiohttp, requests or Ollama)."""
+
+    for err in iter_exception_chain(exc):
+        status = getattr(err, "status", None)
+        if status is None:
+            status = getattr(err, "status_code", None)
+        if status is None:
+            status = getattr(getattr(err, "response", None), "status_code", None)
+        if isinstance(status, int) and status > 0:
+            return status
+    return None
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """Return ``True`` when *exc* signals that the backend is overloaded.
+
+    Timeouts, dropped connections, ``429`` and ``5xx`` responses count as
+    overload; everything else (bad requests, parse errors) does not.
+    """
+
+    for err in iter_exception_chain(exc):
+        if isinstance(err, _TRANSIENT_ERRORS):
+            return True
+    status = get_status_code(exc)
+    if status is None:
+        return False
+    return status in _OVERLOAD_STATUSES or status >= 500
+
+
+class _Slot:
+    """Book-keeping for one in-flight request."""
+
+    __slots__ = ("started", "epoch")
+
+    def __init__(self, started: float, epoch: int):
+        self.started = started
+        self.epoch = epoch
+
+    def restart(self) -> None:
+        """Measure latency from now, e.g. after waiting out a rate limit."""
+
+        self.started = time.monotonic()
+
+
+class AdaptiveConcurrencyLimiter:
+    """Additive-increase / multiplicative-decrease limiter for LLM calls.
+
+    The limit grows by roughly one slot per window of healthy completions
+    (fast and error-free) and is multiplied by ``backoff_ratio`` whenever the
+    backend signals overload (429/5xx/timeouts) or the recent error rate
+    exceeds ``max_error_rate``. Requests started before a decrease cannot
+    trigger another one, so a burst of failures only backs off once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        target_latency: float = 60.0,
+        backoff_ratio: float = 0.5,
+        error_window: int = 20,
+        max_error_rate: float = 0.2,
+        log: Optional[Callable[[str], Any]] = None,
+    ):
+        if min_limit < 1:
+            raise ValueError("min_limit must be at least 1")
+        if max_limit < min_limit:
+            raise ValueError("max_limit must be greater than or equal to min_limit")
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("backoff_ratio must be between 0 and 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff_ratio = backoff_ratio
+        self.max_error_rate = max_error_rate
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._epoch = 0
+        self._outcomes: Deque[bool] = deque(maxlen=max(error_window, 1))
+        self._condition: Optional[asyncio.Condition] = None
+        self._log = log
+
+    @classmethod
+    def from_config(
+        cls,
+        options: Optional[Dict[str, Any]],
+        log: Optional[Callable[[str], Any]] = None,
+    ) -> "AdaptiveConcurrencyLimiter":
+        """Build a limiter from the ``[concurrency]`` table of the config."""
+
+        options = options or {}
+        return cls(
+            initial_limit=int(options.get("initial", 10)),
+            min_limit=int(options.get("min", 1)),
+            max_limit=int(options.get("max", 64)),
+            target_latency=float(options.get("target_latency", 60.0)),
+            backoff_ratio=float(options.get("backoff_ratio", 0.5)),
+            error_window=int(options.get("error_window", 20)),
+            max_error_rate=float(options.get("max_error_rate", 0.2)),
+            log=log,
+        )
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently holding a slot."""
+
+        return self._in_flight
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self) -> _Slot:
+        """Wait until a slot is free and claim it."""
+
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+            return _Slot(time.monotonic(), self._epoch)
+
+    async def release(self, slot: _Slot, outcome: Optional[str] = OUTCOME_OK) -> None:
+        """Return *slot* and adapt the limit based on the request *outcome*.
+
+        ``None`` releases the slot without feeding the controller, which is
+        used for cancelled requests.
+        """
+
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            if outcome is not None:
+                self._on_outcome(slot, outcome, time.monotonic() - slot.started)
+            condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[_Slot]:
+        """Hold a slot for the duration of the block and classify its outcome."""
+
+        slot = await self.acquire()
+        outcome: Optional[str] = OUTCOME_OK
+        try:
+            yield slot
+        except asyncio.CancelledError:
+            outcome = None
+            raise
+        except BaseException as exc:
+            outcome = OUTCOME_OVERLOAD if is_overload_error(exc) else OUTCOME_ERROR
+            raise
+        finally:
+            await asyncio.shield(self.release(slot, outcome))
+
+    def _on_outcome(self, slot: _Slot, outcome: str, latency: float) -> None:
+        self._outcomes.append(outcome == OUTCOME_OK)
+        error_rate = self._outcomes.count(False) / len(self._outcomes)
+
+        if outcome == OUTCOME_OVERLOAD:
+            self._decrease(slot, "backend overload")
+        elif error_rate > self.max_error_rate and len(self._outcomes) >= 5:
+            self._decrease(slot, f"error rate {error_rate:.0%}")
+        elif outcome == OUTCOME_OK and latency <= self.target_latency:
+            self._increase()
+
+    def _increase(self) -> None:
+        if self._limit >= self.max_limit:
+            return
+        old = self.limit
+        self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+        if self.limit != old:
+            self._report(old, "healthy responses")
+
+    def _decrease(self, slot: _Slot, reason: str) -> None:
+        if slot.epoch < self._epoch:
+            # Started before the last back-off; its failure is already accounted for.
+            return
+        old = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+        self._epoch += 1
+        if self.limit != old:
+            self._report(old, reason)
+
+    def _report(self, old: int, reason: str) -> None:
+        if self._log is not None:
+            self._log(
+                f"🔧 Concurrency limit {old} -> {self.limit} ({reason}, in flight: {self._in_flight})."
+            )
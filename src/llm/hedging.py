@@ -0,0 +1,151 @@
+"""Hedged LLM requests to cut tail latency."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Mapping, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Sliding window of recent request latencies."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Return the *fraction* quantile (``0.95`` for p95), or ``None`` if empty."""
+
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class Hedger:
+    """Send a duplicate request when the first one is slower than usual.
+
+    Once ``min_samples`` latencies have been observed, a request that has not
+    answered after the ``percentile`` latency (but at least ``min_delay``
+    seconds) gets a hedge: a second copy, possibly to another endpoint. The
+    first answer wins and the other request is cancelled. At most
+    ``max_fraction`` of all requests are hedged, which bounds the extra load.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_fraction: float = 0.1,
+        min_samples: int = 20,
+        min_delay: float = 5.0,
+        window: int = 200,
+        log: Optional[Callable[[str], Any]] = None,
+    ):
+        self.percentile = percentile
+        self.max_fraction = max_fraction
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.latencies = LatencyTracker(window)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._log = log
+
+    @classmethod
+    def from_config(
+        cls,
+        options: Optional[Mapping[str, Any]],
+        log: Optional[Callable[[str], Any]] = None,
+    ) -> Optional["Hedger"]:
+        """Build a hedger from the ``[hedging]`` table; ``None`` when disabled."""
+
+        options = options or {}
+        if not options.get("enabled", False):
+            return None
+        return cls(
+            percentile=float(options.get("percentile", 0.95)),
+            max_fraction=float(options.get("max_fraction", 0.1)),
+            min_samples=int(options.get("min_samples", 20)),
+            min_delay=float(options.get("min_delay", 5.0)),
+            log=log,
+        )
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or ``None`` if hedging is not allowed."""
+
+        if len(self.latencies) < self.min_samples:
+            return None
+        if self.hedged + 1 > self.max_fraction * max(self.requests, 1):
+            return None
+        threshold = self.latencies.percentile(self.percentile)
+        return max(threshold or 0.0, self.min_delay)
+
+    async def run(
+        self,
+        primary: Callable[[], Awaitable[T]],
+        hedge: Optional[Callable[[], Awaitable[T]]] = None,
+    ) -> T:
+        """Await ``primary()``, racing it against ``hedge()`` when it is slow.
+
+        *hedge* defaults to *primary*, i.e. the same request is sent again.
+        """
+
+        hedge = hedge or primary
+        self.requests += 1
+        started = time.monotonic()
+        first = asyncio.ensure_future(primary())
+        tasks = [first]
+        try:
+            delay = self.hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                # The budget may have been used up while we were waiting.
+                if not done and self.hedge_delay() is not None:
+                    self.hedged += 1
+                    if self._log is not None:
+                        self._log(f"🪂 No answer after {delay:.1f}s, sending a hedged request.")
+                    tasks.append(asyncio.ensure_future(hedge()))
+
+            result = await self._first_success(tasks)
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                # Unlike awaiting the losers, wait() raises CancelledError only
+                # when this task is cancelled, which must reach the caller.
+                await asyncio.wait(losers)
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    task.exception()  # mark a losing failure as retrieved
+
+        self.latencies.record(time.monotonic() - started)
+        return result
+
+    async def _first_success(self, tasks) -> Any:
+        pending = set(tasks)
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.cancelled():
+                    continue
+                if task.exception() is None:
+                    if task is not tasks[0]:
+                        self.hedge_wins += 1
+                    return task.result()
+                if first_error is None:
+                    first_error = task.exception()
+        raise first_error or asyncio.CancelledError()
@@ -0,0 +1,116 @@
+"""Coalesce small translation segments into packed multi-segment requests."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+from src.llm.tokens import count_tokens
+
+# Sends one packed request and returns one result per text, ``None`` for the
+# texts that must be retried individually.
+SendBatch = Callable[[str, List[str]], Awaitable[List[Optional[str]]]]
+
+
+class _Batch:
+    __slots__ = ("items", "tokens", "timer")
+
+    def __init__(self) -> None:
+        self.items: List[Tuple[str, "asyncio.Future[Optional[str]]"]] = []
+        self.tokens = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class RequestPacker:
+    """Group segments submitted around the same time into one request.
+
+    Segments are grouped by *key* (the system prompt) because only requests
+    sharing instructions can be packed. A group is sent when it reaches
+    ``max_items`` segments or ``max_tokens`` source tokens, or ``window``
+    seconds after its first segment arrived, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        send_batch: SendBatch,
+        max_items: int = 8,
+        max_tokens: int = 1200,
+        window: float = 0.2,
+    ):
+        self._send_batch = send_batch
+        self.max_items = max(1, max_items)
+        self.max_tokens = max_tokens
+        self.window = window
+        self._pending: Dict[str, _Batch] = {}
+        self._tasks: set = set()
+        self.items = 0
+        self.requests = 0
+        self.fallbacks = 0
+
+    @classmethod
+    def from_config(
+        cls, send_batch: SendBatch, options: Optional[Mapping[str, Any]]
+    ) -> "RequestPacker":
+        """Build a packer from the ``[packing]`` config table."""
+
+        options = options or {}
+        return cls(
+            send_batch,
+            max_items=int(options.get("max_items", 8)),
+            max_tokens=int(options.get("max_tokens", 1200)),
+            window=float(options.get("window", 0.2)),
+        )
+
+    async def submit(self, key: str, text: str) -> Optional[str]:
+        """Queue *text* for packing and wait for its result.
+
+        Returns ``None`` when the packed answer did not contain this segment;
+        the caller should then translate it on its own.
+        """
+
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Optional[str]]" = loop.create_future()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _Batch()
+        batch.items.append((text, future))
+        batch.tokens += count_tokens(text)
+
+        if len(batch.items) >= self.max_items or batch.tokens >= self.max_tokens:
+            self._flush(key)
+        elif batch.timer is None:
+            batch.timer = loop.call_later(self.window, self._flush, key)
+        return await future
+
+    def _flush(self, key: str) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._run(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: str, batch: _Batch) -> None:
+        texts = [text for text, _ in batch.items]
+        if len(texts) == 1:
+            # Nothing to pack with; the caller sends it as a normal request.
+            _, future = batch.items[0]
+            if not future.done():
+                future.set_result(None)
+            return
+
+        self.requests += 1
+        try:
+            results = list(await self._send_batch(key, texts))
+        except Exception:
+            results = []
+        results += [None] * (len(texts) - len(results))
+        for (_, future), result in zip(batch.items, results):
+            if result is None:
+                self.fallbacks += 1
+            else:
+                self.items += 1
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,251 @@
+"""Per-endpoint request and token budgeting for quota-limited LLM APIs."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse ``x-ratelimit-reset-*`` style durations into seconds.
+
+    Accepts plain numbers (``"12"``, ``"0.5"``) as well as Go-style
+    durations such as ``"6m0s"``, ``"1.5s"`` or ``"20ms"``.
+    """
+
+    if value is None:
+        return None
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART_RE.findall(value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Return the server-requested back-off in seconds, if any."""
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(float(retry_after_ms) / 1000.0, 0.0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    seconds = parse_duration(retry_after)
+    if seconds is not None:
+        return seconds
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``capacity`` per ``period``."""
+
+    def __init__(
+        self,
+        capacity: float,
+        period: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = float(capacity)
+        self.refill_rate = self.capacity / period
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available (may be negative after reconciliation)."""
+
+        self._refill()
+        return self._tokens
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until *amount* tokens are available (capped at capacity)."""
+
+        self._refill()
+        needed = min(amount, self.capacity) - self._tokens
+        return max(needed / self.refill_rate, 0.0)
+
+    def consume(self, amount: float) -> None:
+        """Take *amount* tokens; callers check :meth:`time_until` first."""
+
+        self._refill()
+        self._tokens -= amount
+
+    def refund(self, amount: float) -> None:
+        """Give back tokens that were over-estimated."""
+
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    def clamp(self, remaining: float) -> None:
+        """Never assume more headroom than the server reports."""
+
+        self._refill()
+        self._tokens = min(self._tokens, remaining)
+
+
+class EndpointRateLimiter:
+    """Budget requests and tokens per minute for a single endpoint.
+
+    Both budgets are token buckets. Callers reserve an estimate of prompt plus
+    completion tokens before sending and reconcile it with the ``usage`` the
+    server reports. ``Retry-After`` and ``x-ratelimit-*`` headers pause or
+    shrink the budget so that the next request waits instead of tripping 429.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        log: Optional[Callable[[str], Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        self.requests = (
+            TokenBucket(requests_per_minute, clock=clock)
+            if requests_per_minute
+            else None
+        )
+        self.tokens = (
+            TokenBucket(tokens_per_minute, clock=clock) if tokens_per_minute else None
+        )
+        self._blocked_until = 0.0
+        self._log = log
+
+    def delay_for(self, tokens: int) -> float:
+        """Seconds to wait before a request of *tokens* may be sent."""
+
+        wait = self._blocked_until - self._clock()
+        if self.requests is not None:
+            wait = max(wait, self.requests.time_until(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.time_until(tokens))
+        return max(wait, 0.0)
+
+    async def acquire(self, tokens: int) -> None:
+        """Reserve budget for a request of *tokens* and wait until it is due.
+
+        The reservation is taken before sleeping, so later callers wait behind
+        it in FIFO order and large requests are not starved. No lock is held:
+        the limiter is shared by agents running on different event loops.
+        Pauses that start while waiting (``Retry-After``) are honoured too.
+        """
+
+        wait = self.delay_for(tokens)
+        if self.requests is not None:
+            self.requests.consume(1)
+        if self.tokens is not None:
+            self.tokens.consume(tokens)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self._blocked_until - self._clock()
+
+    def reconcile(self, estimated: int, actual: Optional[int]) -> None:
+        """Correct the token reservation once the real usage is known."""
+
+        if self.tokens is None or actual is None:
+            return
+        difference = estimated - actual
+        if difference > 0:
+            self.tokens.refund(difference)
+        elif difference < 0:
+            self.tokens.consume(-difference)
+
+    def block_for(self, seconds: float, reason: str = "") -> None:
+        """Pause all requests to this endpoint for *seconds*."""
+
+        until = self._clock() + seconds
+        if until > self._blocked_until:
+            self._blocked_until = until
+            if self._log is not None and seconds >= 1:
+                suffix = f" ({reason})" if reason else ""
+                self._log(f"⏸️ Rate limited{suffix}, pausing for {seconds:.1f}s.")
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Apply ``Retry-After`` and ``x-ratelimit-*`` response headers."""
+
+        headers = {k.lower(): v for k, v in headers.items()}
+
+        retry_after = parse_retry_after(headers)
+        if retry_after is not None:
+            self.block_for(retry_after, "Retry-After")
+
+        for kind in ("requests", "tokens"):
+            bucket = self.requests if kind == "requests" else self.tokens
+            remaining = _parse_number(headers.get(f"x-ratelimit-remaining-{kind}"))
+            if remaining is None:
+                continue
+            if bucket is None:
+                limit = _parse_number(headers.get(f"x-ratelimit-limit-{kind}"))
+                if not limit:
+                    continue
+                # Adopt the quota advertised by the server.
+                bucket = TokenBucket(limit, clock=self._clock)
+                if kind == "requests":
+                    self.requests = bucket
+                else:
+                    self.tokens = bucket
+            bucket.clamp(remaining)
+            if remaining <= 0:
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                if reset:
+                    self.block_for(reset, f"{kind} quota exhausted")
+
+
+def _parse_number(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+_RATE_LIMITERS: Dict[str, EndpointRateLimiter] = {}
+
+
+def get_rate_limiter(
+    base_url: Optional[str],
+    requests_per_minute: float = 0,
+    tokens_per_minute: float = 0,
+    log: Optional[Callable[[str], Any]] = None,
+) -> EndpointRateLimiter:
+    """Return the limiter shared by every agent talking to *base_url*."""
+
+    key = base_url or ""
+    limiter = _RATE_LIMITERS.get(key)
+    if limiter is None:
+        limiter = EndpointRateLimiter(requests_per_minute, tokens_per_minute, log=log)
+        _RATE_LIMITERS[key] = limiter
+    return limiter
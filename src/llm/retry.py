@@ -0,0 +1,285 @@
+"""Retry policy, error classification and circuit breaking for LLM calls."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import aiohttp
+
+from src.llm.concurrency import get_status_code, iter_exception_chain
+from src.llm.rate_limit import parse_retry_after
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx ships with ollama
+    httpx = None
+
+T = TypeVar("T")
+
+# 4xx statuses that may succeed when sent again; every other 4xx (bad
+# request, context too long, auth) fails the same way on each attempt.
+RETRYABLE_STATUSES = frozenset({408, 409, 425, 429})
+
+_TIMEOUT_ERRORS: Tuple[Type[BaseException], ...] = (asyncio.TimeoutError, TimeoutError)
+_CONNECTION_ERRORS: Tuple[Type[BaseException], ...] = (
+    aiohttp.ClientConnectionError,
+    ConnectionError,
+)
+if httpx is not None:
+    _TIMEOUT_ERRORS += (httpx.TimeoutException,)
+    _CONNECTION_ERRORS += (httpx.TransportError,)
+
+# Called before sleeping: ``(attempt, reason, delay, error)``.
+OnRetry = Callable[[int, str, float, BaseException], Any]
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Raised without contacting the backend while its circuit is open."""
+
+
+def classify_error(exc: BaseException) -> Tuple[bool, str]:
+    """Return ``(retryable, reason)`` for an exception raised by an LLM call."""
+
+    if isinstance(exc, CircuitOpenError):
+        return False, "circuit open"
+    status = get_status_code(exc)
+    if status is not None:
+        return status >= 500 or status in RETRYABLE_STATUSES, f"HTTP {status}"
+    for err in iter_exception_chain(exc):
+        if isinstance(err, _TIMEOUT_ERRORS):
+            return True, "timeout"
+        if isinstance(err, _CONNECTION_ERRORS):
+            return True, "connection"
+    return True, type(exc).__name__
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    for err in iter_exception_chain(exc):
+        headers = getattr(err, "headers", None)
+        if headers is None:
+            headers = getattr(getattr(err, "response", None), "headers", None)
+        if headers:
+            return parse_retry_after(headers)
+    return None
+
+
+class RetryPolicy:
+    """Retry transient failures with capped exponential backoff and full jitter.
+
+    Attempt ``n`` sleeps a random time between 0 and
+    ``min(max_delay, base_delay * 2 ** (n - 1))`` seconds, or longer if the
+    server sent ``Retry-After``. Errors that :func:`classify_error` marks as
+    permanent are raised immediately, as is anything outside ``retry_on``.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        retry_on: Tuple[Type[BaseException], ...] = (
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ),
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+
+    @classmethod
+    def from_config(cls, options: Optional[Mapping[str, Any]]) -> "RetryPolicy":
+        """Build a policy from the ``[retry]`` config table."""
+
+        options = options or {}
+        return cls(
+            max_attempts=int(options.get("max_attempts", 3)),
+            base_delay=float(options.get("base_delay", 1.0)),
+            max_delay=float(options.get("max_delay", 30.0)),
+        )
+
+    def delay(self, attempt: int, exc: Optional[BaseException] = None) -> float:
+        """Seconds to wait after the failed *attempt* (counted from 1)."""
+
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(0, cap)
+        retry_after = _retry_after(exc) if exc is not None else None
+        return max(delay, retry_after or 0.0)
+
+    def _next_delay(
+        self,
+        attempt: int,
+        exc: BaseException,
+        on_retry: Optional[OnRetry],
+    ) -> float:
+        retryable, reason = classify_error(exc)
+        if not retryable or attempt >= self.max_attempts:
+            raise exc
+        delay = self.delay(attempt, exc)
+        if on_retry is not None:
+            on_retry(attempt, reason, delay, exc)
+        return delay
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        on_retry: Optional[OnRetry] = None,
+        retry_on: Optional[Tuple[Type[BaseException], ...]] = None,
+    ) -> T:
+        """Await ``call()`` until it succeeds or the policy gives up.
+
+        The last error is re-raised when giving up.
+        """
+
+        retry_on = retry_on or self.retry_on
+        attempt = 1
+        while True:
+            try:
+                return await call()
+            except retry_on as e:
+                delay = self._next_delay(attempt, e, on_retry)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def run_sync(
+        self,
+        call: Callable[[], T],
+        on_retry: Optional[OnRetry] = None,
+        retry_on: Optional[Tuple[Type[BaseException], ...]] = None,
+    ) -> T:
+        """Blocking counterpart of :meth:`run`."""
+
+        retry_on = retry_on or self.retry_on
+        attempt = 1
+        while True:
+            try:
+                return call()
+            except retry_on as e:
+                delay = self._next_delay(attempt, e, on_retry)
+            time.sleep(delay)
+            attempt += 1
+
+
+class RetryLog:
+    """Retries and final failures per segment, for the end-of-run report."""
+
+    def __init__(self) -> None:
+        self.segments: Dict[str, List[str]] = {}
+        self.reasons: Counter = Counter()
+        self.failures: Dict[str, str] = {}
+
+    def record(self, segment: str, reason: str) -> None:
+        self.segments.setdefault(segment, []).append(reason)
+        self.reasons[reason] += 1
+
+    def fail(self, segment: str, exc: BaseException) -> None:
+        self.failures[segment] = classify_error(exc)[1]
+
+    @property
+    def retries(self) -> int:
+        return sum(self.reasons.values())
+
+    def summary(self) -> str:
+        reasons = ", ".join(f"{reason}: {n}" for reason, n in self.reasons.most_common())
+        text = f"{self.retries} retries over {len(self.segments)} segments"
+        if reasons:
+            text += f" ({reasons})"
+        if self.failures:
+            text += f", {len(self.failures)} segments failed"
+        return text
+
+
+class CircuitBreaker:
+    """Stop sending requests to an endpoint that keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail fast for ``reset_timeout`` seconds. Then a single probe is
+    let through (half-open): success closes the circuit, failure opens it
+    again for twice as long, up to ``max_reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_reset_timeout: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opens = 0
+        self._open_until: Optional[float] = None
+        self._probe_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._open_until is None:
+            return "closed"
+        if self._clock() < self._open_until:
+            return "open"
+        return "half_open"
+
+    def retry_in(self) -> float:
+        """Seconds until the circuit lets a probe through."""
+
+        if self._open_until is None:
+            return 0.0
+        return max(self._open_until - self._clock(), 0.0)
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open":
+            return False
+        # A probe that never reported back (e.g. cancelled) expires.
+        return (
+            self._probe_started is None
+            or self._clock() - self._probe_started > self.reset_timeout
+        )
+
+    def on_request(self) -> None:
+        if self.state == "half_open":
+            self._probe_started = self._clock()
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opens = 0
+        self._open_until = None
+        self._probe_started = None
+
+    def record_failure(self) -> bool:
+        """Count a failure; return ``True`` if it opened the circuit."""
+
+        state = self.state
+        if state == "open":
+            return False  # a request sent before the circuit opened
+        self._failures += 1
+        if state == "closed" and self._failures < self.failure_threshold:
+            return False
+        timeout = min(self.reset_timeout * 2**self._opens, self.max_reset_timeout)
+        self._opens += 1
+        self._failures = 0
+        self._open_until = self._clock() + timeout
+        self._probe_started = None
+        return True
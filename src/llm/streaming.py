@@ -0,0 +1,111 @@
+"""Helpers for consuming streamed (SSE / NDJSON) LLM responses."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Optional, Tuple
+
+
+async def iter_sse_events(lines: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """Decode Server-Sent Events from an OpenAI-compatible streaming body.
+
+    *lines* is typically ``response.content`` of an aiohttp response. Each
+    event's ``data:`` lines are joined and parsed as JSON; the stream stops at
+    the ``[DONE]`` sentinel.
+    """
+
+    data_lines = []
+    async for raw_line in lines:
+        line = raw_line.decode("utf-8").rstrip("\r\n")
+        if line.startswith(":"):
+            continue  # SSE comment / keep-alive
+        if line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+            continue
+        if line or not data_lines:
+            continue  # other SSE fields (event:, id:) are not used here
+        data = "\n".join(data_lines)
+        data_lines = []
+        if data == "[DONE]":
+            return
+        yield json.loads(data)
+
+    if data_lines:
+        data = "\n".join(data_lines)
+        if data != "[DONE]":
+            yield json.loads(data)
+
+
+def openai_delta_text(chunk: Any) -> str:
+    """Extract the incremental text of an OpenAI ``chat.completion.chunk``."""
+
+    choices = chunk.get("choices") or []
+    if not choices:
+        return ""
+    delta = choices[0].get("delta") or {}
+    return delta.get("content") or ""
+
+
+def ollama_delta_text(chunk: Any) -> str:
+    """Extract the incremental text of an Ollama streaming chat response."""
+
+    message = chunk.get("message")
+    if not message:
+        return ""
+    return message.get("content") or ""
+
+
+async def collect_stream(
+    chunks: AsyncIterable[Any],
+    extract_text: Callable[[Any], str],
+    first_token_timeout: float,
+    idle_timeout: float,
+) -> Tuple[str, Optional[Any]]:
+    """Accumulate streamed text, timing out on inactivity rather than duration.
+
+    The first non-empty token must arrive within ``first_token_timeout``
+    seconds of the call; afterwards every gap between chunks may last at most
+    ``idle_timeout`` seconds. A long answer that keeps producing tokens is
+    therefore never cut off.
+
+    Returns
+    -------
+    tuple
+        The concatenated text and the final usage chunk: the last chunk with
+        a ``usage`` entry (sent by OpenAI-compatible backends when asked with
+        ``stream_options.include_usage``), otherwise the last chunk received,
+        which is where Ollama puts its token counts.
+    """
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    iterator = chunks.__aiter__()
+    parts = []
+    last_chunk = None
+    usage_chunk = None
+    received_token = False
+
+    while True:
+        if received_token:
+            timeout = idle_timeout
+            reason = f"No new tokens within {idle_timeout:.0f}s"
+        else:
+            timeout = max(first_token_timeout - (loop.time() - started), 0.0)
+            reason = f"No first token within {first_token_timeout:.0f}s"
+        try:
+            chunk = await asyncio.wait_for(iterator.__anext__(), timeout)
+        except StopAsyncIteration:
+            break
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(reason) from None
+
+        last_chunk = chunk
+        if chunk.get("usage"):
+            usage_chunk = chunk
+        text = extract_text(chunk)
+        if text:
+            parts.append(text)
+            received_token = True
+
+    return "".join(parts), usage_chunk or last_chunk
@@ -0,0 +1,59 @@
+"""Token counting helpers shared by request budgeting code."""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio used when the BPE tables are unavailable
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _get_encoding() -> Optional[Any]:
+    """Load the tokenizer once; it matches the one used to size sections.
+
+    ``tiktoken`` downloads its BPE tables on first use, so offline machines
+    fall back to a character-based estimate instead of failing the run.
+    """
+
+    try:
+        return tiktoken.encoding_for_model("gpt-4")
+    except Exception as e:
+        logger.warning("tiktoken encoding unavailable, estimating tokens by length: %s", e)
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Return the number of ``gpt-4`` tokens in *text*.
+
+    The count is an estimate for non-OpenAI backends, which is good enough
+    for budgeting requests and prompt sizes.
+    """
+
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return max(1, len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def cached_prompt_tokens(usage: Mapping[str, Any]) -> Optional[int]:
+    """Return the prompt tokens served from the provider's prefix cache.
+
+    OpenAI and vLLM report ``prompt_tokens_details.cached_tokens``; DeepSeek
+    reports ``prompt_cache_hit_tokens``. ``None`` when the backend says
+    nothing about caching.
+    """
+
+    details = usage.get("prompt_tokens_details") or {}
+    cached = details.get("cached_tokens")
+    if cached is None:
+        cached = usage.get("prompt_cache_hit_tokens")
+    return int(cached) if cached is not None else None
@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+
+from src.agents.tool_agents.translator_agent import TranslatorAgent
+from src.llm.balancer import Endpoint, EndpointBalancer, get_balancer
+from src.llm.retry import CircuitBreaker, CircuitOpenError
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _StatusError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+def test_routes_to_fewest_outstanding_by_weight():
+    heavy = Endpoint("http://a/v1/chat/completions", weight=2)
+    light = Endpoint("http://b/v1/chat/completions")
+    balancer = EndpointBalancer([heavy, light])
+
+    picks = [balancer.acquire() for _ in range(6)]
+    assert picks.count(heavy) == 4
+    assert picks.count(light) == 2
+
+    balancer.release(heavy)
+    balancer.release(heavy)
+    assert balancer.choose() is heavy
+
+
+def test_ewma_prefers_faster_endpoint():
+    fast = Endpoint("http://fast")
+    slow = Endpoint("http://slow")
+    balancer = EndpointBalancer([slow, fast], strategy="ewma")
+    balancer.record(slow, 4.0)
+    balancer.record(fast, 1.0)
+    assert balancer.choose() is fast
+    fast.outstanding = 5
+    assert balancer.choose() is slow
+
+
+def test_failing_endpoint_is_ejected_and_returns():
+    clock = _Clock()
+    bad = Endpoint("http://bad", breaker=CircuitBreaker(2, 10.0, clock=clock))
+    good = Endpoint("http://good")
+    balancer = EndpointBalancer([bad, good])
+    good.outstanding = 3  # would otherwise lose to the idle endpoint
+
+    balancer.record(bad, 1.0, asyncio.TimeoutError())
+    assert balancer.choose() is bad
+    balancer.record(bad, 1.0, _StatusError(503))
+    assert balancer.choose() is good
+
+    clock.now = 11.0
+    assert balancer.choose() is bad
+
+
+def test_client_errors_do_not_eject():
+    bad = Endpoint("http://bad", breaker=CircuitBreaker(1))
+    balancer = EndpointBalancer([bad, Endpoint("http://good")])
+    balancer.record(bad, 1.0, _StatusError(429))
+    balancer.record(bad, 1.0, _StatusError(400))
+    assert bad.breaker.state == "closed"
+
+
+def test_all_ejected_fails_fast():
+    endpoint = Endpoint("http://only", breaker=CircuitBreaker(1))
+    balancer = EndpointBalancer([endpoint])
+    balancer.record(endpoint, 1.0, asyncio.TimeoutError())
+    with pytest.raises(CircuitOpenError):
+        balancer.acquire()
+
+
+def test_track_records_outcome_and_skips_cancellation():
+    endpoint = Endpoint("http://a", breaker=CircuitBreaker(1))
+    balancer = EndpointBalancer([endpoint, Endpoint("http://b")])
+
+    with pytest.raises(asyncio.CancelledError):
+        with balancer.track(endpoint):
+            raise asyncio.CancelledError()
+    assert endpoint.breaker.state == "closed"
+
+    with pytest.raises(asyncio.TimeoutError):
+        with balancer.track(endpoint):
+            raise asyncio.TimeoutError()
+    assert endpoint.breaker.state == "open"
+
+
+def test_get_balancer_builds_endpoints_from_config():
+    config = {
+        "model": "m",
+        "api_key": "k",
+        "base_url": "http://unused/v1/chat/completions",
+        "endpoints": [
+            {"base_url": "http://gpu1:11434", "weight": 2},
+            {"base_url": "http://gpu2/v1/chat/completions", "model": "other"},
+        ],
+    }
+    balancer = get_balancer(config)
+    assert get_balancer(dict(config)) is balancer
+    first, second = balancer.endpoints
+    assert (first.model, first.api_key, first.weight) == ("m", "k", 2.0)
+    assert first.use_ollama and not second.use_ollama
+    assert second.model == "other"
+    assert first.rate_limiter is not second.rate_limiter
+
+    single = get_balancer({"base_url": "http://localhost:11434"})
+    (endpoint,) = single.endpoints
+    assert endpoint.use_ollama and endpoint.ollama_host == "http://localhost:11434"
+
+
+def test_shared_balancer_is_reusable_across_event_loops():
+    config = {"base_url": "http://loops.invalid/v1/chat/completions", "requests_per_minute": 600}
+
+    async def send(n):
+        balancer = get_balancer(config)
+        endpoint = balancer.acquire()
+        try:
+            # Retry-After from an earlier response makes the requests contend
+            endpoint.rate_limiter.block_for(0.02)
+            await asyncio.gather(*(endpoint.rate_limiter.acquire(10) for _ in range(n)))
+        finally:
+            balancer.release(endpoint)
+        return balancer
+
+    first = asyncio.run(send(3))
+    assert asyncio.run(send(3)) is first
+
+
+def test_queued_requests_are_not_assigned_to_endpoints(tmp_path):
+    config = {
+        "llm_config": {
+            "model": "test",
+            "base_url": "http://queued.invalid/v1/chat/completions",
+        },
+        "concurrency": {"initial": 2, "max": 2},
+        "cache": {"enabled": False},
+    }
+    agent = TranslatorAgent(config, project_dir=".", output_dir=str(tmp_path))
+    (endpoint,) = agent.balancer.endpoints
+    seen = []
+
+    async def send(system_prompt, user_content, endpoint, *args):
+        seen.append(endpoint.outstanding)
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    agent._send_llm_request = send
+
+    async def run():
+        await asyncio.gather(*(agent._make_llm_request("s", "u") for _ in range(10)))
+
+    asyncio.run(run())
+    assert max(seen) <= 2
+    assert endpoint.outstanding == 0
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+
+from src.agents.batch_executor import BatchExecutor, BatchJob
+from src.formats.latex.manifest import ProjectManifest
+from src.formats.latex.parser import LatexParser
+
+
+class _Executor(BatchExecutor):
+    """Stages that only sleep and record when they ran."""
+
+    def __init__(self, config, durations, fail=()):
+        super().__init__(config, projects_dir=".", output_dir=".", log=lambda msg: None)
+        self.durations = durations
+        self.fail = set(fail)
+        self.events = []
+
+    async def _stage(self, stage, job):
+        self.events.append((job.name, stage, "start"))
+        await asyncio.sleep(self.durations[stage])
+        if (job.name, stage) in self.fail:
+            raise RuntimeError("boom")
+        self.events.append((job.name, stage, "end"))
+
+    async def _parse(self, job):
+        await self._stage("parse", job)
+
+    async def _translate(self, job):
+        await self._stage("translate", job)
+
+    async def _validate(self, job):
+        await self._stage("validate", job)
+
+    async def _compile(self, job):
+        await self._stage("compile", job)
+        job.succeeded = True
+
+
+def _jobs(*names):
+    return [BatchJob(name, project_dir=name) for name in names]
+
+
+def test_next_paper_translates_while_previous_compiles():
+    executor = _Executor(
+        {"batch": {"translate_workers": 1, "compile_workers": 1}},
+        {"parse": 0.0, "translate": 0.05, "validate": 0.0, "compile": 0.05},
+    )
+    report = asyncio.run(executor.run_async(_jobs("a", "b")))
+
+    events = executor.events
+    a_compile = events.index(("a", "compile", "start"))
+    b_translate_end = events.index(("b", "translate", "end"))
+    assert a_compile < b_translate_end < events.index(("a", "compile", "end"))
+    assert report.succeeded == ["a", "b"]
+    assert report.papers_per_hour > 0
+    assert report.stage_time["translate"] >= 0.1
+
+
+def test_failed_stage_drops_only_that_paper():
+    executor = _Executor(
+        {},
+        {"parse": 0.0, "translate": 0.0, "validate": 0.0, "compile": 0.0},
+        fail={("a", "translate")},
+    )
+    report = asyncio.run(executor.run_async(_jobs("a", "b")))
+
+    assert report.succeeded == ["b"]
+    assert report.failed == {"a": "translate failed: boom"}
+    assert ("a", "validate", "start") not in executor.events
+    assert "1/2 papers" in report.summary()
+
+
+def test_parse_stage_runs_blocking_work_off_the_event_loop(tmp_path, monkeypatch):
+    project = tmp_path / "paper"
+    project.mkdir()
+    (project / "main.tex").write_text(
+        "\\documentclass{article}\n\\begin{document}\n\\section{Intro}\nText.\n\\end{document}\n"
+    )
+    threads = {}
+    build = ProjectManifest.build
+
+    def record_build(project_dir):
+        threads["build"] = threading.current_thread()
+        return build(project_dir)
+
+    # The real parse needs the tiktoken encoding download
+    monkeypatch.setattr(ProjectManifest, "build", staticmethod(record_build))
+    monkeypatch.setattr(
+        LatexParser, "parse", lambda self: threads.setdefault("parse", threading.current_thread())
+    )
+
+    config = {
+        "source_language": "en",
+        "target_language": "de",
+        "llm_config": {"model": "test", "base_url": "http://example.invalid/v1"},
+        "cache": {"enabled": False},
+    }
+    executor = BatchExecutor(
+        config, projects_dir=".", output_dir=str(tmp_path / "out"), log=lambda msg: None
+    )
+    job = BatchJob("paper", project_dir=str(project))
+    asyncio.run(executor._parse(job))
+
+    assert set(threads) == {"parse", "build"}
+    assert threading.main_thread() not in threads.values()
+    assert job.coordinator.loop is None
@@ -0,0 +1,94 @@
+import asyncio
+from pathlib import Path
+
+from src.agents.tool_agents.translator_agent import TranslatorAgent
+from src.llm.cache import TranslationCache, make_cache_key
+
+
+def test_cache_key_depends_on_every_input():
+    base = make_cache_key("m", "prompt", "text", {"a": "b"})
+
+    assert base == make_cache_key("m", "prompt", "text", {"a": "b"})
+    assert base != make_cache_key("other", "prompt", "text", {"a": "b"})
+    assert base != make_cache_key("m", "other", "text", {"a": "b"})
+    assert base != make_cache_key("m", "prompt", "other", {"a": "b"})
+    assert base != make_cache_key("m", "prompt", "text", {"a": "c"})
+
+
+def test_cache_round_trip_persists_across_instances(tmp_path: Path):
+    path = tmp_path / "cache.sqlite"
+    cache = TranslationCache(str(path))
+    assert cache.get("k") is None
+    cache.put("k", "übersetzt")
+    assert cache.get("k") == "übersetzt"
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+    reopened = TranslationCache(str(path))
+    assert reopened.get("k") == "übersetzt"
+    assert reopened.total_bytes == len("übersetzt".encode("utf-8"))
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path: Path):
+    cache = TranslationCache(str(tmp_path / "cache.sqlite"), max_bytes=100)
+    cache.put("old", "x" * 40)
+    cache.put("recent", "y" * 40)
+    cache.get("old")  # refresh "old" so "recent" becomes the eviction candidate
+    cache.put("new", "z" * 40)
+
+    assert cache.get("recent") is None
+    assert cache.get("old") == "x" * 40
+    assert cache.get("new") == "z" * 40
+    assert cache.total_bytes <= 100
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_delete_removes_entry_and_its_size(tmp_path: Path):
+    cache = TranslationCache(str(tmp_path / "cache.sqlite"))
+    cache.put("k", "x" * 10)
+    cache.delete("k")
+    cache.delete("missing")
+    assert cache.get("k") is None
+    assert cache.total_bytes == 0
+
+
+def _translator(tmp_path: Path, models):
+    config = {
+        "llm_config": {
+            "model": "m",
+            "base_url": "http://models.invalid/v1/chat/completions",
+            "endpoints": [
+                {"base_url": f"http://{model}.invalid/v1", "model": model}
+                for model in models
+            ],
+        },
+        "cache": {"enabled": True, "path": str(tmp_path / "cache.sqlite")},
+    }
+    agent = TranslatorAgent(config, project_dir=".", output_dir=str(tmp_path))
+    calls = []
+
+    async def send(system_prompt, user_content, endpoint, *args):
+        calls.append(endpoint.model)
+        return f"\\textbf{{{endpoint.model}}}"
+
+    agent._send_llm_request = send
+    return agent, calls
+
+
+def test_translations_are_cached_under_the_model_that_served_them(tmp_path: Path):
+    def translate(agent):
+        return asyncio.run(
+            agent._request_llm_for_trans("prompt", "\\textbf{x}", "1", "sec", None)
+        )
+
+    agent, calls = _translator(tmp_path, ["other"])
+    assert translate(agent) == "\\textbf{other}"
+
+    # Another model does not get the translation of "other"
+    agent, calls = _translator(tmp_path, ["third"])
+    assert translate(agent) == "\\textbf{third}"
+    assert calls == ["third"]
+
+    agent, calls = _translator(tmp_path, ["third", "other"])
+    assert translate(agent) == "\\textbf{third}"
+    assert calls == []
@@ -0,0 +1,32 @@
+import asyncio
+
+from src.llm.client import (
+    close_async_clients,
+    get_aiohttp_session,
+    get_requests_session,
+)
+
+
+def test_aiohttp_session_is_shared_within_a_loop():
+    async def run():
+        first = get_aiohttp_session()
+        second = get_aiohttp_session()
+        await close_async_clients()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert first.closed
+
+
+def test_each_loop_gets_its_own_session():
+    async def run():
+        session = get_aiohttp_session()
+        await close_async_clients()
+        return session
+
+    assert asyncio.run(run()) is not asyncio.run(run())
+
+
+def test_requests_session_is_process_wide():
+    assert get_requests_session() is get_requests_session()
@@ -0,0 +1,87 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from src.llm.concurrency import AdaptiveConcurrencyLimiter, is_overload_error
+
+
+def _response_error(status: int) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(
+        request_info=None, history=(), status=status, message="boom"
+    )
+
+
+def test_is_overload_error_classifies_statuses_and_timeouts():
+    assert is_overload_error(_response_error(429))
+    assert is_overload_error(_response_error(503))
+    assert is_overload_error(asyncio.TimeoutError())
+    assert not is_overload_error(_response_error(400))
+    assert not is_overload_error(ValueError("bad json"))
+
+
+def test_is_overload_error_follows_exception_chain():
+    try:
+        try:
+            raise _response_error(502)
+        except aiohttp.ClientResponseError as inner:
+            raise aiohttp.ClientError("Ollama request failed") from inner
+    except aiohttp.ClientError as outer:
+        assert is_overload_error(outer)
+
+
+def test_limiter_grows_on_healthy_responses():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1, max_limit=4)
+
+    async def run():
+        for _ in range(20):
+            async with limiter.slot():
+                pass
+
+    asyncio.run(run())
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+
+def test_limiter_backs_off_once_per_burst_of_overload():
+    messages = []
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=8, min_limit=2, max_limit=16, log=messages.append
+    )
+
+    async def failing_call():
+        async with limiter.slot():
+            await asyncio.sleep(0)
+            raise _response_error(429)
+
+    async def run():
+        results = await asyncio.gather(
+            *(failing_call() for _ in range(8)), return_exceptions=True
+        )
+        assert all(isinstance(r, aiohttp.ClientResponseError) for r in results)
+
+    asyncio.run(run())
+    assert limiter.limit == 4
+    assert any("8 -> 4" in message for message in messages)
+
+
+def test_limiter_caps_in_flight_requests():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=3, min_limit=1, max_limit=3)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(10)))
+
+    asyncio.run(run())
+    assert peak == 3
+
+
+def test_limiter_rejects_invalid_bounds():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(min_limit=5, max_limit=2)
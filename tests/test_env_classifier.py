@@ -0,0 +1,31 @@
+from src.formats.latex.env_classifier import classify_env, env_decision_key
+
+
+def test_known_non_prose_envs_are_skipped():
+    assert classify_env("pmatrix", r"\begin{pmatrix}a & b\end{pmatrix}") is False
+    assert classify_env("Verbatim", r"\begin{Verbatim}some words here\end{Verbatim}") is False
+
+
+def test_envs_without_words_are_skipped():
+    assert classify_env("mybox", r"\begin{mybox}\includegraphics{fig.png}\end{mybox}") is False
+    assert classify_env("mybox", r"\begin{mybox}$x^2 + y^2$ <PLACEHOLDER_ENV_3>\end{mybox}") is False
+
+
+def test_plain_prose_is_translated():
+    prose = (
+        r"\begin{mybox}A graph is connected if there is a path between every "
+        r"pair of its vertices.\end{mybox}"
+    )
+    assert classify_env("mybox", prose) is True
+    assert classify_env("theorem", r"\begin{theorem}Let $x$ be a real number.\end{theorem}") is True
+
+
+def test_code_like_content_is_escalated():
+    code = "\\begin{customcode}\nfor i in range(10):\n    print(i)\n\\end{customcode}"
+    assert classify_env("customcode", code) is None
+
+
+def test_decision_key_depends_on_name_and_content():
+    key = env_decision_key("m", "box", "text")
+    assert key != env_decision_key("m", "other", "text")
+    assert key != env_decision_key("m", "box", "text!")
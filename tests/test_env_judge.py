@@ -0,0 +1,92 @@
+import asyncio
+
+import src.formats.latex.prompts as pm
+from src.agents.tool_agents.parser_agent import (
+    ParserAgent,
+    format_env_judge_batch,
+    parse_env_judge_batch,
+    parse_env_judgement,
+)
+
+
+def _agent(tmp_path, batch_size=1, cache=True):
+    config = {
+        "llm_config": {"model": "test", "base_url": "http://example.invalid/v1"},
+        "env_judge_batch_size": batch_size,
+        "cache": {"enabled": cache, "path": str(tmp_path / "cache.sqlite")},
+    }
+    return ParserAgent(config, project_dir=".", output_dir=str(tmp_path / "paper"))
+
+
+def test_format_and_parse_batch_round_trip():
+    prompt = format_env_judge_batch(["a", "b"])
+    assert prompt == "[[ENV 1]]\na\n[[/ENV 1]]\n[[ENV 2]]\nb\n[[/ENV 2]]"
+
+    verdicts = parse_env_judge_batch("1: True\n**2**: false\n7: false", 2)
+    assert verdicts == {1: True, 2: False}
+
+
+def test_single_judgement_defaults_to_translate():
+    assert parse_env_judgement("False.") is False
+    assert parse_env_judgement("true") is True
+    assert parse_env_judgement("not sure") is True
+
+
+def test_batched_judge_falls_back_for_missing_ids(tmp_path):
+    pm.init_prompts("en", "de")
+    agent = _agent(tmp_path, batch_size=3, cache=False)
+    calls = []
+
+    async def fake_send(system_prompt, text, max_tokens):
+        calls.append(text)
+        if system_prompt == pm.set_need_trans_for_envs_batch_system_prompt:
+            return "1: False\n3: True"
+        return "false"
+
+    agent._send_judge_request = fake_send
+    envs = [{"content": c} for c in ["x", "y", "z", "w"]]
+    verdicts = asyncio.run(agent._judge_envs(envs))
+
+    assert verdicts == [False, False, True, False]
+    assert len(calls) == 3  # one batch, one fallback for "y", one single for "w"
+
+
+def test_rules_and_cache_skip_judge_calls(tmp_path):
+    pm.init_prompts("en", "de")
+    calls = []
+
+    async def fake_send(system_prompt, text, max_tokens):
+        calls.append(text)
+        return "false"
+
+    code = "\\begin{customcode}\nfor i in range(10):\n    print(i)\n\\end{customcode}"
+    envs = [
+        {"env_name": "pmatrix", "content": "\\begin{pmatrix}1 & 0\\end{pmatrix}"},
+        {"env_name": "customcode", "content": code},
+        {"env_name": "customcode", "content": code},
+    ]
+
+    agent = _agent(tmp_path)
+    agent._send_judge_request = fake_send
+    assert asyncio.run(agent._set_need_trans(envs)) == [False, False, False]
+    assert calls == [code]  # duplicates share one call
+
+    again = _agent(tmp_path)
+    again._send_judge_request = fake_send
+    assert asyncio.run(again._set_need_trans(envs)) == [False, False, False]
+    assert len(calls) == 1  # answered from the persistent cache
+
+
+def test_malformed_judge_answer_counts_as_failed_judgement(tmp_path):
+    pm.init_prompts("en", "de")
+    agent = _agent(tmp_path, cache=False)
+
+    async def fake_send(system_prompt, text, max_tokens):
+        if text == "bad":
+            return {"choices": []}["choices"][0]
+        return "false"
+
+    agent._send_judge_request = fake_send
+    envs = [{"content": c} for c in ["bad", "good"]]
+    # None makes _set_need_trans translate the environment
+    assert asyncio.run(agent._judge_envs(envs)) == [None, False]
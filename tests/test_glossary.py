@@ -0,0 +1,27 @@
+from src.formats.latex.glossary import GlossaryIndex
+
+
+def test_finds_terms_in_order_of_appearance():
+    index = GlossaryIndex(["neural network", "network", "attention", "loss"])
+    text = "Attention layers feed a Neural Network."
+    assert index.find(text) == ["attention", "neural network", "network"]
+
+
+def test_respects_word_boundaries():
+    index = GlossaryIndex(["art", "GAN"])
+    assert index.find("We start from the state of the art.") == ["art"]
+    assert index.find("ORGANIC chemistry") == []
+
+
+def test_matches_placeholders_exactly():
+    index = GlossaryIndex(["<PLACEHOLDER_ENV_1>", "<PLACEHOLDER_ENV_12>"])
+    assert index.find("see <PLACEHOLDER_ENV_12> here") == ["<PLACEHOLDER_ENV_12>"]
+
+
+def test_prune_keeps_only_relevant_entries():
+    glossary = {"transformer": "Transformer", "dropout": "Dropout", "GPU": "GPU"}
+    index = GlossaryIndex(glossary)
+    assert index.prune(glossary, "A Transformer trained on one gpu.") == {
+        "transformer": "Transformer",
+        "GPU": "GPU",
+    }
@@ -0,0 +1,95 @@
+import asyncio
+
+from src.llm.hedging import Hedger, LatencyTracker
+
+
+def test_latency_percentile():
+    tracker = LatencyTracker()
+    for value in range(1, 101):
+        tracker.record(float(value))
+    assert tracker.percentile(0.95) == 95.0
+    assert LatencyTracker().percentile(0.5) is None
+
+
+def _warm(hedger, latency=0.01, samples=20):
+    for _ in range(samples):
+        hedger.latencies.record(latency)
+    hedger.requests = 100
+
+
+def test_slow_request_is_hedged_and_loser_cancelled():
+    hedger = Hedger(min_delay=0.01, max_fraction=0.5)
+    _warm(hedger)
+    calls = []
+    cancelled = []
+
+    async def request():
+        calls.append(len(calls))
+        try:
+            await asyncio.sleep(1.0 if len(calls) == 1 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return f"answer {len(calls)}"
+
+    result = asyncio.run(hedger.run(request))
+    assert result == "answer 2"
+    assert (hedger.hedged, hedger.hedge_wins) == (1, 1)
+    assert cancelled == [True]
+
+
+def test_no_hedge_without_samples_or_budget():
+    hedger = Hedger(min_delay=0.01, max_fraction=0.0)
+    _warm(hedger)
+
+    async def request():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    assert asyncio.run(hedger.run(request)) == "ok"
+    assert hedger.hedged == 0
+    assert Hedger().hedge_delay() is None
+
+
+def test_failed_hedge_does_not_mask_primary_result():
+    hedger = Hedger(min_delay=0.01, max_fraction=1.0)
+    _warm(hedger)
+
+    async def primary():
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    async def hedge():
+        raise RuntimeError("boom")
+
+    assert asyncio.run(hedger.run(primary, hedge)) == "primary"
+
+
+def test_cancelling_the_caller_during_loser_cleanup_is_not_lost():
+    hedger = Hedger(min_delay=0.01, max_fraction=0.5)
+    _warm(hedger)
+    calls = []
+
+    async def request():
+        calls.append(len(calls))
+        if len(calls) > 1:
+            await asyncio.sleep(0.01)
+            return "hedge"
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.2)  # slow cleanup of the losing request
+            raise
+        return "primary"
+
+    async def run():
+        task = asyncio.ensure_future(hedger.run(request))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return "cancelled"
+        return "finished"
+
+    assert asyncio.run(run()) == "cancelled"
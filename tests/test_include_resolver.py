@@ -0,0 +1,41 @@
+import src.formats.latex.parser as parser_module
+from src.formats.latex.parser import LatexParser
+
+
+def test_cyclic_inputs_are_left_unexpanded(tmp_path, capsys):
+    (tmp_path / "main.tex").write_text("M \\input{a}")
+    (tmp_path / "a.tex").write_text("A \\input{b}")
+    (tmp_path / "b.tex").write_text("B \\input{a} \\input{main}")
+    parser = LatexParser(str(tmp_path), str(tmp_path))
+    tex = parser._merge_inputs("M \\input{a}", str(tmp_path / "main.tex"))
+    assert tex == (
+        "M <PLACEHOLDER_a_begin>A <PLACEHOLDER_b_begin>B \\input{a} \\input{main}"
+        "<PLACEHOLDER_b_end><PLACEHOLDER_a_end>"
+    )
+    out = capsys.readouterr().out
+    assert "Cyclic input skipped: main.tex -> a.tex -> b.tex -> a.tex" in out
+    assert "Cyclic input skipped: main.tex -> a.tex -> b.tex -> main.tex" in out
+    assert parser.include_graph == {"main.tex": ["a.tex"], "a.tex": ["b.tex"], "b.tex": []}
+
+
+def test_repeated_inputs_are_read_once(tmp_path, monkeypatch):
+    (tmp_path / "chapters").mkdir()
+    (tmp_path / "chapters" / "macros.tex").write_text("X % comment\n")
+    (tmp_path / "chapters" / "one.tex").write_text("\\input{chapters/macros} one")
+    reads = []
+    read_tex_file = parser_module.read_tex_file
+    monkeypatch.setattr(
+        parser_module, "read_tex_file", lambda path: reads.append(path) or read_tex_file(path)
+    )
+    parser = LatexParser(str(tmp_path), str(tmp_path))
+    tex = parser._merge_inputs(
+        "\\input{chapters/one}\\input{chapters/macros.tex}\\input{chapters/macros}",
+        str(tmp_path / "main.tex"),
+    )
+    assert tex.count("X") == 3
+    assert len(reads) == 2
+    assert parser.include_graph == {
+        "main.tex": ["chapters/one.tex", "chapters/macros.tex"],
+        "chapters/one.tex": ["chapters/macros.tex"],
+        "chapters/macros.tex": [],
+    }
@@ -0,0 +1,70 @@
+from src.agents.coordinator_agent import previous_output_for
+from src.formats.latex.incremental import carry_forward, remap_placeholders, segment_key
+
+
+def test_segment_key_ignores_whitespace_and_placeholder_numbers():
+    old = "See <PLACEHOLDER_ENV_3> and\n  <PLACEHOLDER_CAP_1>."
+    new = "See <PLACEHOLDER_ENV_4> and <PLACEHOLDER_CAP_2>. "
+    assert segment_key(old) == segment_key(new)
+    assert segment_key(old) != segment_key("See <PLACEHOLDER_ENV_4>.")
+
+
+def test_remap_placeholders_renames_and_rejects_mismatch():
+    old = "A <PLACEHOLDER_ENV_3> B <PLACEHOLDER_ENV_5>"
+    new = "A <PLACEHOLDER_ENV_4> B <PLACEHOLDER_ENV_6>"
+    translation = "乙 <PLACEHOLDER_ENV_5> 甲 <PLACEHOLDER_ENV_3>"
+    assert (
+        remap_placeholders(old, new, translation)
+        == "乙 <PLACEHOLDER_ENV_6> 甲 <PLACEHOLDER_ENV_4>"
+    )
+    repeated = "A <PLACEHOLDER_ENV_4> B <PLACEHOLDER_ENV_4>"
+    assert remap_placeholders(old, repeated, translation) is None
+
+
+def test_carry_forward_reuses_unchanged_segments():
+    previous = {
+        "sections": [
+            {"section": "0", "content": "\\begin{document}", "trans_content": "x"},
+            {"section": "1", "content": "Intro <PLACEHOLDER_ENV_1>.", "trans_content": "引言 <PLACEHOLDER_ENV_1>。"},
+            {"section": "2", "content": "Old method.", "trans_content": "旧方法。"},
+            {"section": "3", "content": "Untranslated.", "trans_content": "Untranslated."},
+        ],
+        "captions": [],
+        "envs": [
+            {"placeholder": "<PLACEHOLDER_ENV_1>", "content": "Lemma.", "need_trans": False},
+        ],
+    }
+    current = {
+        "sections": [
+            {"section": "0", "content": "\\begin{document}"},
+            {"section": "1", "content": "Intro\n<PLACEHOLDER_ENV_2>."},
+            {"section": "2", "content": "New method."},
+            {"section": "3", "content": "Untranslated."},
+        ],
+        "captions": [],
+        "envs": [
+            {"placeholder": "<PLACEHOLDER_ENV_1>", "content": "Added.", "need_trans": True},
+            {"placeholder": "<PLACEHOLDER_ENV_2>", "content": "Lemma.", "need_trans": True},
+        ],
+    }
+
+    report = carry_forward(previous, current)
+
+    sections = current["sections"]
+    assert "trans_content" not in sections[0]
+    assert sections[1]["trans_content"] == "引言 <PLACEHOLDER_ENV_2>。"
+    assert "trans_content" not in sections[2]
+    assert "trans_content" not in sections[3]
+    assert current["envs"][1]["need_trans"] is False
+    assert report.judged_envs == {"<PLACEHOLDER_ENV_2>"}
+    assert (report.segments, report.carried) == (5, 1)
+    assert report.tokens_saved > 0
+    assert "1/5" in report.summary()
+
+
+def test_previous_output_is_resolved_per_project(tmp_path):
+    (tmp_path / "de_a").mkdir()
+    assert previous_output_for(str(tmp_path), "de_a") == str(tmp_path / "de_a")
+    # A single paper's output directory is used as given
+    assert previous_output_for(str(tmp_path), "de_b") == str(tmp_path)
+    assert previous_output_for("", "de_a") is None
@@ -0,0 +1,79 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.agents.tool_agents.base_tool_agent import BaseToolAgent
+from src.formats.latex.journal import TranslationJournal
+
+
+class _Agent(BaseToolAgent):
+    def execute(self, data=None, **kwargs):
+        return data
+
+
+def _maps():
+    return {
+        "sections": [{"section": "1", "content": "a"}, {"section": "2", "content": "b"}],
+        "captions": [{"placeholder": "<PLACEHOLDER_CAP_1>", "content": "c"}],
+        "envs": [],
+    }
+
+
+def test_replay_applies_latest_entries(tmp_path):
+    journal = TranslationJournal(tmp_path / "journal.jsonl")
+    journal.append("sections", {"section": "2", "trans_content": "first"})
+    journal.append("captions", {"placeholder": "<PLACEHOLDER_CAP_1>", "trans_content": "Ü"})
+    journal.append("sections", {"section": "2", "trans_content": "second"})
+    journal.append("sections", {"section": "9", "trans_content": "unknown"})
+
+    maps = _maps()
+    assert TranslationJournal(journal.path).apply(maps) == 3
+    assert maps["sections"][0] == {"section": "1", "content": "a"}
+    assert maps["sections"][1]["trans_content"] == "second"
+    assert maps["captions"][0]["trans_content"] == "Ü"
+
+
+def test_torn_last_line_is_skipped_and_cut_off(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = TranslationJournal(path)
+    journal.append("sections", {"section": "1", "trans_content": "ok"})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"kind": "sections", "key": "2", "rec')
+
+    reopened = TranslationJournal(path)
+    assert [key for _, key, _ in reopened.replay()] == ["1"]
+
+    reopened.append("sections", {"section": "2", "trans_content": "again"})
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["key"] for line in lines] == ["1", "2"]
+
+
+def test_reset_removes_journal(tmp_path):
+    journal = TranslationJournal(tmp_path / "journal.jsonl")
+    journal.append("envs", {"placeholder": "<PLACEHOLDER_ENV_1>"})
+    journal.reset()
+    assert not journal.path.exists()
+    assert list(journal.replay()) == []
+
+
+def test_save_file_replaces_atomically(tmp_path):
+    agent = _Agent("TestAgent")
+    target = tmp_path / "sections_map.json"
+    agent.save_file(target, "json", [{"section": "1"}])
+    agent.save_file(target, "json", [{"section": "2"}])
+    assert agent.read_file(target, "json") == [{"section": "2"}]
+    assert [p.name for p in tmp_path.iterdir()] == ["sections_map.json"]
+
+    with pytest.raises(ValueError):
+        agent.save_file(target, "xml", {})
+
+
+def test_appends_from_worker_threads_keep_whole_lines(tmp_path):
+    journal = TranslationJournal(tmp_path / "journal.jsonl")
+    records = [{"section": str(i), "trans_content": "x" * 5000} for i in range(200)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda record: journal.append("sections", record), records))
+
+    keys = sorted(int(key) for _, key, _ in journal.replay())
+    assert keys == list(range(200))
@@ -0,0 +1,93 @@
+import time
+
+from src.formats.latex.lexer import (
+    BEGIN,
+    COMMAND,
+    COMMENT,
+    END,
+    LatexLexer,
+    replace_spans,
+)
+from src.formats.latex.parser import LatexParser
+
+
+def test_tokens_and_groups():
+    tex = r"\section{A} \{x\} % note {" + "\n" + r"\begin{itemize}\end{itemize}"
+    lexer = LatexLexer(tex)
+    kinds = [(t.kind, t.name) for t in lexer.tokens]
+    assert kinds == [
+        (COMMAND, "section"),
+        (COMMAND, "{"),
+        (COMMAND, "}"),
+        (COMMENT, ""),
+        (BEGIN, "itemize"),
+        (END, "itemize"),
+    ]
+    assert lexer.group_end(tex.index("{A}")) == tex.index("{A}") + 3
+    assert lexer.group_end(tex.index("{", tex.index("%"))) is None  # in the comment
+
+
+def test_captions_keep_outermost_and_options():
+    tex = r"a \caption[short]{Long \textbf{b}} b \caption*{x \caption{y}} \captionof{t}{z}"
+    spans = LatexLexer(tex).find_commands(r"caption|caption\*")
+    assert [(s.name, tex[s.start : s.end]) for s in spans] == [
+        ("caption", r"\caption[short]{Long \textbf{b}}"),
+        ("caption*", r"\caption*{x \caption{y}}"),
+    ]
+
+
+def test_newcommands_with_escaped_braces():
+    tex = r"\newcommand{\set}[1]{\left\{ #1 \right.}\def\x{1}\newenvironment{foo}{}{}"
+    spans = LatexLexer(tex).find_newcommands()
+    assert [(s.name, s.arguments) for s in spans] == [("set", 1), ("x", 0)]
+    assert tex[spans[0].start : spans[0].end] == r"\newcommand{\set}[1]{\left\{ #1 \right.}"
+
+
+def test_environments_pair_with_next_end_and_skip_unclosed():
+    tex = (
+        r"\begin{document}\begin{foo} open "
+        r"\begin{itemize}\item a\end{itemize}"
+        r"\begin{center}c\end{center}"
+        r"\begin{figure}[t]\caption{x}\end{figure}\end{document}"
+    )
+    spans = LatexLexer(tex).find_environments()
+    assert [s.name for s in spans] == ["itemize", "figure"]
+    out = replace_spans(tex, spans, ["<A>", "<B>"])
+    assert out == r"\begin{document}\begin{foo} open <A>\begin{center}c\end{center}<B>\end{document}"
+
+
+def test_environment_tree_pairs_nested_environments_of_the_same_name():
+    tex = r"\begin{itemize}\item a\begin{itemize}\item b\end{itemize}\end{itemize} x\end{itemize}"
+    (outer,) = LatexLexer(tex).environment_tree()
+    (inner,) = outer.children
+    assert tex[outer.start : outer.end] == tex[: tex.rindex(" x")]
+    assert tex[inner.start : inner.end] == r"\begin{itemize}\item b\end{itemize}"
+    assert tex[inner.body_start : inner.body_end] == r"\item b"
+
+
+def test_environment_tree_drops_unclosed_but_keeps_their_children():
+    tex = r"\begin{a}\begin{b}\begin{c}x\end{c}\end{a}\end{b}"
+    (node,) = LatexLexer(tex).environment_tree()
+    assert node.name == "a"
+    assert [child.name for child in node.children] == ["c"]
+
+
+def test_environment_tree_is_linear_on_unclosed_environments():
+    n = 20000
+    tex = r"\begin{x}" * n + r"\end{y}" * n + r"\begin{y}\end{y}" + r"\end{x}"
+    started = time.perf_counter()
+    roots = LatexLexer(tex).environment_tree()
+    assert time.perf_counter() - started < 2.0
+    assert [(node.name, len(node.children)) for node in roots] == [("x", 1)]
+
+
+def test_parser_extraction_numbers_placeholders_in_order():
+    parser = LatexParser(".", ".")
+    tex = parser._extract_captions(r"\caption{one} text \title{two}")
+    tex = parser._extract_envs(r"\begin{table}" + tex + r"\end{table} \begin{quote}q\end{quote}")
+    assert tex == "<PLACEHOLDER_ENV_1> <PLACEHOLDER_ENV_2>"
+    assert [c["cap_type"] for c in parser.captions_json] == ["caption", "title"]
+    assert [(e["env_name"], e["need_trans"]) for e in parser.envs_json] == [
+        ("table", False),
+        ("quote", True),
+    ]
@@ -0,0 +1,69 @@
+import hashlib
+import os
+
+import src.formats.latex.manifest as manifest_module
+from src.formats.latex.manifest import ProjectManifest
+from src.formats.latex.utils import MAIN_TEX_HEAD_CHARS, find_main_tex_file
+
+
+def _project(tmp_path):
+    project = tmp_path / "paper"
+    (project / "figures").mkdir(parents=True)
+    (project / "appendix.tex").write_text("% \\documentclass{article}\nText")
+    (project / "paper.tex").write_text("%% main\n\\documentclass[11pt]{article}\n\\input{appendix}")
+    (project / "figures" / "plot.png").write_bytes(b"\x89PNG" * 10)
+    return project
+
+
+def test_manifest_lists_main_file_sources_and_assets(tmp_path):
+    project = _project(tmp_path)
+    manifest = ProjectManifest.build(str(project))
+    assert manifest.main_tex_file == "paper.tex"
+    assert manifest.tex_files == ["appendix.tex", "paper.tex"]
+    assert manifest.assets == ["figures/plot.png"]
+    assert manifest.files["figures/plot.png"] == {
+        "size": 40,
+        "sha256": hashlib.sha256(b"\x89PNG" * 10).hexdigest(),
+    }
+
+    copy = ProjectManifest.from_dict(manifest.to_dict())
+    assert copy.main_path("out") == os.path.join("out", "paper.tex")
+    assert copy.source_hash == manifest.source_hash
+
+    (project / "figures" / "plot.png").write_bytes(b"changed")
+    assert ProjectManifest.build(str(project)).source_hash != manifest.source_hash
+
+
+def test_main_file_probe_reads_only_heads_of_other_files(tmp_path):
+    project = tmp_path / "paper"
+    project.mkdir()
+    (project / "late.tex").write_text(
+        "Text. " * MAIN_TEX_HEAD_CHARS + "\\documentclass{article}"
+    )
+    assert find_main_tex_file(str(project)) is None
+    assert ProjectManifest.build(str(project)).main_tex_file is None
+
+
+def test_main_file_after_long_comments_and_filecontents_is_found(tmp_path):
+    project = tmp_path / "paper"
+    project.mkdir()
+    (project / "a_input.tex").write_text("\\section{Intro}\n")
+    (project / "main.tex").write_text(
+        "% header\n" * 1000
+        + "\\begin{filecontents*}{refs.bib}\n"
+        + "@misc{x, note={y}}\n" * 1000
+        + "\\end{filecontents*}\n\\documentclass{article}\n"
+    )
+    assert find_main_tex_file(str(project)).endswith("main.tex")
+    assert ProjectManifest.build(str(project)).main_tex_file == "main.tex"
+
+
+def test_manifest_walks_the_project_once(tmp_path, monkeypatch):
+    project = _project(tmp_path)
+    walks = []
+    walk = os.walk
+    monkeypatch.setattr(
+        manifest_module.os, "walk", lambda top: walks.append(top) or walk(top)
+    )
+    assert ProjectManifest.build(str(project)).main_tex_file == "paper.tex"
+    assert walks == [str(project)]
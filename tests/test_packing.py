@@ -0,0 +1,35 @@
+import asyncio
+
+from src.formats.latex.prompt_builder import build_packed_request, parse_packed_response
+from src.llm.packing import RequestPacker
+
+
+def test_packed_markers_round_trip():
+    _, user = build_packed_request("SYS", ["Figure one.", "Table two."])
+    answer = user.replace("Figure one.", "Abbildung eins.").replace("Table two.", "Tabelle zwei.")
+    assert parse_packed_response(answer, 2) == {1: "Abbildung eins.", 2: "Tabelle zwei."}
+
+
+def test_malformed_packed_answers_drop_segments():
+    answer = "[[SEG 1]]\nA\n[[/SEG 1]]\n[[SEG 1]]\nB\n[[/SEG 1]]\n[[SEG 3]]\nC\n[[/SEG 3]]"
+    assert parse_packed_response(answer, 3) == {3: "C"}
+    assert parse_packed_response('{"1": "eins", "2": 2}', 2, json_mode=True) == {1: "eins"}
+    assert parse_packed_response("not json", 2, json_mode=True) == {}
+
+
+def test_packer_groups_concurrent_segments_and_reports_fallbacks():
+    sent = []
+
+    async def send_batch(key, texts):
+        sent.append(list(texts))
+        return [text.upper() if text != "b" else None for text in texts]
+
+    async def run():
+        packer = RequestPacker(send_batch, max_items=3, window=0.05)
+        results = await asyncio.gather(*(packer.submit("caption", t) for t in "abcd"))
+        return packer, results
+
+    packer, results = asyncio.run(run())
+    assert sent == [["a", "b", "c"]]  # "d" waited alone and was not packed
+    assert results == ["A", None, "C", None]
+    assert (packer.requests, packer.items, packer.fallbacks) == (1, 2, 1)
@@ -0,0 +1,64 @@
+from src.formats.latex.parser import LatexParser
+from src.formats.latex.pieces import PieceTable
+from src.formats.latex.reconstruct import LatexConstructor
+
+
+def test_piece_table_references_spans():
+    source = "0123456789"
+    document = PieceTable("<")
+    document.append(source, 2, 5)
+    document.append(source, 7, 7)
+    tail = PieceTable(source)
+    document.extend(tail)
+    assert len(document) == 14
+    assert document.text() == "<234" + source
+    assert document.pieces[1].text is source
+
+
+def test_merge_inputs_splices_nested_files(tmp_path):
+    (tmp_path / "intro.tex").write_text("Intro \\input{sub/detail} end % note\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "detail.tex").write_text("Detail")
+    parser = LatexParser(str(tmp_path), str(tmp_path))
+    tex = parser._merge_inputs("A \\input{intro}\n\\include{missing} B")
+    assert tex == (
+        "A <PLACEHOLDER_intro_begin>Intro <PLACEHOLDER_sub/detail_begin>Detail"
+        "<PLACEHOLDER_sub/detail_end> end<PLACEHOLDER_intro_end>\n\\include{missing} B"
+    )
+    assert [i["command"] for i in parser.inputs_json] == [
+        "\\input{intro}",
+        "\\input{sub/detail}",
+    ]
+
+
+def test_construct_reverts_placeholders_and_inputs(tmp_path):
+    (tmp_path / "sub").mkdir()
+    sections = [
+        {"trans_content": "\\documentclass{article}<PLACEHOLDER_NEWCOMMAND_0>"},
+        {
+            "trans_content": "<PLACEHOLDER_intro_begin>Einleitung <PLACEHOLDER_ENV_1>"
+            "<PLACEHOLDER_sub/detail_begin> <PLACEHOLDER_CAP_1> "
+            "<PLACEHOLDER_sub/detail_end><PLACEHOLDER_intro_end> <PLACEHOLDER_X><PLACEHOLDER_ENV_2>"
+        },
+    ]
+    envs = [
+        {"placeholder": "<PLACEHOLDER_ENV_1>", "trans_content": "[E <PLACEHOLDER_CAP_1>]"},
+        {"placeholder": "<PLACEHOLDER_ENV_2>", "trans_content": "<PLACEHOLDER_ENV_2>"},
+    ]
+    captions = [{"placeholder": "<PLACEHOLDER_CAP_1>", "trans_content": "\\caption{K}"}]
+    newcommands = [{"placeholder": "<PLACEHOLDER_NEWCOMMAND_0>", "content": "\\def\\x{y}"}]
+    inputs = [
+        {"command": "\\input{intro}", "begin": "<PLACEHOLDER_intro_begin>",
+         "end": "<PLACEHOLDER_intro_end>", "path": "intro"},
+        {"command": "\\input{sub/detail}", "begin": "<PLACEHOLDER_sub/detail_begin>",
+         "end": "<PLACEHOLDER_sub/detail_end>", "path": "sub/detail"},
+    ]
+    LatexConstructor(sections, captions, envs, inputs, newcommands, str(tmp_path)).construct()
+
+    assert (tmp_path / "sub" / "detail.tex").read_text() == "\\caption{K}\n"
+    assert (tmp_path / "intro.tex").read_text() == (
+        "Einleitung [E \\caption{K}]\\input{sub/detail}\n"
+    )
+    assert (tmp_path / "main.tex").read_text() == (
+        "\\documentclass{article}\n\\usepackage[UTF8]{ctex}\n\\def\\x{y}\n\\input{intro} \n"
+    )
@@ -0,0 +1,78 @@
+import asyncio
+
+from src.agents.tool_agents import translator_agent
+from src.agents.tool_agents.translator_agent import TranslatorAgent
+
+
+def _agent(tmp_path, monkeypatch):
+    config = {
+        "llm_config": {"model": "test", "base_url": "http://example.invalid/v1"},
+        "cache": {"enabled": False},
+    }
+    agent = TranslatorAgent(config, project_dir=".", output_dir=str(tmp_path))
+    calls = []
+
+    async def done(record, error_message="None", session=None):
+        calls.append((record.get("section") or record["placeholder"], error_message))
+        return dict(record, trans_content="t")
+
+    monkeypatch.setattr(agent, "_translate_section", lambda section, *a, **kw: done(section, **kw))
+    monkeypatch.setattr(agent, "_translate_env", lambda env, *a, **kw: done(env, **kw))
+    monkeypatch.setattr(agent, "_translate_caption", lambda caption, *a, **kw: done(caption, **kw))
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(translator_agent.asyncio, "sleep", no_sleep)
+    return agent, calls
+
+
+def test_index_is_reused_until_the_list_changes(tmp_path, monkeypatch):
+    agent, _ = _agent(tmp_path, monkeypatch)
+    envs = [{"placeholder": "<PLACEHOLDER_ENV_1>"}, {"placeholder": "<PLACEHOLDER_ENV_1>"}]
+    index = agent._index_of("envs", envs)
+    assert index == {"<PLACEHOLDER_ENV_1>": 0}
+    envs[0] = {"placeholder": "<PLACEHOLDER_ENV_1>", "trans_content": "t"}
+    assert agent._index_of("envs", envs) is index
+    assert agent._index_of("envs", list(envs)) is not index
+
+    agent._index_of("envs", envs)
+    envs.append({"placeholder": "<PLACEHOLDER_ENV_2>"})
+    assert agent._index_of("envs", envs) == {
+        "<PLACEHOLDER_ENV_1>": 0,
+        "<PLACEHOLDER_ENV_2>": 2,
+    }
+
+
+def test_translate_resolves_nested_caption_placeholders(tmp_path, monkeypatch):
+    agent, calls = _agent(tmp_path, monkeypatch)
+    section = {"section": "1", "content": "See <PLACEHOLDER_ENV_2>."}
+    envs = [
+        {"placeholder": "<PLACEHOLDER_ENV_1>", "content": "a"},
+        {"placeholder": "<PLACEHOLDER_ENV_2>", "content": "fig <PLACEHOLDER_CAP_1>"},
+    ]
+    captions = [{"placeholder": "<PLACEHOLDER_CAP_1>", "content": "c"}]
+
+    asyncio.run(agent.translate(section, envs, captions, None))
+
+    assert [name for name, _ in calls] == ["1", "<PLACEHOLDER_ENV_2>", "<PLACEHOLDER_CAP_1>"]
+    assert "trans_content" not in envs[0]
+    assert envs[1]["trans_content"] == captions[0]["trans_content"] == "t"
+
+
+def test_error_parts_only_translate_reported_items(tmp_path, monkeypatch):
+    agent, calls = _agent(tmp_path, monkeypatch)
+    secs = [{"section": str(i), "content": "s"} for i in range(50)]
+    envs = [{"placeholder": f"<PLACEHOLDER_ENV_{i}>", "content": "e"} for i in range(50)]
+    caps = [{"placeholder": "<PLACEHOLDER_CAP_1>", "content": "c"}]
+    agent.errors_report = [
+        {"part": "sec", "num_or_ph": "7", "ph_error": "missing"},
+        {"part": "env", "num_or_ph": "<PLACEHOLDER_ENV_3>", "bracket_error": "{"},
+        {"part": "cap", "num_or_ph": "<PLACEHOLDER_CAP_9>"},
+    ]
+
+    asyncio.run(agent._retranslate_error_parts(secs, caps, envs, None))
+
+    assert sorted(calls) == [("7", "missing"), ("<PLACEHOLDER_ENV_3>", "{")]
+    assert secs[7]["trans_content"] == envs[3]["trans_content"] == "t"
+    assert "trans_content" not in caps[0]
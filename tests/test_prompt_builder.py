@@ -0,0 +1,26 @@
+from src.formats.latex.prompt_builder import (
+    build_glossary_request,
+    build_retranslation_request,
+)
+from src.llm.tokens import cached_prompt_tokens
+
+
+def test_system_prefix_does_not_depend_on_segment_or_glossary():
+    first = build_glossary_request("SYS", {"loss": "Verlust"}, "Paragraph one.")
+    second = build_glossary_request("SYS", {}, "Paragraph two.")
+    assert first[0] == second[0]
+    assert first[1].endswith("Paragraph one.")
+    assert "Verlust" in first[1]
+
+
+def test_retranslation_keeps_prefix_static():
+    first = build_retranslation_request("SYS", {}, "a", "b", "missing brace")
+    second = build_retranslation_request("SYS", {"x": "y"}, "c", "d", "bad ref")
+    assert first[0] == second[0]
+    assert first[1].endswith("[Error]:\nmissing brace")
+
+
+def test_cached_prompt_tokens_understands_provider_formats():
+    assert cached_prompt_tokens({"prompt_tokens_details": {"cached_tokens": 128}}) == 128
+    assert cached_prompt_tokens({"prompt_cache_hit_tokens": 64}) == 64
+    assert cached_prompt_tokens({"prompt_tokens": 10}) is None
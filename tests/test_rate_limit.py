@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+import pytest
+
+from src.llm.rate_limit import (
+    EndpointRateLimiter,
+    TokenBucket,
+    parse_duration,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("12", 12.0), ("0.5", 0.5), ("6m0s", 360.0), ("1.5s", 1.5), ("20ms", 0.02)],
+)
+def test_parse_duration(value, expected):
+    assert parse_duration(value) == pytest.approx(expected)
+
+
+def test_parse_duration_rejects_garbage():
+    assert parse_duration("soon") is None
+    assert parse_duration("") is None
+
+
+def test_parse_retry_after_prefers_milliseconds():
+    assert parse_retry_after({"retry-after-ms": "250", "retry-after": "3"}) == 0.25
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({}) is None
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(60, period=60.0, clock=clock)
+    bucket.consume(60)
+    assert bucket.time_until(30) == pytest.approx(30.0)
+    clock.now += 30
+    assert bucket.time_until(30) == 0.0
+
+
+def test_limiter_budgets_requests_and_tokens():
+    clock = FakeClock()
+    limiter = EndpointRateLimiter(
+        requests_per_minute=2, tokens_per_minute=1000, clock=clock
+    )
+    limiter.requests.consume(2)
+    assert limiter.delay_for(10) == pytest.approx(30.0)
+
+    clock.now += 30
+    limiter.tokens.consume(1000)
+    assert limiter.delay_for(500) == pytest.approx(30.0)
+
+
+def test_limiter_reconciles_estimates_with_usage():
+    clock = FakeClock()
+    limiter = EndpointRateLimiter(tokens_per_minute=1000, clock=clock)
+    limiter.tokens.consume(800)
+    limiter.reconcile(estimated=800, actual=300)
+    assert limiter.tokens.tokens == pytest.approx(700)
+
+
+def test_limiter_honours_retry_after_and_exhausted_quota():
+    clock = FakeClock()
+    limiter = EndpointRateLimiter(clock=clock)
+    limiter.update_from_headers({"Retry-After": "7"})
+    assert limiter.delay_for(1) == pytest.approx(7.0)
+
+    clock.now += 10
+    limiter.update_from_headers(
+        {
+            "x-ratelimit-limit-tokens": "40000",
+            "x-ratelimit-remaining-tokens": "0",
+            "x-ratelimit-reset-tokens": "1m30s",
+        }
+    )
+    assert limiter.tokens is not None
+    assert limiter.delay_for(100) == pytest.approx(90.0)
+
+
+def test_limiter_queues_waiters_in_order():
+    clock = FakeClock()
+    limiter = EndpointRateLimiter(requests_per_minute=60, clock=clock)
+    limiter.requests.consume(60)
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    async def main():
+        await asyncio.gather(limiter.acquire(1), limiter.acquire(1))
+
+    real_sleep, asyncio.sleep = asyncio.sleep, fake_sleep
+    try:
+        asyncio.run(main())
+    finally:
+        asyncio.sleep = real_sleep
+    assert sleeps == [pytest.approx(1.0), pytest.approx(2.0)]
+
+
+def test_limiter_is_shared_across_event_loops():
+    limiter = EndpointRateLimiter()
+
+    async def contend():
+        limiter.block_for(0.05)
+        await asyncio.gather(*(limiter.acquire(1) for _ in range(3)))
+
+    for _ in range(2):
+        started = time.monotonic()
+        asyncio.run(contend())
+        assert time.monotonic() - started >= 0.04
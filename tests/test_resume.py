@@ -0,0 +1,94 @@
+import json
+
+from src.agents.tool_agents.parser_agent import (
+    PARSED_MAP_FILES,
+    RESUME_STATE_FILE,
+    ParserAgent,
+    project_source_hash,
+)
+from src.agents.tool_agents.translator_agent import TranslatorAgent
+from src.formats.latex.journal import JOURNAL_FILE
+
+
+def _config():
+    return {
+        "llm_config": {"model": "test", "base_url": "http://example.invalid/v1"},
+        "cache": {"enabled": False},
+        "resume": True,
+    }
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_source_hash_tracks_paths_and_contents(tmp_path):
+    project = tmp_path / "paper"
+    (project / "sec").mkdir(parents=True)
+    (project / "main.tex").write_text("\\input{sec/intro}")
+    (project / "sec" / "intro.tex").write_text("Hello")
+    first = project_source_hash(str(project))
+    assert project_source_hash(str(project)) == first
+
+    (project / "sec" / "intro.tex").write_text("Hello!")
+    assert project_source_hash(str(project)) != first
+
+
+def test_can_resume_only_for_same_sources(tmp_path):
+    project = tmp_path / "paper"
+    project.mkdir()
+    (project / "main.tex").write_text("x")
+    output = tmp_path / "out"
+    output.mkdir()
+    agent = ParserAgent(_config(), project_dir=str(project), output_dir=str(output))
+    assert not agent.can_resume()
+
+    for name in PARSED_MAP_FILES:
+        _write(output / name, [])
+    _write(output / RESUME_STATE_FILE, {"source_hash": project_source_hash(str(project))})
+    assert agent.can_resume()
+
+    (project / "main.tex").write_text("y")
+    assert not agent.can_resume()
+
+
+def test_prepare_resume_keeps_only_valid_translations(tmp_path):
+    output = tmp_path / "out"
+    output.mkdir()
+    _write(
+        output / "sections_map.json",
+        [
+            {"section": "-1", "content": "pre", "trans_content": "pre"},
+            {"section": "1", "content": "one", "trans_content": "eins"},
+            {"section": "2", "content": "two", "trans_content": "two"},  # fell back
+            {"section": "3", "content": "three", "trans_content": ""},
+            {"section": "4", "content": "four", "trans_content": "kaputt"},
+        ],
+    )
+    _write(
+        output / "captions_map.json",
+        [{"placeholder": "<PLACEHOLDER_CAP_1>", "content": "cap", "trans_content": ""}],
+    )
+    _write(output / "envs_map.json", [])
+    # Finished after the maps were last saved, before the crash
+    (output / JOURNAL_FILE).write_text(
+        json.dumps(
+            {
+                "kind": "sections",
+                "key": "3",
+                "record": {"section": "3", "content": "three", "trans_content": "drei"},
+            }
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+    agent = TranslatorAgent(_config(), project_dir=".", output_dir=str(output))
+    kept, total = agent.prepare_resume(lambda part: part["trans_content"] != "kaputt")
+    assert (kept, total) == (2, 5)
+
+    sections = json.loads((output / "sections_map.json").read_text(encoding="utf-8"))
+    assert [s["trans_content"] for s in sections] == ["pre", "eins", "", "drei", ""]
+    assert not (output / JOURNAL_FILE).exists()
+    assert agent._keeps_translation(sections[1])
+    assert not agent._keeps_translation(sections[2])
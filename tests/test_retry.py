@@ -0,0 +1,129 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from src.llm.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryLog,
+    RetryPolicy,
+    classify_error,
+)
+
+
+class _StatusError(aiohttp.ClientError):
+    def __init__(self, status, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.headers = headers or {}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_classify_error():
+    assert classify_error(asyncio.TimeoutError()) == (True, "timeout")
+    assert classify_error(aiohttp.ClientConnectionError()) == (True, "connection")
+    assert classify_error(_StatusError(503)) == (True, "HTTP 503")
+    assert classify_error(_StatusError(429)) == (True, "HTTP 429")
+    assert classify_error(_StatusError(400)) == (False, "HTTP 400")
+    assert classify_error(CircuitOpenError()) == (False, "circuit open")
+
+    try:
+        try:
+            raise _StatusError(413)
+        except aiohttp.ClientError as e:
+            raise aiohttp.ClientError("Ollama request failed") from e
+    except aiohttp.ClientError as wrapped:
+        assert classify_error(wrapped) == (False, "HTTP 413")
+
+
+def test_backoff_is_capped_and_honours_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    for attempt in range(1, 8):
+        assert 0.0 <= policy.delay(attempt) <= min(4.0, 2 ** (attempt - 1))
+    assert policy.delay(1, _StatusError(429, {"retry-after": "7"})) == 7.0
+
+
+def test_run_retries_transient_errors_and_reports_reasons():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0)
+    calls = []
+    retries = []
+
+    async def call():
+        calls.append(1)
+        if len(calls) < 3:
+            raise asyncio.TimeoutError()
+        return "ok"
+
+    result = asyncio.run(
+        policy.run(call, on_retry=lambda a, reason, d, e: retries.append(reason))
+    )
+    assert result == "ok"
+    assert retries == ["timeout", "timeout"]
+
+
+def test_run_gives_up_immediately_on_permanent_error():
+    policy = RetryPolicy(max_attempts=5, base_delay=0.0)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        raise _StatusError(400)
+
+    with pytest.raises(_StatusError):
+        asyncio.run(policy.run(call))
+    assert len(calls) == 1
+
+
+def test_run_sync_reraises_last_error():
+    policy = RetryPolicy(max_attempts=2, base_delay=0.0)
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        policy.run_sync(call, retry_on=(RuntimeError,))
+    assert len(calls) == 2
+
+
+def test_retry_log_summary():
+    log = RetryLog()
+    log.record("3", "timeout")
+    log.record("3", "HTTP 503")
+    log.record("<PLACEHOLDER_ENV_1>", "timeout")
+    log.fail("3", _StatusError(503))
+    assert log.segments["3"] == ["timeout", "HTTP 503"]
+    assert log.failures == {"3": "HTTP 503"}
+    assert log.summary() == (
+        "3 retries over 2 segments (timeout: 2, HTTP 503: 1), 1 segments failed"
+    )
+
+
+def test_circuit_breaker_opens_probes_and_closes():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=clock)
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now = 10.0
+    assert breaker.state == "half_open" and breaker.allow()
+    breaker.on_request()
+    assert not breaker.allow()  # only one probe at a time
+
+    assert breaker.record_failure()  # failed probe reopens for longer
+    assert breaker.retry_in() == 20.0
+
+    clock.now = 30.0
+    breaker.on_request()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
@@ -0,0 +1,38 @@
+from src.formats.latex.splitter import split_for_token_budget
+from src.llm.tokens import count_tokens
+
+
+def _join(pairs):
+    return "".join(piece + separator for piece, separator in pairs)
+
+
+def test_small_text_is_not_split():
+    assert split_for_token_budget("Short paragraph.", 100) == [("Short paragraph.", "")]
+
+
+def test_splits_at_paragraphs_and_round_trips():
+    paragraphs = [f"Paragraph {i} " + "word " * 60 for i in range(6)]
+    text = "\n\n".join(paragraphs)
+    pairs = split_for_token_budget(text, 150)
+
+    assert len(pairs) > 1
+    assert _join(pairs) == text
+    assert all(count_tokens(piece) <= 150 for piece, _ in pairs)
+
+
+def test_placeholder_lines_stay_in_separators():
+    block = "text " * 80
+    text = f"{block}\n<PLACEHOLDER_ENV_1>\n{block}"
+    pairs = split_for_token_budget(text, 120)
+
+    assert _join(pairs) == text
+    assert all("PLACEHOLDER" not in piece for piece, _ in pairs)
+
+
+def test_never_cuts_inside_an_environment():
+    body = "\n\n".join("item " * 50 for _ in range(4))
+    text = f"intro\n\n\\begin{{itemize}}\n{body}\n\\end{{itemize}}\n\noutro"
+    pairs = split_for_token_budget(text, 80)
+
+    assert _join(pairs) == text
+    assert any("\\begin{itemize}" in p and "\\end{itemize}" in p for p, _ in pairs)
@@ -0,0 +1,199 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import src.formats.latex.prompts as pm
+from src.agents.coordinator_agent import CoordinatorAgent
+from src.agents.tool_agents.translator_agent import TranslatorAgent
+from src.agents.tool_agents.validator_agent import ValidatorAgent
+
+
+def _agents(tmp_path, max_retries=2):
+    config = {
+        "llm_config": {"model": "test", "base_url": "http://example.invalid/v1"},
+        "cache": {"enabled": False},
+        "validator_max_retries": max_retries,
+    }
+    translator = TranslatorAgent(config, project_dir=".", output_dir=str(tmp_path))
+    validator = ValidatorAgent(config, project_dir=".", output_dir=str(tmp_path))
+    translator.part_validator = validator.validate_part
+    return translator
+
+
+def _section():
+    return {"section": "1", "content": "\\textbf{See} <PLACEHOLDER_ENV_1>."}
+
+
+def test_failed_segment_is_corrected_immediately(tmp_path):
+    agent = _agents(tmp_path)
+    corrections = []
+
+    async def translate(record, session):
+        return dict(record, trans_content="\\textbf{Siehe}.")
+
+    async def retranslate(system_prompt, part, error_message, fail_part, type, session):
+        corrections.append((fail_part, type, error_message))
+        return "\\textbf{Siehe} <PLACEHOLDER_ENV_1>."
+
+    agent._request_llm_for_retrans_error_parts = retranslate
+    result = asyncio.run(agent._translate_checked(_section(), translate, None))
+
+    assert result["trans_content"] == "\\textbf{Siehe} <PLACEHOLDER_ENV_1>."
+    assert [(part, kind) for part, kind, _ in corrections] == [("1", "sec")]
+    assert "Missing placeholders: <PLACEHOLDER_ENV_1>" in corrections[0][2]
+    assert agent.stream_errors == {}
+    assert (agent.stream_validated, agent.stream_retranslated) == (1, 1)
+
+
+def test_errors_left_after_last_retry_are_reported(tmp_path):
+    agent = _agents(tmp_path, max_retries=1)
+
+    async def translate(record, session):
+        return dict(record, trans_content="kaputt")
+
+    async def retranslate(system_prompt, part, error_message, fail_part, type, session):
+        return "immer noch kaputt"
+
+    agent._request_llm_for_retrans_error_parts = retranslate
+    result = asyncio.run(agent._translate_checked(_section(), translate, None))
+
+    assert result["trans_content"] == "immer noch kaputt"
+    assert agent.stream_errors["1"]["part"] == "sec"
+    assert agent.stream_retranslated == 1
+
+
+def test_without_validator_translation_is_returned_unchecked(tmp_path):
+    agent = _agents(tmp_path)
+    agent.part_validator = None
+
+    async def translate(record, session):
+        return dict(record, trans_content="kaputt")
+
+    result = asyncio.run(agent._translate_checked(_section(), translate, None))
+    assert result["trans_content"] == "kaputt"
+    assert agent.stream_validated == 0
+
+
+def _cached_agent(tmp_path, answers, max_retries=1):
+    pm.init_prompts("en", "de")
+    config = {
+        "llm_config": {"model": "test", "base_url": "http://example.invalid/v1"},
+        "cache": {"enabled": True, "path": str(tmp_path / "cache.sqlite")},
+        "validator_max_retries": max_retries,
+    }
+    translator = TranslatorAgent(config, project_dir=".", output_dir=str(tmp_path))
+    validator = ValidatorAgent(config, project_dir=".", output_dir=str(tmp_path))
+    translator.part_validator = validator.validate_part
+    translator.cache_after_validation = True
+    calls = []
+
+    async def request(
+        system_prompt, user_content, session=None, json_mode=False, served_by=None
+    ):
+        calls.append(user_content)
+        return answers.pop(0)
+
+    translator._make_llm_request = request
+    return translator, calls
+
+
+def test_only_validated_corrections_are_cached(tmp_path):
+    good = "\\textbf{Siehe} <PLACEHOLDER_ENV_1>."
+    agent, calls = _cached_agent(tmp_path, ["\\textbf{Siehe}.", good])
+    result = asyncio.run(agent._translate_checked(_section(), agent._translate_section, None))
+    assert result["trans_content"] == good
+    assert len(calls) == 2
+
+    rerun, calls = _cached_agent(tmp_path, [])
+    result = asyncio.run(rerun._translate_checked(_section(), rerun._translate_section, None))
+    assert result["trans_content"] == good
+    assert calls == []
+
+
+def test_translation_failing_validation_is_not_cached(tmp_path):
+    agent, calls = _cached_agent(tmp_path, ["\\textbf{Siehe}.", "\\textbf{Siehe} noch."])
+    asyncio.run(agent._translate_checked(_section(), agent._translate_section, None))
+    assert agent.stream_errors["1"]["part"] == "sec"
+
+    rerun, calls = _cached_agent(tmp_path, ["\\textbf{Siehe} <PLACEHOLDER_ENV_1>."])
+    asyncio.run(rerun._translate_checked(_section(), rerun._translate_section, None))
+    assert len(calls) == 1 and rerun.stream_errors == {}
+
+
+def test_split_section_corrects_only_failing_pieces(tmp_path):
+    agent = _agents(tmp_path)
+    agent.piece_validator = agent.part_validator
+    agent.max_section_tokens = 8
+    pm.init_prompts("en", "de")
+    section = {
+        "section": "2",
+        "content": "\\textbf{First} paragraph here.\n\n\\emph{Second} <PLACEHOLDER_ENV_2> here.",
+    }
+    first_pass = {
+        "\\textbf{First} paragraph here.": "\\textbf{Erster} Absatz hier.",
+        "\\emph{Second} <PLACEHOLDER_ENV_2> here.": "\\emph{Zweiter} hier.",
+    }
+    sent = []
+
+    async def translate(system_prompt, text, fail_part, type, session):
+        return first_pass[text]
+
+    async def retranslate(system_prompt, part, error_message, fail_part, type, session):
+        sent.append((part["content"], part["trans_content"]))
+        return "\\emph{Zweiter} <PLACEHOLDER_ENV_2> hier."
+
+    agent._request_llm_for_trans = translate
+    agent._request_llm_for_retrans_error_parts = retranslate
+    result = asyncio.run(agent._translate_checked(section, agent._translate_section, None))
+
+    assert sent == [("\\emph{Second} <PLACEHOLDER_ENV_2> here.", "\\emph{Zweiter} hier.")]
+    # The validator sanitizes the joined section, collapsing the blank line
+    assert result["trans_content"] == (
+        "\\textbf{Erster} Absatz hier.\n\\emph{Zweiter} <PLACEHOLDER_ENV_2> hier."
+    )
+    assert agent.stream_errors == {}
+
+
+def test_records_not_checked_while_streaming_are_validated(tmp_path):
+    config = {
+        "llm_config": {"model": "test", "base_url": "http://example.invalid/v1"},
+        "cache": {"enabled": False},
+        "validator_max_retries": 1,
+    }
+    coordinator = CoordinatorAgent(
+        config, project_dir=str(tmp_path / "paper"), output_dir=str(tmp_path)
+    )
+    out = tmp_path / "out"
+    out.mkdir()
+    sections = [
+        # Failed while streaming, retries used up
+        dict(_section(), trans_content="\\textbf{Siehe}."),
+        # Kept from a resumed run, never streamed
+        {
+            "section": "2",
+            "content": "\\emph{A} <PLACEHOLDER_ENV_2>.",
+            "trans_content": "\\emph{A}.",
+        },
+        {"section": "3", "content": "\\emph{B}.", "trans_content": "\\emph{B}."},
+    ]
+    for name, records in (("sections", sections), ("captions", []), ("envs", [])):
+        (out / f"{name}_map.json").write_text(json.dumps(records))
+
+    translator = _agents(out)
+    translator.stream_errors = {"1": {"part": "sec", "num_or_ph": "1"}}
+    retranslated = []
+
+    async def execute(**kwargs):
+        retranslated.append([e["num_or_ph"] for e in translator.errors_report])
+        sections[1]["trans_content"] = "\\emph{A} <PLACEHOLDER_ENV_2>."
+        (out / "sections_map.json").write_text(json.dumps(sections))
+
+    translator.execute = execute
+    coordinator.translator_agent = translator
+    coordinator.validator_agent = ValidatorAgent(config, project_dir=".", output_dir=str(out))
+    coordinator.parser_agent = SimpleNamespace(carry_report=None)
+    asyncio.run(coordinator.validate())
+
+    assert retranslated == [["2"]]
+    report = json.loads((out / "errors_report.json").read_text())
+    assert [e["num_or_ph"] for e in report] == ["1"]
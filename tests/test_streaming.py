@@ -0,0 +1,189 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from src.agents.tool_agents.translator_agent import TranslatorAgent
+from src.llm.streaming import collect_stream, iter_sse_events, openai_delta_text
+
+
+async def _lines(*lines):
+    for line in lines:
+        yield line
+
+
+async def _chunks(items, delays):
+    for item, delay in zip(items, delays):
+        await asyncio.sleep(delay)
+        yield item
+
+
+def _delta(text):
+    return {"choices": [{"delta": {"content": text}}]}
+
+
+def test_iter_sse_events_parses_data_and_stops_at_done():
+    async def run():
+        lines = _lines(
+            b": keep-alive\n",
+            b'data: {"choices": [{"delta": {"role": "assistant"}}]}\n',
+            b"\n",
+            b'data: {"choices": [{"delta": {"content": "Hallo"}}]}\n',
+            b"\n",
+            b"data: [DONE]\n",
+            b"\n",
+            b'data: {"ignored": true}\n',
+        )
+        return [event async for event in iter_sse_events(lines)]
+
+    events = asyncio.run(run())
+    assert len(events) == 2
+    assert openai_delta_text(events[1]) == "Hallo"
+
+
+def test_collect_stream_allows_long_answers_that_keep_streaming():
+    items = [_delta("a"), _delta("b"), {"choices": [], "usage": {"total_tokens": 5}}]
+    text, last = asyncio.run(
+        collect_stream(
+            _chunks(items, [0.0, 0.05, 0.05]),
+            openai_delta_text,
+            first_token_timeout=0.2,
+            idle_timeout=0.08,
+        )
+    )
+    assert text == "ab"
+    assert last["usage"]["total_tokens"] == 5
+
+
+def test_collect_stream_times_out_waiting_for_first_token():
+    # Role-only chunks do not count as the first token.
+    items = [{"choices": [{"delta": {"role": "assistant"}}]}, _delta("late")]
+    with pytest.raises(asyncio.TimeoutError, match="first token"):
+        asyncio.run(
+            collect_stream(
+                _chunks(items, [0.0, 0.3]),
+                openai_delta_text,
+                first_token_timeout=0.1,
+                idle_timeout=1.0,
+            )
+        )
+
+
+def test_collect_stream_times_out_when_stream_stalls():
+    with pytest.raises(asyncio.TimeoutError, match="No new tokens"):
+        asyncio.run(
+            collect_stream(
+                _chunks([_delta("a"), _delta("b")], [0.0, 0.3]),
+                openai_delta_text,
+                first_token_timeout=1.0,
+                idle_timeout=0.1,
+            )
+        )
+
+
+def test_collect_stream_returns_the_usage_chunk_before_trailing_chunks():
+    usage = {"choices": [], "usage": {"total_tokens": 7}}
+    items = [_delta("a"), usage, {"choices": [], "usage": None}]
+    text, chunk = asyncio.run(
+        collect_stream(
+            _chunks(items, [0.0, 0.0, 0.0]),
+            openai_delta_text,
+            first_token_timeout=1.0,
+            idle_timeout=1.0,
+        )
+    )
+    assert text == "a"
+    assert chunk is usage
+
+
+class _StreamResponse:
+    def __init__(self, lines):
+        self.headers = {}
+        self.content = _lines(*lines)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+
+class _Session:
+    def __init__(self, lines):
+        self.lines = lines
+        self.payloads = []
+
+    def post(self, url, json, headers, timeout):
+        self.payloads.append(json)
+        return _StreamResponse(self.lines)
+
+
+def test_streamed_request_asks_for_usage_and_reports_it(tmp_path):
+    config = {
+        "llm_config": {
+            "model": "test",
+            "base_url": "http://example.invalid/v1",
+            "stream": True,
+        },
+        "cache": {"enabled": False},
+    }
+    agent = TranslatorAgent(config, project_dir=".", output_dir=str(tmp_path))
+    endpoint = agent.balancer.acquire()
+    reconciled = []
+    endpoint.rate_limiter.reconcile = lambda estimated, actual: reconciled.append(
+        (estimated, actual)
+    )
+    session = _Session(
+        [
+            b'data: {"choices": [{"delta": {"content": "Hallo"}}]}\n',
+            b"\n",
+            b'data: {"choices": [], "usage": {"prompt_tokens": 10, "total_tokens": 12,'
+            b' "prompt_tokens_details": {"cached_tokens": 8}}}\n',
+            b"\n",
+            b"data: [DONE]\n",
+            b"\n",
+        ]
+    )
+
+    text = asyncio.run(agent._send_llm_request("system", "Hello", endpoint, session, 20))
+
+    assert text == "Hallo"
+    assert session.payloads[0]["stream_options"] == {"include_usage": True}
+    assert reconciled == [(20, 12)]
+    assert (agent.prompt_tokens, agent.cached_prompt_tokens) == (10, 8)
+
+
+def test_streamed_request_times_out_when_headers_never_arrive(tmp_path):
+    async def run():
+        async def stall(reader, writer):
+            await reader.read(1024)
+            await asyncio.sleep(10)
+
+        server = await asyncio.start_server(stall, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        config = {
+            "llm_config": {
+                "model": "test",
+                "base_url": f"http://127.0.0.1:{port}/v1",
+                "stream": True,
+                "first_token_timeout": 0.2,
+            },
+            "cache": {"enabled": False},
+        }
+        agent = TranslatorAgent(config, project_dir=".", output_dir=str(tmp_path))
+        try:
+            async with aiohttp.ClientSession() as session:
+                await asyncio.wait_for(
+                    agent._send_llm_request(
+                        "system", "Hello", agent.balancer.acquire(), session
+                    ),
+                    5,
+                )
+        finally:
+            server.close()
+
+    with pytest.raises(aiohttp.ServerTimeoutError):
+        asyncio.run(run())
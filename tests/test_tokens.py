@@ -0,0 +1,19 @@
+import logging
+
+from src.llm import tokens
+
+
+def test_missing_encoding_is_logged_and_estimated(monkeypatch, caplog, capsys):
+    def offline(model):
+        raise OSError("no network")
+
+    monkeypatch.setattr(tokens.tiktoken, "encoding_for_model", offline)
+    tokens._get_encoding.cache_clear()
+    try:
+        with caplog.at_level(logging.WARNING, logger="src.llm.tokens"):
+            assert tokens.count_tokens("x" * 40) == 40 // tokens.CHARS_PER_TOKEN
+    finally:
+        tokens._get_encoding.cache_clear()
+
+    assert "tiktoken encoding unavailable" in caplog.text
+    assert capsys.readouterr().out == ""